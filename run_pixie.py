@@ -1,70 +1,109 @@
 import argparse
-import time
+import threading
 import sys
-import os
 
 
 def main():
     parser = argparse.ArgumentParser(description='Pixie Display Controller')
     parser.add_argument('--emulator', action='store_true', help='Run in web emulator mode')
-    parser.add_argument('--app', type=str, help='Initial app to start (clock, weather)')
+    parser.add_argument('--app', type=str, help='Initial app to start (clock, weather, stream)')
     parser.add_argument('--dev', action='store_true', help='Enable dev mode with auto-reload on file changes')
+    parser.add_argument('--hot-reload', action='store_true', help=argparse.SUPPRESS)  # set by --dev
     parser.add_argument('--setup', action='store_true', help='Force WiFi setup mode')
+    parser.add_argument('--isolate', action='store_true',
+                        help='Run each app in its own worker process with a hang watchdog')
+    parser.add_argument('--port', type=int, help='Web server port (default 5000, or 5002 with --emulator)')
+    parser.add_argument('--push', type=str, metavar='HOST:PORT,...',
+                        help="Frame server mode: push frames to remote Pixies ('config' reads the network section)")
+    parser.add_argument('--receive', type=int, nargs='?', const=7070, metavar='PORT',
+                        help='Thin client mode: display frames pushed by a frame server')
+    parser.add_argument('--pacing', choices=['auto', 'vsync', 'sleep'],
+                        help="Frame pacing: lock to the panel's vsync or sleep to deadlines (default: display config)")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Print an import-time and boot phase breakdown once started')
+    parser.add_argument('--simulate', type=float, metavar='HOURS',
+                        help='Run headless on a virtual clock for HOURS as fast as possible, then report')
+    parser.add_argument('--sim-start', type=str, metavar='YYYY-MM-DDTHH:MM',
+                        help='Virtual start time for --simulate (default: now)')
+    parser.add_argument('--sim-fps', type=int, default=30, help='Frame rate simulated by --simulate')
     args = parser.parse_args()
 
+    if args.profile_startup:
+        from src.core.startup_profile import get_profiler
+        get_profiler().enable_import_timing()
+
     # Dev mode: wrap in a file-watching restart loop
     if args.dev:
         _run_with_reload(args)
         return
 
+    if args.receive:
+        _run_receiver(args)
+        return
+
+    if args.simulate:
+        _run_simulation(args)
+        return
+
     _run_app(args)
 
 
 def _run_app(args):
     """Normal application startup with top-level error handling."""
     from src.core.logger import get_logger
+    from src.core.startup_profile import get_profiler
     log = get_logger()
+    profiler = get_profiler()
 
     try:
-        if args.emulator:
-            from src.adapters.web_matrix import WebMatrixAdapter
-            display = WebMatrixAdapter()
-        else:
-            from src.adapters.real_matrix import RealMatrixAdapter
-            display = RealMatrixAdapter()
+        display = _create_display(args)
+        profiler.mark('display ready')
+        _show_splash(display)
+        profiler.mark('first pixel (splash)')
 
         # --- WiFi provisioning check (Pi only) ---
-        if not args.emulator:
+        if not args.emulator and not args.push:
             _check_wifi(display, args, log)
+            profiler.mark('wifi checked')
 
-        # --- App Manager Setup ---
+        # --- App Manager Setup (apps are imported on first switch) ---
         from src.core.app_manager import AppManager
-        from src.apps.clock_app import ClockApp
-        from src.apps.weather_app import WeatherApp
-
-        app_manager = AppManager(display)
-
-        clock = ClockApp(display)
-        weather = WeatherApp(display)
-
-        app_manager.register_app("clock", clock)
-        app_manager.register_app("weather", weather)
-
-        # --- Web Controller Setup (unified server) ---
-        from src.core.web_controller import WebController
-        controller_port = 5002 if args.emulator else 5000
-        emulator_display = display if args.emulator else None
-        controller = WebController(app_manager, port=controller_port, emulator_display=emulator_display)
+        from src.apps import BUILTIN_APPS
+
+        from src.core.config import get_config
+        transitions = get_config().section('transitions')
+        app_manager = AppManager(display, isolate_apps=args.isolate,
+                                 transition=transitions.get('type', 'fade'),
+                                 transition_duration=transitions.get('duration', 0.4))
+        for name, target in BUILTIN_APPS.items():
+            app_manager.register_lazy(name, target)
+        _load_schedule(app_manager, log)
+        _load_playlist(app_manager, log)
+        _load_memory_budgets(app_manager, log)
+        _load_shared_memory(app_manager, display, log)
+        if args.hot_reload:
+            from src.core.hot_reload import HotReloader
+            HotReloader(app_manager).start()
+
+        # --- Web Controller Setup (unified server), off the boot path ---
+        web_ready = threading.Event()
+        threading.Thread(target=_start_web_controller, args=(app_manager, display, args, web_ready),
+                         daemon=True, name='web-startup').start()
 
         # Set default app
-        if args.app and args.app in app_manager.apps:
+        if args.app and app_manager.has_app(args.app):
             app_manager.switch_to(args.app)
         else:
             app_manager.switch_to("clock")
+        profiler.mark('initial app started')
+
+        threading.Thread(target=_finish_startup_profile, args=(app_manager, web_ready, args),
+                         daemon=True, name='startup-profile').start()
 
         # Run loop
         log.info("Starting Pixie OS...")
-        app_manager.run_loop(fps=30)
+        pacing = args.pacing or get_config().section('display').get('pacing', 'auto')
+        app_manager.run_loop(fps=30, pacing=pacing)
 
     except KeyboardInterrupt:
         log.info("Pixie shutdown by user.")
@@ -73,8 +112,8 @@ def _run_app(args):
         # Try to show error on display if possible
         try:
             display.clear()
-            for x in range(64):
-                for y in range(64):
+            for x in range(display.width):
+                for y in range(display.height):
                     if (x + y) % 4 == 0:
                         display.set_pixel(x, y, 255, 0, 0)
             display.update()
@@ -83,6 +122,216 @@ def _run_app(args):
         sys.exit(1)
 
 
+def _load_schedule(app_manager, log):
+    """Install the dimming/sleep schedule from the 'schedule' config section."""
+    from src.core.config import get_config
+    section = get_config().section('schedule')
+    if not section.get('windows'):
+        return
+    from src.core.schedule import DisplaySchedule
+    try:
+        app_manager.set_schedule(DisplaySchedule.from_config(section))
+    except (KeyError, ValueError, TypeError) as e:
+        log.error(f"Ignoring invalid schedule config: {e}")
+
+
+def _load_playlist(app_manager, log):
+    """Install the app rotation from the 'playlist' config section."""
+    from src.core.config import get_config
+    section = get_config().section('playlist')
+    if not section.get('entries'):
+        return
+    from src.core.playlist import Playlist
+    try:
+        app_manager.set_playlist(Playlist.from_config(section))
+    except (KeyError, ValueError, TypeError) as e:
+        log.error(f"Ignoring invalid playlist config: {e}")
+
+
+def _load_memory_budgets(app_manager, log):
+    """Turn on per-app memory accounting from the 'memory' config section."""
+    from src.core.config import get_config
+    section = get_config().section('memory')
+    if not section or not section.get('enabled', True):
+        return  # off unless configured: tracing allocations isn't free
+    from src.core.memory import MemoryAccountant
+    try:
+        app_manager.set_memory(MemoryAccountant.from_config(section))
+    except (ValueError, TypeError, AttributeError) as e:
+        log.error(f"Ignoring invalid memory config: {e}")
+
+
+def _load_shared_memory(app_manager, display, log):
+    """Create the frame export / input segments from the 'shared_memory' config section."""
+    from src.core.config import get_config
+    section = get_config().section('shared_memory')
+    if not section.get('export') and not section.get('input'):
+        return
+    from src.core.frame_export import DEFAULT_EXPORT_NAME, DEFAULT_INPUT_NAME, FrameSegment
+    try:
+        if section.get('export'):
+            name = section['export'] if isinstance(section['export'], str) else DEFAULT_EXPORT_NAME
+            segment = FrameSegment.create(name, display.width, display.height)
+            app_manager.set_frame_export(segment)
+            log.info(f"Publishing frames to shared memory '{segment.name}'")
+        if section.get('input'):
+            # Stays mapped (and is unlinked) until exit, so writers can attach any time
+            name = section['input'] if isinstance(section['input'], str) else DEFAULT_INPUT_NAME
+            segment = FrameSegment.create(name, display.width, display.height)
+            log.info(f"Accepting frames from shared memory '{segment.name}'")
+    except (OSError, ValueError, TypeError) as e:
+        log.error(f"Shared memory segments unavailable: {e}")
+
+
+def _show_splash(display):
+    """Put something on the panel as soon as the display exists."""
+    from src.core.font import draw_text, text_width, GLYPH_HEIGHT
+
+    w, h = display.width, display.height
+    display.clear()
+    x = (w - text_width("PIXIE")) // 2
+    y = (h - GLYPH_HEIGHT) // 2
+    draw_text(display, x, y, "PIXIE", (120, 60, 255))
+    for i in range(w // 4, w - w // 4):
+        display.set_pixel(i, y + GLYPH_HEIGHT + 2, 40, 20, 90)
+    display.update()
+
+
+def _start_web_controller(app_manager, display, args, web_ready):
+    """Import Flask and start the web server in the background."""
+    from src.core.logger import get_logger
+    from src.core.startup_profile import get_profiler
+    try:
+        from src.core.web_controller import WebController
+        controller_port = args.port or (5002 if args.emulator else 5000)
+        emulator_display = display if args.emulator else None
+        WebController(app_manager, port=controller_port, emulator_display=emulator_display)
+        get_profiler().mark('web server started')
+    except Exception as e:
+        get_logger().critical(f"Web controller failed to start: {e}", exc_info=True)
+    finally:
+        web_ready.set()
+
+
+def _finish_startup_profile(app_manager, web_ready, args):
+    """Record the remaining boot phases and print the report if asked."""
+    from src.core.startup_profile import get_profiler
+    profiler = get_profiler()
+    app_manager.first_frame.wait()
+    profiler.mark('first app frame')
+    web_ready.wait()
+    if args.profile_startup:
+        profiler.disable_import_timing()
+        print(profiler.report(), flush=True)
+
+
+def _create_display(args):
+    """Create the display adapter, sized from the 'display' config section."""
+    from src.core.config import get_config
+    from src.core.panel_geometry import PanelGeometry
+
+    display_config = get_config().section('display')
+    geometry = PanelGeometry.from_config(display_config)
+
+    if args.push:
+        return _create_network_display(args, geometry)
+
+    refresh_hz = display_config.get('refresh_hz')
+    if args.emulator:
+        from src.adapters.web_matrix import WebMatrixAdapter
+        # Simulated vsync, so pacing behaves as on the panel
+        pacing = args.pacing or display_config.get('pacing', 'auto')
+        if pacing == 'vsync' and not refresh_hz:
+            refresh_hz = 120
+        return WebMatrixAdapter(geometry.width, geometry.height,
+                                vsync_hz=refresh_hz if pacing != 'sleep' else None)
+
+    from src.adapters.real_matrix import RealMatrixAdapter
+    from src.core.color_lut import ColorLUT
+    return RealMatrixAdapter(
+        geometry,
+        hardware_mapping=display_config.get('hardware_mapping', 'adafruit-hat'),
+        gpio_slowdown=display_config.get('gpio_slowdown', 4),
+        color=ColorLUT.from_config(get_config().section('color')),
+        refresh_hz=refresh_hz,
+    )
+
+
+def _create_network_display(args, geometry):
+    """
+    Frame server display. Endpoints come from --push, or from the
+    'network' config section when per-device viewports are needed.
+    """
+    from src.core.config import get_config
+    from src.adapters.network_matrix import NetworkMatrixAdapter, Endpoint, parse_endpoint
+
+    network_config = get_config().section('network')
+    if args.push != 'config':
+        endpoints = [Endpoint(*parse_endpoint(spec)) for spec in args.push.split(',')]
+    else:
+        endpoints = [Endpoint(ep['host'], ep.get('port', 7070), ep.get('viewport'))
+                     for ep in network_config.get('endpoints', [])]
+
+    return NetworkMatrixAdapter(
+        network_config.get('width', geometry.width),
+        network_config.get('height', geometry.height),
+        endpoints=endpoints,
+        sync=network_config.get('sync', True),
+        keyframe_interval=network_config.get('keyframe_interval', 60),
+    )
+
+
+def _run_receiver(args):
+    """Thin client: show frames pushed by a frame server (see --push)."""
+    from src.core.logger import get_logger
+    from src.adapters.network_matrix import NetworkFrameReceiver
+    log = get_logger()
+
+    display = _create_display(args)
+    if args.emulator:
+        # Serve the emulator view so several receivers can run on one box
+        from src.core.app_manager import AppManager
+        from src.core.web_controller import WebController
+        WebController(AppManager(display), port=args.port or 5002, emulator_display=display)
+
+    try:
+        NetworkFrameReceiver(display, port=args.receive).run()
+    except KeyboardInterrupt:
+        log.info("Receiver shutdown by user.")
+
+
+def _run_simulation(args):
+    """Run the configured apps, schedule and playlist on a virtual clock (see --simulate)."""
+    import json
+    from datetime import datetime
+    from src.apps import BUILTIN_APPS
+    from src.core.app_manager import AppManager
+    from src.core.config import get_config
+    from src.core.logger import get_logger
+    from src.core.panel_geometry import PanelGeometry
+    from src.core.simulation import run_simulation
+    from src.core.transitions import OffscreenDisplay
+    log = get_logger()
+
+    geometry = PanelGeometry.from_config(get_config().section('display'))
+    display = OffscreenDisplay(geometry.width, geometry.height)
+    transitions = get_config().section('transitions')
+    app_manager = AppManager(display, transition=transitions.get('type', 'fade'),
+                             transition_duration=transitions.get('duration', 0.4))
+    for name, target in BUILTIN_APPS.items():
+        app_manager.register_lazy(name, target)
+    _load_schedule(app_manager, log)
+    _load_playlist(app_manager, log)
+    app_manager.switch_to(args.app if args.app and app_manager.has_app(args.app) else "clock")
+
+    start = datetime.fromisoformat(args.sim_start) if args.sim_start else None
+    report = run_simulation(app_manager, args.simulate, fps=args.sim_fps, start=start)
+    log.info(f"Simulated {report['simulated_hours']}h in {report['wall_seconds']}s: "
+             f"{report['simulated_hours_per_wall_second']} h/s, "
+             f"{report['frames_per_wall_second']} frames/s")
+    print(json.dumps(report, indent=2), flush=True)
+
+
 def _check_wifi(display, args, log):
     """
     Check WiFi connectivity on boot.
@@ -139,24 +388,34 @@ def _check_wifi(display, args, log):
 
 
 def _run_with_reload(args):
-    """Run with file-watching auto-reload for development."""
+    """
+    Dev mode: run Pixie in a child process that hot-reloads app modules in
+    place (see src/core/hot_reload.py), and restart it when it asks to
+    (a core file changed) or after it crashes and a file changes.
+    """
     import subprocess
+    from src.core.hot_reload import FileWatcher, RESTART_EXIT_CODE
 
-    print("🔄 Dev mode: watching src/ for changes...")
+    print("🔄 Dev mode: hot-reloading src/apps, restarting on other changes in src/...")
 
     # Build the command to run without --dev (to avoid infinite recursion)
-    cmd = [sys.executable, '-u', __file__, '--emulator']
+    cmd = [sys.executable, '-u', __file__, '--emulator', '--hot-reload']
     if args.app:
         cmd.extend(['--app', args.app])
+    if args.pacing:
+        cmd.extend(['--pacing', args.pacing])
 
     while True:
         process = subprocess.Popen(cmd)
         try:
-            # Wait for file changes
-            _wait_for_changes('src/')
-            print("\n🔄 File change detected, restarting...")
-            process.terminate()
-            process.wait(timeout=5)
+            code = process.wait()
+            if code == RESTART_EXIT_CODE:
+                print("\n🔄 Core file changed, restarting...")
+                continue
+            print(f"\nPixie exited with code {code}; waiting for a file change to restart...")
+            watcher = FileWatcher()
+            watcher.wait()
+            watcher.close()
         except KeyboardInterrupt:
             process.terminate()
             process.wait(timeout=5)
@@ -164,44 +423,5 @@ def _run_with_reload(args):
             break
 
 
-def _wait_for_changes(watch_dir):
-    """Block until a .py or .html file changes in watch_dir."""
-    try:
-        from watchdog.observers import Observer
-        from watchdog.events import FileSystemEventHandler
-        import threading
-
-        changed = threading.Event()
-
-        class Handler(FileSystemEventHandler):
-            def on_modified(self, event):
-                if event.src_path.endswith(('.py', '.html', '.css', '.js')):
-                    changed.set()
-
-        observer = Observer()
-        observer.schedule(Handler(), watch_dir, recursive=True)
-        observer.start()
-        changed.wait()  # Block until a file changes
-        observer.stop()
-    except ImportError:
-        # Fallback: simple polling if watchdog isn't installed
-        import hashlib
-
-        def hash_dir(d):
-            h = hashlib.md5()
-            for root, _, files in os.walk(d):
-                for f in sorted(files):
-                    if f.endswith(('.py', '.html', '.css', '.js')):
-                        path = os.path.join(root, f)
-                        h.update(os.path.getmtime(path).__str__().encode())
-            return h.hexdigest()
-
-        snapshot = hash_dir(watch_dir)
-        while True:
-            time.sleep(1)
-            if hash_dir(watch_dir) != snapshot:
-                return
-
-
 if __name__ == "__main__":
     main()
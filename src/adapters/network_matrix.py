@@ -0,0 +1,393 @@
+"""
+Network frame server: render once on a host, display on many Pixies.
+
+NetworkMatrixAdapter is a display adapter for the host. Every update()
+it sends the frame (or a per-device viewport of it) to each endpoint
+over UDP, then a PRESENT message so all receivers flip together.
+NetworkFrameReceiver runs on each thin client and blits incoming frames
+into its local display (RealMatrixAdapter, or the web emulator).
+
+Wire format, one UDP datagram per message (integers big-endian):
+
+    magic     4s   b'PXN1'
+    type      B    1 = FRAME, 2 = PRESENT, 3 = KEYFRAME_REQUEST
+    encoding  B    FRAME only: 0 = zlib keyframe, 1 = zlib XOR delta,
+                   2 = zlib indexed keyframe, 3 = zlib indexed delta,
+                   plus 0x80 when the receiver must wait for PRESENT
+    seq       I    frame sequence number
+    base_seq  I    FRAME delta only: frame the delta applies to
+    width     H    FRAME only
+    height    H    FRAME only
+    payload        FRAME only: zlib-compressed packed RGB (row-major), or
+                   for indexed frames (see src/core/indexed_buffer.py):
+                     keyframe: 768-byte palette + one index byte per pixel
+                     delta:    count H + count (index, r, g, b) palette
+                               changes + XOR of the index plane
+
+Deltas XOR the frame against the previous one sent to that device, so
+static regions compress to almost nothing. A receiver that misses a
+frame can't apply the next delta; it asks for a keyframe instead (as it
+does for corrupt, truncated or wrong-sized packets, which are dropped), and
+the host also sends one every `keyframe_interval` frames. Frames drawn
+with blit_indexed() are sent indexed: a third of the pixel data, and a
+palette animation sends only the changed palette entries.
+"""
+
+import socket
+import struct
+import time
+import zlib
+
+from src.core.color_lut import ColorLUT
+from src.core.display_interface import DisplayInterface
+from src.core.indexed_buffer import PALETTE_BYTES, apply_palette_diff, diff_palette, expand
+from src.core.matrix_buffer import MatrixBuffer
+from src.core.logger import get_logger
+
+log = get_logger()
+
+MAGIC = b'PXN1'
+HEADER = struct.Struct('>4sBBIIHH')
+MSG_FRAME = 1
+MSG_PRESENT = 2
+MSG_KEYFRAME_REQUEST = 3
+ENC_KEYFRAME = 0
+ENC_DELTA = 1
+ENC_INDEXED_KEYFRAME = 2
+ENC_INDEXED_DELTA = 3
+ENC_SYNC_FLAG = 0x80
+DEFAULT_PORT = 7070
+MAX_DATAGRAM = 65507
+PALETTE_COUNT = struct.Struct('>H')
+
+
+def xor_bytes(a, b):
+    """XOR two equal-length byte strings (done in C via big ints)."""
+    n = len(a)
+    return (int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).to_bytes(n, 'big')
+
+
+def parse_endpoint(spec):
+    """Parse 'host:port' (port optional) into a (host, port) tuple."""
+    host, _, port = spec.rpartition(':')
+    if not host:
+        return spec, DEFAULT_PORT
+    return host, int(port)
+
+
+class Endpoint:
+    """
+    One remote Pixie. `viewport` (x, y, width, height) selects the part
+    of the host canvas it shows; None mirrors the whole canvas.
+    """
+
+    def __init__(self, host, port=DEFAULT_PORT, viewport=None):
+        self.address = (socket.gethostbyname(host), port)
+        self.viewport = tuple(viewport) if viewport else None
+        self.last_frame = None      # last RGB frame sent (delta base)
+        self.last_indexed = None    # last (indices, palette) sent (indexed delta base)
+        self.last_seq = 0
+        self.needs_keyframe = True
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.keyframes_sent = 0
+        self.indexed_frames_sent = 0
+
+
+class NetworkMatrixAdapter(DisplayInterface):
+    """
+    Adapter that pushes frames to remote Pixie devices instead of
+    driving local hardware.
+    """
+
+    def __init__(self, width=64, height=64, endpoints=None, sync=True,
+                 keyframe_interval=60, compress_level=1):
+        super().__init__(width, height)
+        self.buffer = MatrixBuffer(width, height)
+        self._indexed = None  # (indices, palette) from blit_indexed(), sent as is
+        self.endpoints = endpoints or []
+        self.sync = sync
+        self.keyframe_interval = keyframe_interval
+        self.compress_level = compress_level
+        self.seq = 0
+        self.color = ColorLUT()  # brightness only; panels calibrate on the receiver
+
+        for ep in self.endpoints:
+            vw, vh = ep.viewport[2:] if ep.viewport else (width, height)
+            if vw * vh * 3 > MAX_DATAGRAM - HEADER.size:
+                raise ValueError(f"Viewport {vw}x{vh} for {ep.address} is too large for one datagram")
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+        self._by_address = {ep.address: ep for ep in self.endpoints}
+
+    def set_brightness(self, value):
+        """Brightness is applied at the host, so all devices match."""
+        self._brightness = max(0, min(100, int(value)))
+        self.color.configure(brightness=self._brightness)
+
+    def _materialize(self):
+        """Expand a pending indexed frame into the RGB buffer (something draws over it)."""
+        indices, palette = self._indexed
+        self._indexed = None
+        self.buffer.blit(expand(indices, palette))
+
+    def set_pixel(self, x, y, r, g, b):
+        if self._indexed is not None:
+            self._materialize()
+        self.buffer.set_pixel(x, y, r, g, b)
+
+    def fill(self, r, g, b):
+        self._indexed = None
+        self.buffer.fill(r, g, b)
+
+    def clear(self):
+        self._indexed = None
+        self.buffer.clear()
+
+    def blit(self, frame):
+        self._indexed = None
+        self.buffer.blit(frame)
+
+    def blit_indexed(self, indices, palette):
+        if len(indices) != self.width * self.height:
+            raise ValueError(f"Index frame must be {self.width * self.height} bytes, got {len(indices)}")
+        self._indexed = (bytes(indices), bytes(palette))
+
+    def snapshot(self):
+        if self._indexed is not None:
+            self._materialize()
+        return bytes(self.buffer.get_bytes())
+
+    def update(self):
+        """Send the frame to every endpoint, then present it everywhere."""
+        self._poll_requests()
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        force_key = self.keyframe_interval and self.seq % self.keyframe_interval == 0
+
+        if self._indexed is not None:
+            indices, palette = self._indexed
+            palette = bytes(self.color.apply(palette))
+            for ep in self.endpoints:
+                self._send_indexed(ep, self._crop(indices, ep.viewport, 1), palette, force_key)
+        else:
+            frame = bytes(self.color.apply(self.buffer.get_bytes()))
+            for ep in self.endpoints:
+                self._send_frame(ep, self._crop(frame, ep.viewport), force_key)
+
+        if self.sync:
+            present = HEADER.pack(MAGIC, MSG_PRESENT, 0, self.seq, 0, 0, 0)
+            for ep in self.endpoints:
+                self._sendto(present, ep)
+
+    def _crop(self, frame, viewport, bpp=3):
+        if viewport is None:
+            return frame
+        x, y, w, h = viewport
+        stride = self.width * bpp
+        return b''.join(frame[row * stride + x * bpp:row * stride + (x + w) * bpp]
+                        for row in range(y, y + h))
+
+    def _send_frame(self, ep, frame, force_key):
+        w, h = ep.viewport[2:] if ep.viewport else (self.width, self.height)
+        if ep.needs_keyframe or force_key or ep.last_frame is None:
+            encoding, base_seq, data = ENC_KEYFRAME, 0, frame
+            ep.needs_keyframe = False
+            ep.keyframes_sent += 1
+        else:
+            encoding, base_seq, data = ENC_DELTA, ep.last_seq, xor_bytes(frame, ep.last_frame)
+        if self._send_encoded(ep, encoding, base_seq, w, h, data):
+            ep.last_frame = frame
+            ep.last_indexed = None
+
+    def _send_indexed(self, ep, indices, palette, force_key):
+        w, h = ep.viewport[2:] if ep.viewport else (self.width, self.height)
+        if ep.needs_keyframe or force_key or ep.last_indexed is None:
+            encoding, base_seq, data = ENC_INDEXED_KEYFRAME, 0, palette + indices
+            ep.needs_keyframe = False
+            ep.keyframes_sent += 1
+        else:
+            last_indices, last_palette = ep.last_indexed
+            changes = diff_palette(last_palette, palette)
+            data = (PALETTE_COUNT.pack(len(changes) // 4) + changes
+                    + xor_bytes(indices, last_indices))
+            encoding, base_seq = ENC_INDEXED_DELTA, ep.last_seq
+        if self._send_encoded(ep, encoding, base_seq, w, h, data):
+            ep.last_indexed = (indices, palette)
+            ep.last_frame = None
+            ep.indexed_frames_sent += 1
+
+    def _send_encoded(self, ep, encoding, base_seq, w, h, data):
+        payload = zlib.compress(data, self.compress_level)
+        if self.sync:
+            encoding |= ENC_SYNC_FLAG
+        header = HEADER.pack(MAGIC, MSG_FRAME, encoding, self.seq, base_seq, w, h)
+        if not self._sendto(header + payload, ep):
+            return False
+        ep.last_seq = self.seq
+        ep.frames_sent += 1
+        return True
+
+    def _sendto(self, data, ep):
+        try:
+            self._sock.sendto(data, ep.address)
+            ep.bytes_sent += len(data)
+            return True
+        except OSError as e:
+            # Unreachable device or full socket buffer: resync with a keyframe
+            log.debug(f"Send to {ep.address} failed: {e}")
+            ep.needs_keyframe = True
+            return False
+
+    def _poll_requests(self):
+        """Handle keyframe requests sent back by receivers."""
+        while True:
+            try:
+                data, address = self._sock.recvfrom(64)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                continue  # ICMP errors from unreachable endpoints surface here
+            if len(data) >= HEADER.size and data[:4] == MAGIC and data[4] == MSG_KEYFRAME_REQUEST:
+                ep = self._by_address.get(address)
+                if ep:
+                    ep.needs_keyframe = True
+
+    def get_metrics(self):
+        return {
+            "seq": self.seq,
+            "endpoints": [{
+                "address": f"{ep.address[0]}:{ep.address[1]}",
+                "viewport": ep.viewport,
+                "frames_sent": ep.frames_sent,
+                "keyframes_sent": ep.keyframes_sent,
+                "indexed_frames_sent": ep.indexed_frames_sent,
+                "bytes_sent": ep.bytes_sent,
+            } for ep in self.endpoints],
+        }
+
+
+class NetworkFrameReceiver:
+    """
+    Thin-client side: receives frames from a NetworkMatrixAdapter and
+    shows them on a local display.
+    """
+
+    def __init__(self, display, port=DEFAULT_PORT, host='0.0.0.0'):
+        self.display = display
+        self.port = port
+        self.host = host
+        self.frame_size = display.width * display.height * 3
+        self._frame = bytearray(self.frame_size)
+        self._frame_seq = None      # seq of the content in self._frame
+        self._indices = bytearray(display.width * display.height)
+        self._palette = bytearray(PALETTE_BYTES)
+        self._indexed_seq = None    # seq of the content in self._indices/_palette
+        self._pending_seq = None    # decoded but not yet presented
+        self._pending_indexed = False
+        self._recv_buf = bytearray(MAX_DATAGRAM)
+        self._last_key_request = 0.0
+        self.frames_presented = 0
+        self.frames_dropped = 0
+
+    def run(self):
+        """Receive and present frames until interrupted."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        log.info(f"Frame receiver listening on udp://{self.host}:{self.port}")
+        view = memoryview(self._recv_buf)
+
+        while True:
+            n, sender = sock.recvfrom_into(self._recv_buf)
+            if n < HEADER.size:
+                continue
+            magic, kind, encoding, seq, base_seq, w, h = HEADER.unpack_from(self._recv_buf)
+            if magic != MAGIC:
+                continue
+            if kind == MSG_FRAME:
+                if not self._decode(encoding & ~ENC_SYNC_FLAG, seq, base_seq, w, h, view[HEADER.size:n]):
+                    self._request_keyframe(sock, sender)
+                elif not encoding & ENC_SYNC_FLAG and self._pending_seq is not None:
+                    self._present()
+            elif kind == MSG_PRESENT and seq == self._pending_seq:
+                self._present()
+
+    def _decode(self, encoding, seq, base_seq, w, h, payload):
+        if w * 3 * h != self.frame_size:
+            log.warning(f"Dropping {w}x{h} frame, display is {self.display.width}x{self.display.height}")
+            self.frames_dropped += 1
+            return True
+        indexed = encoding in (ENC_INDEXED_KEYFRAME, ENC_INDEXED_DELTA)
+        base = self._indexed_seq if indexed else self._frame_seq
+        if encoding in (ENC_DELTA, ENC_INDEXED_DELTA) and base_seq != base:
+            self.frames_dropped += 1
+            return False
+
+        data = self._inflate(encoding, payload)
+        if data is None:
+            log.debug(f"Dropping malformed frame {seq} (encoding {encoding}, {len(payload)} bytes)")
+            self.frames_dropped += 1
+            return False
+        if encoding == ENC_INDEXED_KEYFRAME:
+            self._palette[:] = data[:PALETTE_BYTES]
+            self._indices[:] = data[PALETTE_BYTES:]
+        elif encoding == ENC_INDEXED_DELTA:
+            end = PALETTE_COUNT.size + PALETTE_COUNT.unpack_from(data)[0] * 4
+            apply_palette_diff(self._palette, data[PALETTE_COUNT.size:end])
+            self._indices[:] = xor_bytes(data[end:], self._indices)
+        elif encoding == ENC_DELTA:
+            self._frame[:] = xor_bytes(data, self._frame)
+        else:
+            self._frame[:] = data
+        # Only the kind of frame just received can be a delta base
+        self._indexed_seq, self._frame_seq = (seq, None) if indexed else (None, seq)
+        self._pending_seq = seq
+        self._pending_indexed = indexed
+        return True
+
+    def _inflate(self, encoding, payload):
+        """
+        Decompress a frame payload and check its layout before anything is
+        applied. Returns None for packets that are corrupt, truncated or of
+        the wrong size; those are dropped instead of ending the receiver.
+        """
+        pixels = len(self._indices)
+        if encoding in (ENC_KEYFRAME, ENC_DELTA):
+            limit = self.frame_size
+        elif encoding == ENC_INDEXED_KEYFRAME:
+            limit = PALETTE_BYTES + pixels
+        elif encoding == ENC_INDEXED_DELTA:
+            limit = PALETTE_COUNT.size + 256 * 4 + pixels
+        else:
+            return None
+        inflater = zlib.decompressobj()
+        try:
+            # Bounded, so a small packet can't inflate into a huge buffer
+            data = inflater.decompress(payload, limit + 1)
+        except zlib.error:
+            return None
+        if len(data) > limit or not inflater.eof:
+            return None
+        if encoding == ENC_INDEXED_DELTA:
+            if len(data) < PALETTE_COUNT.size:
+                return None
+            end = PALETTE_COUNT.size + PALETTE_COUNT.unpack_from(data)[0] * 4
+            return data if len(data) - end == pixels else None
+        return data if len(data) == limit else None
+
+    def _present(self):
+        if self._pending_indexed:
+            self.display.blit_indexed(self._indices, self._palette)
+        else:
+            self.display.blit(self._frame)
+        self.display.update()
+        self._pending_seq = None
+        self.frames_presented += 1
+
+    def _request_keyframe(self, sock, sender):
+        now = time.monotonic()
+        if now - self._last_key_request < 0.2:
+            return
+        self._last_key_request = now
+        sock.sendto(HEADER.pack(MAGIC, MSG_KEYFRAME_REQUEST, 0, 0, 0, 0, 0), sender)
@@ -1,4 +1,8 @@
+from src.core.color_lut import ColorLUT
 from src.core.display_interface import DisplayInterface
+from src.core.indexed_buffer import expand
+from src.core.matrix_buffer import MatrixBuffer
+from src.core.panel_geometry import PanelGeometry
 
 try:
     from rgbmatrix import RGBMatrix, RGBMatrixOptions
@@ -6,42 +10,112 @@ except ImportError:
     RGBMatrix = None
     RGBMatrixOptions = None
 
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
 class RealMatrixAdapter(DisplayInterface):
     """
     Adapter that drives the real RGB Matrix hardware.
+    Apps draw into a virtual canvas buffer; update() remaps it onto the
+    chained/parallel panel layout described by the PanelGeometry.
+    Brightness, gamma and white balance are applied in software through
+    the ColorLUT, so the driver always runs at full brightness.
+
+    An indexed frame from blit_indexed() stays indexed until update(),
+    where the LUT is applied to its 256 palette entries before expanding,
+    unless something draws over it first.
+
+    With `refresh_hz` set, the panel refresh is capped to that rate so its
+    vsync is a known clock, and sync_to_vsync() lets the render loop pace
+    itself off SwapOnVSync instead of sleeping.
     """
-    def __init__(self, width=64, height=64):
-        super().__init__()
+    def __init__(self, geometry=None, hardware_mapping='adafruit-hat', gpio_slowdown=4, color=None,
+                 refresh_hz=None):
+        self.geometry = geometry or PanelGeometry()
+        super().__init__(self.geometry.width, self.geometry.height)
         if RGBMatrix is None:
             raise ImportError("rpi-rgb-led-matrix library not found. Are you running on the Pi?")
+        if Image is None:
+            raise ImportError("Pillow is required to drive the matrix hardware.")
 
         self.options = RGBMatrixOptions()
-        self.options.rows = height
-        self.options.cols = width
-        self.options.chain_length = 1
-        self.options.parallel = 1
-        self.options.hardware_mapping = 'adafruit-hat'
-        self.options.gpio_slowdown = 4
+        self.options.rows = self.geometry.panel_height
+        self.options.cols = self.geometry.panel_width
+        self.options.chain_length = self.geometry.chain_length
+        self.options.parallel = self.geometry.parallel
+        self.options.hardware_mapping = hardware_mapping
+        self.options.gpio_slowdown = gpio_slowdown
         self.options.drop_privileges = False
 
+        self.options.brightness = 100
+        self.refresh_hz = refresh_hz
+        if refresh_hz:
+            self.options.limit_refresh_rate_hz = int(refresh_hz)
+        self._framerate_fraction = 1
+
         self.matrix = RGBMatrix(options=self.options)
         self.canvas = self.matrix.CreateFrameCanvas()
-        self.width = width
-        self.height = height
+        self.buffer = MatrixBuffer(self.width, self.height)
+        self._indexed = None  # (indices, palette) pending expansion at update()
+        self.color = color or ColorLUT()
+        self._brightness = self.color.brightness
 
     def set_brightness(self, value):
-        """Set hardware brightness (0-100)."""
+        """Set brightness (0-100); rebuilds the color LUT."""
         self._brightness = max(0, min(100, int(value)))
-        self.matrix.brightness = self._brightness
+        self.color.configure(brightness=self._brightness)
+
+    def sync_to_vsync(self, fps):
+        """Show each frame for a whole number of refreshes; needs a known refresh_hz."""
+        if not self.refresh_hz:
+            return None
+        self._framerate_fraction = max(1, min(255, round(self.refresh_hz / fps)))
+        return round(self._framerate_fraction * 1e9 / self.refresh_hz)
+
+    def _materialize(self):
+        """Expand a pending indexed frame into the RGB buffer (something draws over it)."""
+        indices, palette = self._indexed
+        self._indexed = None
+        self.buffer.blit(expand(indices, palette))
 
     def set_pixel(self, x, y, r, g, b):
-        self.canvas.SetPixel(x, y, r, g, b)
+        if self._indexed is not None:
+            self._materialize()
+        self.buffer.set_pixel(x, y, r, g, b)
 
     def fill(self, r, g, b):
-        self.canvas.Fill(r, g, b)
+        self._indexed = None
+        self.buffer.fill(r, g, b)
 
     def clear(self):
-        self.canvas.Clear()
+        self._indexed = None
+        self.buffer.clear()
+
+    def blit(self, frame):
+        self._indexed = None
+        self.buffer.blit(frame)
+
+    def blit_indexed(self, indices, palette):
+        if len(indices) != self.width * self.height:
+            raise ValueError(f"Index frame must be {self.width * self.height} bytes, got {len(indices)}")
+        self._indexed = (bytes(indices), bytes(palette))
+
+    def snapshot(self):
+        if self._indexed is not None:
+            self._materialize()
+        return bytes(self.buffer.get_bytes())
 
     def update(self):
-        self.canvas = self.matrix.SwapOnVSync(self.canvas)
+        """Color-correct, remap the virtual canvas to panel order and swap on vsync."""
+        if self._indexed is not None:
+            indices, palette = self._indexed
+            frame = expand(indices, self.color.apply(palette))
+        else:
+            frame = self.color.apply(self.buffer.get_bytes())
+        native = self.geometry.to_native(frame)
+        image = Image.frombuffer('RGB', (self.geometry.native_width, self.geometry.native_height),
+                                 native, 'raw', 'RGB', 0, 1)
+        self.canvas.SetImage(image, 0, 0, unsafe=True)
+        self.canvas = self.matrix.SwapOnVSync(self.canvas, self._framerate_fraction)
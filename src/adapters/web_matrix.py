@@ -1,3 +1,6 @@
+import time
+
+from src.core.color_lut import ColorLUT
 from src.core.display_interface import DisplayInterface
 from src.core.matrix_buffer import MatrixBuffer
 
@@ -6,39 +9,73 @@ class WebMatrixAdapter(DisplayInterface):
     """
     Adapter that holds a pixel buffer for the web emulator.
     The actual serving is done by WebController when in emulator mode.
+
+    With `vsync_hz` set, update() simulates a panel refreshing at that rate:
+    it blocks until the next refresh boundary like SwapOnVSync does, so
+    vsync frame pacing can be exercised without the hardware.
     """
-    def __init__(self, width=64, height=64):
-        super().__init__()
-        self.width = width
-        self.height = height
+    def __init__(self, width=64, height=64, color=None, vsync_hz=None):
+        super().__init__(width, height)
         self.buffer = MatrixBuffer(width, height)
         self._socketio = None
+        # Brightness (and any calibration) is applied to a copy at update()
+        self.color = color or ColorLUT()
+        self._presented = self.buffer
+        self.vsync_hz = vsync_hz
+        self._refresh_ns = round(1e9 / vsync_hz) if vsync_hz else None
+        self._swap_period_ns = self._refresh_ns
+        self._last_swap = 0
 
     def set_socketio(self, socketio):
         """Called by WebController to enable WebSocket frame push."""
         self._socketio = socketio
 
     def set_brightness(self, value):
-        """Set emulated brightness (0-100). Applied as alpha scaling in the browser."""
+        """Set emulated brightness (0-100), applied via the color LUT at update()."""
         self._brightness = max(0, min(100, int(value)))
+        self.color.configure(brightness=self._brightness)
+
+    def sync_to_vsync(self, fps):
+        if not self.vsync_hz:
+            return None
+        fraction = max(1, round(self.vsync_hz / fps))
+        self._swap_period_ns = fraction * self._refresh_ns
+        return self._swap_period_ns
+
+    def _wait_for_vsync(self):
+        """Block until the simulated swap: a refresh boundary at least one frame after the last."""
+        now = time.monotonic_ns()
+        target = max(now, self._last_swap + self._swap_period_ns)
+        target = -(-target // self._refresh_ns) * self._refresh_ns
+        if target > now:
+            time.sleep((target - now) / 1e9)
+        self._last_swap = target
 
     def set_pixel(self, x, y, r, g, b):
-        # Scale by brightness for visual accuracy in emulator
-        scale = self._brightness / 100.0
-        self.buffer.set_pixel(x, y, int(r * scale), int(g * scale), int(b * scale))
+        self.buffer.set_pixel(x, y, r, g, b)
 
     def fill(self, r, g, b):
-        scale = self._brightness / 100.0
-        self.buffer.fill(int(r * scale), int(g * scale), int(b * scale))
+        self.buffer.fill(r, g, b)
 
     def clear(self):
         self.buffer.clear()
 
+    def blit(self, frame):
+        self.buffer.blit(frame)
+
     def update(self):
         """Push the current frame to connected browsers via WebSocket."""
+        if self.color.is_identity:
+            self._presented = self.buffer
+        else:
+            if self._presented is self.buffer:
+                self._presented = MatrixBuffer(self.width, self.height)
+            self._presented.blit(self.color.apply(self.buffer.get_bytes()))
+        if self._refresh_ns:
+            self._wait_for_vsync()
         if self._socketio:
-            self._socketio.emit('frame', self.buffer.get_buffer())
+            self._socketio.emit('frame', self._presented.get_buffer())
 
     def get_matrix_data(self):
         """Return buffer data (used by WebController for HTTP fallback)."""
-        return self.buffer.get_buffer()
+        return self._presented.get_buffer()
@@ -1,7 +1,16 @@
-print("DEBUG: Loading src.apps package")
-try:
-    from . import clock_app
-    from . import weather_app
-    print("DEBUG: Successfully imported apps")
-except Exception as e:
-    print(f"DEBUG: Failed to import apps: {e}")
+# Built-in apps, registered by name and imported on first use.
+# Values are "module:ClassName" for AppManager.register_lazy().
+BUILTIN_APPS = {
+    "clock": "src.apps.clock_app:ClockApp",
+    "weather": "src.apps.weather_app:WeatherApp",
+    "stream": "src.apps.stream_input_app:StreamInputApp",
+    "plasma": "src.apps.effect_apps:PlasmaApp",
+    "fire": "src.apps.effect_apps:FireApp",
+    "starfield": "src.apps.effect_apps:StarfieldApp",
+    "gradient": "src.apps.effect_apps:GradientApp",
+    "noise": "src.apps.effect_apps:NoiseApp",
+    "cycle": "src.apps.color_cycle_app:ColorCycleApp",
+    "shm_input": "src.apps.shm_input_app:SharedMemoryInputApp",
+    "pet": "src.apps.pixel_pet_app:PixelPetApp",
+    "transit": "src.apps.transit_app:TransitApp",
+}
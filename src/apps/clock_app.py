@@ -1,5 +1,5 @@
-from datetime import datetime
 from src.core.base_app import BaseApp
+from src.core.clock import get_clock
 
 class ClockApp(BaseApp):
     def __init__(self, display, config=None):
@@ -16,8 +16,8 @@ class ClockApp(BaseApp):
         self.display.clear()
         
         # Border
-        width = 64
-        height = 64
+        width = self.display.width
+        height = self.display.height
         for x in range(width):
             self.display.set_pixel(x, 0, 0, 0, 255)         # Top Blue
             self.display.set_pixel(x, height-1, 0, 0, 255)  # Bottom Blue
@@ -26,7 +26,7 @@ class ClockApp(BaseApp):
             self.display.set_pixel(width-1, y, 0, 0, 255)   # Right Blue
 
         # Draw a simple blinking colon in the center
-        if datetime.now().second % 2 == 0:
+        if get_clock().now().second % 2 == 0:
             cx, cy = width // 2, height // 2
             self.display.set_pixel(cx, cy - 2, 255, 255, 255)
             self.display.set_pixel(cx, cy + 2, 255, 255, 255)
@@ -0,0 +1,52 @@
+import colorsys
+import math
+
+from src.core.base_app import BaseApp
+from src.core.clock import get_clock
+from src.core.indexed_buffer import IndexedBuffer, PALETTE_SIZE
+
+
+def hue_palette(saturation=1.0, value=1.0):
+    """Full hue circle as a packed 256-entry RGB palette."""
+    out = bytearray()
+    for i in range(PALETTE_SIZE):
+        r, g, b = colorsys.hsv_to_rgb(i / PALETTE_SIZE, saturation, value)
+        out += bytes((round(r * 255), round(g * 255), round(b * 255)))
+    return bytes(out)
+
+
+class ColorCycleApp(BaseApp):
+    """
+    Classic color cycling: a palette-indexed pattern drawn once and
+    animated by rotating the palette, so a frame costs no per-pixel work.
+    Config: speed (float), saturation (0-1).
+    """
+
+    def __init__(self, display, config=None):
+        super().__init__(display, config)
+        w, h = display.width, display.height
+        self.frame = IndexedBuffer(w, h, palette=hue_palette(self.config.get('saturation', 1.0)))
+        cx, cy, size = w / 2, h / 2, max(w, h) / 64
+        for y in range(h):
+            for x in range(w):
+                dx, dy = x - cx, y - cy
+                rings = math.hypot(dx, dy) * 6 / size
+                swirl = math.atan2(dy, dx) * 128 / math.pi
+                self.frame.set_index(x, y, int(rings + swirl) & 255)
+        self._t0 = get_clock().monotonic()
+        self._offset = 0
+
+    def configure(self, config):
+        super().configure(config)
+        if 'saturation' in config:
+            self.frame.set_palette(hue_palette(self.config['saturation']))
+            self.frame.rotate_palette(step=self._offset)
+
+    def update(self):
+        offset = int((get_clock().monotonic() - self._t0) * self.config.get('speed', 1.0) * 60) & 255
+        if offset != self._offset:
+            self.frame.rotate_palette(step=offset - self._offset)
+            self._offset = offset
+
+    def draw(self):
+        self.display.blit_indexed(self.frame.indices, self.frame.palette)
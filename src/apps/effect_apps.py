@@ -0,0 +1,55 @@
+from src.core.base_app import BaseApp
+from src.core.clock import get_clock
+from src.core.effects import Fire, Gradient, Noise, Plasma, Starfield
+
+
+class EffectApp(BaseApp):
+    """
+    Full-screen ambient animation backed by a vectorized Effect.
+    Config: speed (float), palette (name from src.core.effects.PALETTES).
+    """
+
+    effect_class = None
+
+    def __init__(self, display, config=None):
+        super().__init__(display, config)
+        self.effect = self.effect_class(display.width, display.height,
+                                        speed=self.config.get('speed', 1.0),
+                                        palette=self.config.get('palette'))
+        self._t0 = get_clock().monotonic()
+
+    def start(self):
+        super().start()
+        self._t0 = get_clock().monotonic()
+
+    def configure(self, config):
+        if 'palette' in config:
+            self.effect.set_palette(config['palette'])
+        super().configure(config)
+        self.effect.speed = self.config.get('speed', 1.0)
+
+    def update(self):
+        self.effect.render(get_clock().monotonic() - self._t0)
+
+    def draw(self):
+        self.display.blit(self.effect.frame_bytes)
+
+
+class PlasmaApp(EffectApp):
+    effect_class = Plasma
+
+
+class FireApp(EffectApp):
+    effect_class = Fire
+
+
+class StarfieldApp(EffectApp):
+    effect_class = Starfield
+
+
+class GradientApp(EffectApp):
+    effect_class = Gradient
+
+
+class NoiseApp(EffectApp):
+    effect_class = Noise
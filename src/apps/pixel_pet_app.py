@@ -0,0 +1,223 @@
+"""
+Pixel Pet: a small Tamagotchi-style creature living on the matrix.
+
+The pet wanders, gets hungry and bored over time, sleeps at night and
+reacts to being fed or played with (POST /api/config with
+{"app": "pet", "config": {"feed": true}} or {"play": true}). Everything
+is drawn with the sprite engine (src/core/sprites.py): the sky and
+ground are a cached background and only what moves is redrawn.
+"""
+
+import random
+
+from src.core.base_app import BaseApp
+from src.core.clock import get_clock
+from src.core.sprites import Sprite, SpriteScene, SpriteSheet
+
+PET_COLORS = {'#': (250, 170, 60), 'o': (20, 20, 20), 'p': (255, 120, 150), 'w': (255, 255, 255)}
+PET_WALK = [
+    ["..#....#..",
+     ".###..###.",
+     ".########.",
+     "##o####o##",
+     "####pp####",
+     ".########.",
+     ".#.#..#.#.",
+     "..#....#.."],
+    ["..#....#..",
+     ".###..###.",
+     ".########.",
+     "##o####o##",
+     "####pp####",
+     ".########.",
+     ".##....##.",
+     ".#......#."],
+]
+PET_SLEEP = [
+    ["..........",
+     "..........",
+     "..#....#..",
+     ".########.",
+     "##-####-##",
+     "##########",
+     ".########.",
+     ".##....##."],
+]
+PET_EAT = [
+    ["..#....#..",
+     ".###..###.",
+     ".########.",
+     "##o####o##",
+     "####ww####",
+     ".########.",
+     ".#.#..#.#.",
+     "..#....#.."],
+    ["..#....#..",
+     ".###..###.",
+     ".########.",
+     "##o####o##",
+     "####pp####",
+     ".########.",
+     ".#.#..#.#.",
+     "..#....#.."],
+]
+HEART = [[".#.#.", "#####", "#####", ".###.", "..#.."]]
+FOOD = [[".##.", "####", "####", ".##."]]
+STAR = [["#"], ["."]]
+CLOUD = [["..####...", ".#######.", "#########"]]
+
+HUNGER_PER_HOUR = 8.0        # points (0-100) while awake
+BOREDOM_PER_HOUR = 5.0
+NIGHT_HOURS = (22, 7)        # asleep from/until
+STAR_COUNT = 24
+
+
+def _sky(width, height, ground, night):
+    """Vertical sky gradient over a strip of ground."""
+    rows = []
+    for y in range(height):
+        if y >= ground:
+            color = (30, 90, 30) if (y - ground) % 3 else (40, 110, 40)
+        elif night:
+            color = (5, 5, 20 + y * 20 // height)
+        else:
+            color = (60 + y * 80 // height, 130 + y * 60 // height, 230)
+        rows.append(bytes(color) * width)
+    return b''.join(rows)
+
+
+class PixelPetApp(BaseApp):
+    """
+    Config keys: name (str), seed (int). Actions via configure():
+    feed, play (true).
+    """
+
+    def __init__(self, display, config=None):
+        super().__init__(display, config)
+        w, h = display.width, display.height
+        self.rng = random.Random(self.config.get('seed'))
+        self.ground = h - max(6, h // 6)
+        self.scene = SpriteScene(w, h)
+        self._night = None
+        palette = dict(PET_COLORS, **{'-': PET_COLORS['o']})
+        self.sheets = {
+            'walk': SpriteSheet.from_rows(PET_WALK, palette),
+            'sleep': SpriteSheet.from_rows(PET_SLEEP, palette),
+            'eat': SpriteSheet.from_rows(PET_EAT, palette),
+        }
+        heart = SpriteSheet.from_rows(HEART, {'#': (255, 60, 90)})
+        food = SpriteSheet.from_rows(FOOD, {'#': (200, 120, 40)})
+        stars = SpriteSheet.from_rows(STAR, {'#': (255, 255, 200), '.': (90, 90, 120)})
+        cloud = SpriteSheet.from_rows(CLOUD, {'#': (240, 240, 250)})
+
+        self.stars = [self.scene.add(Sprite(stars, x=self.rng.randrange(w), y=self.rng.randrange(self.ground - 8),
+                                            fps=self.rng.choice((0.5, 1, 1.5)), visible=False))
+                      for _ in range(STAR_COUNT)]
+        self.clouds = [self.scene.add(Sprite(cloud, x=self.rng.randrange(w), y=2 + i * 7, z=1))
+                       for i in range(2)]
+        self.pet = self.scene.add(Sprite(self.sheets['walk'], x=w // 2 - 5, y=self.ground - 8, z=3, fps=4))
+        self.food = self.scene.add(Sprite(food, z=2, visible=False))
+        self.hearts = []
+        self.heart_sheet = heart
+
+        self.state = 'walk'
+        self.hunger = 20.0
+        self.boredom = 20.0
+        self._direction = 1
+        self._state_until = 0.0
+        self._last = None
+        self._t0 = get_clock().monotonic()
+
+    def start(self):
+        super().start()
+        self._last = None
+
+    def configure(self, config):
+        actions = {k: config.pop(k) for k in ('feed', 'play') if k in config}
+        super().configure(config)
+        if actions.get('feed') and self.state != 'sleep':
+            self.food.x, self.food.y, self.food.visible = self.pet.x + 3, 0, True
+        if actions.get('play') and self.state != 'sleep':
+            self.boredom = max(0.0, self.boredom - 40)
+            self._burst_hearts(3)
+
+    def _burst_hearts(self, count):
+        for _ in range(count):
+            heart = self.scene.add(Sprite(self.heart_sheet, x=self.pet.x + self.rng.randint(-2, 8),
+                                          y=self.pet.y - 4, z=4))
+            heart.vy = -self.rng.uniform(0.3, 0.6)
+            self.hearts.append(heart)
+
+    def _is_night(self):
+        hour = get_clock().now().hour
+        start, end = NIGHT_HOURS
+        return hour >= start or hour < end
+
+    def update(self):
+        clock = get_clock()
+        now = clock.monotonic()
+        dt = 0.0 if self._last is None else min(now - self._last, 1.0)
+        self._last = now
+        w = self.display.width
+
+        night = self._is_night()
+        if night != self._night:
+            self._night = night
+            self.scene.set_background(_sky(w, self.display.height, self.ground, night))
+            for star in self.stars:
+                star.visible = night
+            for cloud in self.clouds:
+                cloud.visible = not night
+            self.state = 'sleep' if night else 'walk'
+            self.pet.sheet = self.sheets[self.state]
+
+        if self.state != 'sleep':
+            self.hunger = min(100.0, self.hunger + HUNGER_PER_HOUR * dt / 3600)
+            self.boredom = min(100.0, self.boredom + BOREDOM_PER_HOUR * dt / 3600)
+
+        for cloud in self.clouds:
+            cloud.x += 2 * dt
+            if cloud.x > w:
+                cloud.x = -cloud.image.width
+
+        if self.food.visible:
+            self.food.y += 20 * dt
+            if self.food.y >= self.ground - 4:
+                self.food.visible = False
+                self.hunger = max(0.0, self.hunger - 35)
+                self._set_state('eat', now, 2.0)
+                self._burst_hearts(1)
+
+        if self.state == 'walk':
+            speed = 6 if self.hunger < 70 else 2  # hungry pets dawdle
+            self.pet.x += self._direction * speed * dt
+            if self.pet.x <= 0 or self.pet.x >= w - self.pet.image.width:
+                self._direction = -self._direction
+                self.pet.x = max(0, min(self.pet.x, w - self.pet.image.width))
+            if now >= self._state_until and self.rng.random() < dt * 0.2:
+                self._direction = self.rng.choice((-1, 1))
+                self._state_until = now + self.rng.uniform(2, 6)
+        elif self.state == 'eat' and now >= self._state_until:
+            self._set_state('walk', now, 0)
+
+        for heart in list(self.hearts):
+            heart.y += heart.vy * 30 * dt
+            if heart.y < -heart.image.height:
+                self.scene.remove(heart)
+                self.hearts.remove(heart)
+
+        self.scene.render(now - self._t0)
+
+    def _set_state(self, state, now, duration):
+        self.state = state
+        self.pet.sheet = self.sheets[state]
+        self._state_until = now + duration
+
+    def draw(self):
+        self.display.blit(self.scene.frame)
+
+    def get_metrics(self):
+        metrics = {"state": self.state, "hunger": round(self.hunger, 1),
+                   "boredom": round(self.boredom, 1)}
+        metrics.update(self.scene.get_metrics())
+        return metrics
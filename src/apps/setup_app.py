@@ -1,6 +1,10 @@
+from src.core.animation_loop import AnimationLoop
 from src.core.base_app import BaseApp
+from src.core.clock import get_clock
 from src.core.qr_display import draw_qr_on_display
-import time
+import math
+
+INSTRUCTIONS_LOOP = 3.0  # seconds; the border pulse and arrow blink both repeat within it
 
 
 class SetupApp(BaseApp):
@@ -15,60 +19,70 @@ class SetupApp(BaseApp):
         self.ap_ssid = ap_ssid
         self.qr_data = qr_data or f"WIFI:S:{ap_ssid};T:nopass;;"
         self._show_qr = True
-        self._last_toggle = time.time()
+        self._last_toggle = get_clock().time()
         self._toggle_interval = 5.0  # Switch between QR and text every 5s
+        self._started = self._last_toggle
+        # Both screens are precomputed once and played back (see animation_loop.py)
+        self._qr = AnimationLoop(draw_qr, duration=0, params={"data": self.qr_data})
+        self._instructions = AnimationLoop(draw_instructions, duration=INSTRUCTIONS_LOOP)
 
     def update(self):
-        now = time.time()
+        now = get_clock().time()
         if now - self._last_toggle > self._toggle_interval:
             self._show_qr = not self._show_qr
             self._last_toggle = now
 
     def draw(self):
         self.display.clear()
+        t = get_clock().time() - self._started
         if self._show_qr:
-            self._draw_qr()
+            self._qr.draw(self.display, t)
         else:
-            self._draw_instructions()
-
-    def _draw_qr(self):
-        """Draw the WiFi QR code on the matrix."""
-        draw_qr_on_display(self.display, self.qr_data)
-
-    def _draw_instructions(self):
-        """Draw simple 'SETUP' indicator with AP name."""
-        d = self.display
-        w, h = 64, 64
-
-        # Pulsing blue border
-        t = time.time()
-        pulse = int(128 + 127 * (0.5 + 0.5 * __import__('math').sin(t * 2)))
-
-        for x in range(w):
-            d.set_pixel(x, 0, 0, 0, pulse)
-            d.set_pixel(x, h - 1, 0, 0, pulse)
-        for y in range(h):
-            d.set_pixel(0, y, 0, 0, pulse)
-            d.set_pixel(w - 1, y, 0, 0, pulse)
-
-        # WiFi icon in center
-        import math
-        cx, cy = 32, 28
-        for radius in [5, 10, 15]:
-            for angle in range(60, 121):
-                rad = math.radians(angle + 180)
-                x = int(cx + radius * math.cos(rad))
-                y = int(cy + radius * math.sin(rad))
-                if 0 <= x < w and 0 <= y < h:
-                    d.set_pixel(x, y, 100, 100, 255)
-
-        # Dot
-        for dx in range(-1, 2):
-            for dy in range(-1, 2):
-                d.set_pixel(cx + dx, cy + dy, 100, 100, 255)
-
-        # "SETUP" text using simple pixel dots at bottom
-        # Draw a blinking arrow pointing at the QR
-        if int(t * 2) % 2 == 0:
-            for x in range(24, 40):
-                d.set_pixel(x, 56, 0, 100, 255)
+            self._instructions.draw(self.display, t)
+
+    def trim_caches(self):
+        self._qr.release()
+        self._instructions.release()
+
+
+def draw_qr(display, t, data):
+    """Draw the WiFi QR code on the matrix."""
+    draw_qr_on_display(display, data)
+
+
+def draw_instructions(display, t):
+    """Draw simple 'SETUP' indicator with AP name (loops every 3s)."""
+    d = display
+    w, h = d.width, d.height
+    scale = min(w, h) / 64
+
+    # Pulsing blue border
+    pulse = int(128 + 127 * (0.5 + 0.5 * math.sin(t * 2 * math.pi / INSTRUCTIONS_LOOP)))
+
+    for x in range(w):
+        d.set_pixel(x, 0, 0, 0, pulse)
+        d.set_pixel(x, h - 1, 0, 0, pulse)
+    for y in range(h):
+        d.set_pixel(0, y, 0, 0, pulse)
+        d.set_pixel(w - 1, y, 0, 0, pulse)
+
+    # WiFi icon in center
+    cx, cy = w // 2, h * 28 // 64
+    for radius in [int(5 * scale), int(10 * scale), int(15 * scale)]:
+        for angle in range(60, 121):
+            rad = math.radians(angle + 180)
+            x = int(cx + radius * math.cos(rad))
+            y = int(cy + radius * math.sin(rad))
+            if 0 <= x < w and 0 <= y < h:
+                d.set_pixel(x, y, 100, 100, 255)
+
+    # Dot
+    for dx in range(-1, 2):
+        for dy in range(-1, 2):
+            d.set_pixel(cx + dx, cy + dy, 100, 100, 255)
+
+    # "SETUP" text using simple pixel dots at bottom
+    # Draw a blinking arrow pointing at the QR
+    if int(t * 2) % 2 == 0:
+        for x in range(w * 24 // 64, w * 40 // 64):
+            d.set_pixel(x, h - 8, 0, 100, 255)
@@ -0,0 +1,100 @@
+"""
+Frame ingest from a shared-memory segment written by a local process.
+
+The zero-copy counterpart of StreamInputApp for software running on the
+Pixie itself: it writes packed RGB frames into the input segment with
+FrameSegment.write() (see src/core/frame_export.py) and this app shows
+the newest one each frame.
+"""
+
+from src.core.base_app import BaseApp
+from src.core.clock import get_clock
+from src.core.frame_export import DEFAULT_INPUT_NAME, FrameSegment
+from src.core.logger import get_logger
+
+log = get_logger()
+
+
+class SharedMemoryInputApp(BaseApp):
+    """
+    Shows frames written to a shared-memory segment. When no new frame
+    arrives for `timeout` seconds it asks the AppManager to return to the
+    previous app.
+
+    Config keys: segment (default pixie_input), timeout (default 5).
+    The segment is created if the 'shared_memory' config didn't already.
+    """
+
+    def __init__(self, display, config=None):
+        super().__init__(display, config)
+        self.segment_name = self.config.get('segment', DEFAULT_INPUT_NAME)
+        self.timeout = float(self.config.get('timeout', 5.0))
+        self._segment = None
+        self._front = bytearray(display.width * display.height * 3)
+        self._back = bytearray(len(self._front))
+        self._seq = 0
+        self._has_frame = False
+        self._last_frame = 0.0
+        self.frames = 0
+        self.skipped_frames = 0
+        self.torn_reads = 0
+
+    def start(self):
+        super().start()
+        if self._segment is None:
+            try:
+                self._segment = FrameSegment.attach(self.segment_name)
+            except FileNotFoundError:
+                self._segment = FrameSegment.create(self.segment_name, self.display.width,
+                                                    self.display.height)
+            if self._segment.frame_size != len(self._front):
+                size = f"{self._segment.width}x{self._segment.height}"
+                self._segment = None
+                raise ValueError(f"Input segment '{self.segment_name}' is {size}, "
+                                 f"display is {self.display.width}x{self.display.height}")
+            log.info(f"Shared-memory input reading '{self.segment_name}'")
+        self._seq = self._segment.seq & ~1  # only frames written from now on
+        self._has_frame = False
+        self._last_frame = get_clock().monotonic()
+
+    def update(self):
+        if self._segment is None:
+            return
+        now = get_clock().monotonic()
+        if self._read_frame():
+            self._last_frame = now
+        elif now - self._last_frame > self.timeout:
+            log.info(f"Shared-memory input idle for {self.timeout:g}s, falling back.")
+            self.request_exit()
+
+    def _read_frame(self):
+        """
+        One attempt at copying a new frame into the back buffer; never waits
+        on the writer from the render thread. A frame caught mid-write keeps
+        the last good one on screen until the next attempt.
+        """
+        seq = self._segment.begin_read()
+        if seq is None or seq <= self._seq:
+            return False
+        self._back[:] = self._segment.frame
+        if not self._segment.end_read(seq, self._back):
+            self.torn_reads += 1
+            return False
+        self._front, self._back = self._back, self._front
+        self.skipped_frames += max(0, (seq - self._seq) // 2 - 1)
+        self._seq = seq
+        self._has_frame = True
+        self.frames += 1
+        return True
+
+    def draw(self):
+        if self._has_frame:
+            self.display.blit(self._front)
+
+    def get_metrics(self):
+        return {
+            "segment": self.segment_name,
+            "frames": self.frames,
+            "skipped_frames": self.skipped_frames,
+            "torn_reads": self.torn_reads,
+        }
@@ -0,0 +1,176 @@
+"""
+Real-time frame ingest over UDP.
+
+Lets external software (music visualizers, home automation, other hosts)
+drive the matrix directly at 30-60 fps using DDP (Distributed Display
+Protocol), which is supported by xLights, WLED, LedFx and friends.
+
+Packet format (all integers big-endian):
+
+    byte 0      flags     0x40 = version 1, 0x10 = timecode present,
+                          0x01 = PUSH (frame complete, show it)
+    byte 1      sequence  low 4 bits, 1-15 (0 = not used)
+    byte 2      data type ignored, pixel data is always 8-bit RGB
+    byte 3      dest id   ignored
+    bytes 4-7   offset    byte offset of this fragment in the frame
+    bytes 8-9   length    number of pixel data bytes that follow
+    [bytes 10-13 timecode, only when the 0x10 flag is set]
+    payload     packed RGB bytes, row-major, top-left first
+
+A 64x64 frame is 12288 bytes, so senders split it into fragments (DDP
+uses 1440 bytes each) and set PUSH on the last one. A sender may also
+send a whole frame in a single datagram with PUSH set.
+"""
+
+import socket
+import struct
+
+from src.core.base_app import BaseApp
+from src.core.clock import get_clock
+from src.core.logger import get_logger
+
+log = get_logger()
+
+DDP_PORT = 4048
+DDP_HEADER = struct.Struct('>BBBBIH')
+DDP_FLAG_TIMECODE = 0x10
+DDP_FLAG_PUSH = 0x01
+MAX_DATAGRAM = 65536
+
+
+class StreamInputApp(BaseApp):
+    """
+    Shows frames streamed over UDP. When the stream goes stale it asks
+    the AppManager to return to the previous app.
+
+    Config keys: host (default 0.0.0.0), port (default 4048),
+    timeout (seconds without packets before falling back, default 5).
+    """
+
+    def __init__(self, display, config=None):
+        super().__init__(display, config)
+        self.host = self.config.get('host', '0.0.0.0')
+        self.port = int(self.config.get('port', DDP_PORT))
+        self.timeout = float(self.config.get('timeout', 5.0))
+
+        self._sock = None
+        # Preallocated receive buffer; packets are read straight into it
+        self._recv_buf = bytearray(MAX_DATAGRAM)
+        self._recv_view = memoryview(self._recv_buf)
+        # Frame being reassembled, and last complete frame
+        frame_size = display.width * display.height * 3
+        self._back = bytearray(frame_size)
+        self._front = bytearray(frame_size)
+        self._back_damaged = False
+        self._expected_seq = 0
+        self._has_frame = False
+        self._last_packet = 0.0
+
+        # Metrics
+        self.packets = 0
+        self.frames = 0
+        self.dropped_frames = 0
+        self.packets_per_sec = 0.0
+        self.frames_per_sec = 0.0
+        self._rate_start = 0.0
+        self._rate_packets = 0
+        self._rate_frames = 0
+
+    def start(self):
+        super().start()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((self.host, self.port))
+        self._sock.setblocking(False)
+        self._has_frame = False
+        self._back_damaged = False
+        self._expected_seq = 0
+        self._last_packet = get_clock().time()
+        self._rate_start = self._last_packet
+        log.info(f"Stream input listening on udp://{self.host}:{self.port}")
+
+    def stop(self):
+        super().stop()
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+
+    def update(self):
+        if self._sock is None:
+            return
+
+        # Drain everything that arrived since the last frame
+        frames_before = self.frames
+        while True:
+            try:
+                n = self._sock.recv_into(self._recv_buf)
+            except (BlockingIOError, InterruptedError):
+                break
+            self._handle_packet(n)
+
+        # Only the newest completed frame is shown; the rest were skipped
+        completed = self.frames - frames_before
+        if completed > 1:
+            self.dropped_frames += completed - 1
+
+        now = get_clock().time()
+        elapsed = now - self._rate_start
+        if elapsed >= 1.0:
+            self.packets_per_sec = self._rate_packets / elapsed
+            self.frames_per_sec = self._rate_frames / elapsed
+            self._rate_packets = 0
+            self._rate_frames = 0
+            self._rate_start = now
+
+        if now - self._last_packet > self.timeout:
+            log.info(f"Stream input idle for {self.timeout:g}s, falling back.")
+            self.request_exit()
+
+    def _handle_packet(self, n):
+        if n < DDP_HEADER.size:
+            return
+        flags, seq, _dtype, _dest, offset, length = DDP_HEADER.unpack_from(self._recv_buf)
+        header = DDP_HEADER.size + (4 if flags & DDP_FLAG_TIMECODE else 0)
+        length = min(length, n - header)
+        if length < 0:
+            return
+
+        self.packets += 1
+        self._rate_packets += 1
+        self._last_packet = get_clock().time()
+
+        # Sequence gap means a fragment of the current frame went missing
+        seq &= 0x0F
+        if seq:
+            if self._expected_seq and seq != self._expected_seq:
+                self._back_damaged = True
+            self._expected_seq = seq % 15 + 1
+
+        end = min(offset + length, len(self._back))
+        if offset < end:
+            self._back[offset:end] = self._recv_view[header:header + end - offset]
+
+        if flags & DDP_FLAG_PUSH:
+            if self._back_damaged:
+                self.dropped_frames += 1
+                self._back_damaged = False
+                return
+            self._front[:] = self._back
+            self._has_frame = True
+            self.frames += 1
+            self._rate_frames += 1
+
+    def draw(self):
+        if self._has_frame:
+            self.display.blit(self._front)
+
+    def get_metrics(self):
+        return {
+            "listening": self._sock is not None,
+            "port": self.port,
+            "packets": self.packets,
+            "packets_per_sec": round(self.packets_per_sec, 1),
+            "frames": self.frames,
+            "frames_per_sec": round(self.frames_per_sec, 1),
+            "dropped_frames": self.dropped_frames,
+        }
@@ -0,0 +1,268 @@
+"""
+Transit Tracker: next arrivals at a few stops, from GTFS and GTFS-realtime.
+
+All fetching and parsing happens on a background thread. It compiles
+(once) and opens the static store, then polls the realtime feeds every
+poll_seconds and publishes an immutable tuple of arrivals (see
+src/core/gtfs.py). When no realtime feed answers, the timetable from the
+static store is shown instead, with the minutes dimmed. The render thread
+only turns arrivals into minutes and redraws the board off-screen when
+that text changes; every frame is then a single blit.
+
+Config ('transit' section, overridden by the app config):
+
+    "transit": {
+      "static": "~/gtfs/google_transit.zip",      # path or URL
+      "feeds": ["https://api-endpoint.mta.info/Dataproviders/nyct%2Fgtfs"],
+      "stops": ["127"],          # parent stations include their platforms
+      "poll_seconds": 30
+    }
+
+Feeds may also be local files (see tools/bench_transit.py --fixtures).
+"""
+
+import threading
+import time
+
+from src.core.base_app import BaseApp
+from src.core.clock import get_clock
+from src.core.config import get_config
+from src.core.font import GLYPH_HEIGHT, draw_text, text_width
+from src.core.gtfs import TripUpdateReader, fetch_static, open_feed, open_store
+from src.core.logger import get_logger
+from src.core.transitions import OffscreenDisplay
+
+log = get_logger()
+
+DEFAULTS = {
+    "static": None,
+    "feeds": [],
+    "headers": {},              # sent with feed requests, e.g. an API key
+    "stops": [],
+    "poll_seconds": 30,
+    "timeout": 10,
+    "horizon_minutes": 90,
+    "stale_minutes": 10,        # no data for this long: the playlist skips the app
+    "cache_dir": "~/.cache/pixie/gtfs",
+}
+ROW_HEIGHT = GLYPH_HEIGHT + 3
+HEADER_HEIGHT = GLYPH_HEIGHT + 2
+HEADER_COLOR = (90, 140, 255)
+HEADSIGN_COLOR = (170, 170, 170)
+LIVE_COLOR = (255, 190, 40)
+SCHEDULED_COLOR = (110, 100, 70)
+
+
+class TransitApp(BaseApp):
+    """
+    Config keys: static, feeds, headers, stops, poll_seconds, timeout,
+    horizon_minutes, stale_minutes, cache_dir (see module docstring).
+    """
+
+    def __init__(self, display, config=None):
+        super().__init__(display, config)
+        self.board = OffscreenDisplay(display.width, display.height)
+        self._board_rows = None
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._halt = False
+        self._wake = threading.Event()
+        self._loaded = threading.Event()
+        self._settings_changed = False
+        # Published by the worker as whole objects, read by the render thread
+        self._arrivals = ()
+        self._names = {}            # stop/route lookups for drawing, from the store
+        self._source = None         # 'realtime', 'scheduled' or None
+        self._last_success = None   # time.monotonic() of the last good refresh
+        self._stats = {}
+
+    @property
+    def options(self):
+        return {**DEFAULTS, **get_config().section('transit'), **self.config}
+
+    def start(self):
+        super().start()
+        self._ensure_worker()
+
+    def stop(self):
+        super().stop()
+        self._halt = True
+        self._wake.set()
+
+    def prefetch(self):
+        self._ensure_worker()
+        self._loaded.wait(self.options["timeout"])
+
+    def configure(self, config):
+        super().configure(config)
+        self._settings_changed = True
+        self._board_rows = None
+        self._wake.set()
+
+    def is_stale(self):
+        if self._last_success is None:
+            return True
+        return time.monotonic() - self._last_success > self.options["stale_minutes"] * 60
+
+    def _ensure_worker(self):
+        with self._worker_lock:
+            self._halt = False  # a worker that is still winding down carries on
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="transit-fetch", daemon=True)
+                self._worker.start()
+
+    # --- background thread ---------------------------------------------------
+
+    def _run(self):
+        store = reader = None
+        key = None
+        while True:
+            with self._worker_lock:
+                if self._halt:
+                    self._worker = None
+                    break
+            options = self.options
+            try:
+                if self._settings_changed or store is None:
+                    self._settings_changed = False
+                    if store is not None:
+                        store.close()
+                        store = None
+                    store, key = self._open_store(options)
+                    reader = TripUpdateReader(store.watched, resolve=store.scheduled_time)
+                    self._names = {"stops": {s: store.stop_name(s) for s in options["stops"]},
+                                   "parents": {s: parent for s, (_, parent) in store.stops.items()},
+                                   "routes": store.routes, "headsigns": {}}
+                self._refresh(options, store, reader)
+            except Exception as e:
+                log.warning(f"Transit refresh failed ({key}): {e}")
+                self._stats["errors"] = self._stats.get("errors", 0) + 1
+            self._loaded.set()
+            self._wake.wait(options["poll_seconds"])
+            self._wake.clear()
+        if store is not None:
+            store.close()
+
+    def _open_store(self, options):
+        static, stops = options["static"], options["stops"]
+        if not static or not stops:
+            raise ValueError("'static' and 'stops' must be configured")
+        if static.startswith(('http://', 'https://')):
+            static = fetch_static(static, options["cache_dir"], timeout=options["timeout"] * 6)
+        started = time.perf_counter()
+        store = open_store(static, stops, options["cache_dir"])
+        self._stats.update(store_bytes=store.size(), store_open_ms=round((time.perf_counter() - started) * 1000, 1),
+                           watched_stops=len(store.watched))
+        return store, static
+
+    def _refresh(self, options, store, reader):
+        now = get_clock().time()
+        horizon = options["horizon_minutes"] * 60
+        started = time.perf_counter()
+        arrivals, answered = [], 0
+        for url in options["feeds"]:
+            try:
+                with open_feed(url, options["headers"], options["timeout"]) as stream:
+                    arrivals.extend(reader.read(stream))
+                answered += 1
+            except Exception as e:
+                log.warning(f"Transit feed {url} failed: {e}")
+                self._stats["feed_errors"] = self._stats.get("feed_errors", 0) + 1
+        parse_ms = (time.perf_counter() - started) * 1000
+
+        if answered:
+            source = 'realtime'
+            arrivals = sorted(a for a in arrivals if now - 30 <= a.time <= now + horizon)
+        else:
+            source = 'scheduled'
+            arrivals = store.scheduled(get_clock().now(), horizon)
+        headsigns = dict(self._names.get("headsigns", {}))
+        for a in arrivals:
+            if a.trip_id not in headsigns:
+                headsigns[a.trip_id] = store.headsign(a.trip_id)
+        if len(headsigns) > 4 * len(arrivals) + 64:
+            headsigns = {a.trip_id: headsigns[a.trip_id] for a in arrivals}
+        self._names = dict(self._names, headsigns=headsigns)
+        self._arrivals = tuple(arrivals)
+        self._source = source
+        self._last_success = time.monotonic()
+        self._stats.update(feeds_answered=answered, fetch_parse_ms=round(parse_ms, 1), arrivals=len(arrivals),
+                           **reader.get_metrics())
+
+    # --- render thread --------------------------------------------------------
+
+    def _rows(self, now):
+        """What the board shows: per configured stop, its name and next arrivals."""
+        names = self._names
+        if not names:
+            return ()
+        stops = list(names["stops"])
+        parents = names["parents"]
+        per_stop = max(1, (self.display.height // max(1, len(stops)) - HEADER_HEIGHT) // ROW_HEIGHT)
+        groups = {s: [] for s in stops}
+        for a in self._arrivals:
+            if a.time < now - 30:
+                continue
+            group = a.stop_id if a.stop_id in groups else parents.get(a.stop_id)
+            rows = groups.get(group)
+            if rows is not None and len(rows) < per_stop:
+                route = names["routes"].get(a.route_id)
+                label = (route.short_name if route else a.route_id or '?')[:2]
+                minutes = int(max(0, a.time - now) // 60)
+                rows.append((label, route.color if route else (120, 120, 120),
+                             route.text_color if route else (255, 255, 255),
+                             names["headsigns"].get(a.trip_id) or '', minutes, a.realtime))
+        return tuple((names["stops"][s], tuple(groups[s])) for s in stops)
+
+    def update(self):
+        rows = self._rows(get_clock().time())
+        if rows != self._board_rows:
+            self._board_rows = rows
+            self._draw_board(rows)
+
+    def _draw_board(self, rows):
+        d = self.board
+        w = d.width
+        d.clear()
+        if not rows:
+            draw_text(d, 1, 1, "TRANSIT", HEADER_COLOR)
+            draw_text(d, 1, 1 + ROW_HEIGHT, "LOADING..." if self._last_success is None else "NO STOPS",
+                      HEADSIGN_COLOR)
+            return
+        y = 0
+        for name, arrivals in rows:
+            draw_text(d, 1, y, _fit(name, w - 1), HEADER_COLOR)
+            y += HEADER_HEIGHT
+            if not arrivals:
+                draw_text(d, 1, y + 1, "NO TRAINS", HEADSIGN_COLOR)
+                y += ROW_HEIGHT
+            for label, color, text_color, headsign, minutes, live in arrivals:
+                bullet = text_width(label) + 4
+                for by in range(y, y + GLYPH_HEIGHT + 2):
+                    for bx in range(bullet):
+                        if (bx, by - y) not in ((0, 0), (bullet - 1, 0), (0, GLYPH_HEIGHT + 1),
+                                                (bullet - 1, GLYPH_HEIGHT + 1)):
+                            d.set_pixel(bx, by, *color)
+                draw_text(d, 2, y + 1, label, text_color)
+                when = "NOW" if minutes < 1 else f"{minutes}M"
+                right = w - text_width(when)
+                draw_text(d, right, y + 1, when, LIVE_COLOR if live else SCHEDULED_COLOR)
+                draw_text(d, bullet + 2, y + 1, _fit(headsign, right - bullet - 4), HEADSIGN_COLOR)
+                y += ROW_HEIGHT
+
+    def draw(self):
+        self.display.blit(self.board.snapshot())
+
+    def get_metrics(self):
+        metrics = {"source": self._source,
+                   "age_seconds": None if self._last_success is None
+                   else round(time.monotonic() - self._last_success, 1)}
+        metrics.update(self._stats)
+        return metrics
+
+
+def _fit(text, width):
+    """Truncate `text` to what the 3x5 font fits in `width` pixels."""
+    while text and text_width(text) > width:
+        text = text[:-1]
+    return text
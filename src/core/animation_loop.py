@@ -0,0 +1,380 @@
+"""
+Precomputed animation loops.
+
+Deterministic, looping animations (the setup screen, weather icons,
+idle screens) would otherwise be recomputed pixel by pixel forever. An
+app declares one as an AnimationLoop: a module-level render function
+`render(display, t, **params)` that draws the frame at loop time `t`
+through the normal display API, a duration and an fps. The first time
+it is drawn, the loop's frames are rendered once on a low-priority
+ProcessPoolExecutor into a FramePack; until the pack is ready the render
+function runs live on the real display, so the app looks the same
+either way. After that a frame costs one blit.
+
+FramePacks are compact: identical frames are stored once and frames
+with at most 256 colors are kept palette-indexed (see
+src/core/indexed_buffer.py). Packs are cached in memory (LRU, bounded
+by bytes) and on disk under ~/.cache/pixie/loops, keyed by the render
+function, the app's loop version, the parameters and the display size:
+bump `version` when the drawing code changes.
+
+Config ('loops' section): {"enabled": true, "workers": 1,
+"cache_dir": "~/.cache/pixie/loops", "memory_limit_mb": 8}
+"""
+
+import atexit
+import hashlib
+import json
+import multiprocessing
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from src.core.indexed_buffer import PALETTE_BYTES
+from src.core.logger import get_logger
+
+log = get_logger()
+
+DEFAULTS = {
+    "enabled": True,
+    "workers": 1,
+    "cache_dir": "~/.cache/pixie/loops",
+    "memory_limit_mb": 8,
+}
+CHUNK_FRAMES = 30        # frames per pool task
+WORKER_NICE = 10         # keep the pool from competing with the render thread
+
+PACK_MAGIC = b'PXLP'
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct('<4sHHHHH')  # magic, version, width, height, frames, unique
+KIND_RGB = 0
+KIND_INDEXED = 1
+
+
+def _index_frame(rgb):
+    """(indices, palette) for a frame with at most 256 colors, else None."""
+    colors = {}
+    indices = bytearray(len(rgb) // 3)
+    for i in range(len(indices)):
+        color = rgb[i * 3:i * 3 + 3]
+        index = colors.get(color)
+        if index is None:
+            if len(colors) == 256:
+                return None
+            index = colors[color] = len(colors)
+        indices[i] = index
+    palette = b''.join(colors).ljust(PALETTE_BYTES, b'\x00')
+    return bytes(indices), palette
+
+
+def render_frames(render, width, height, times, params):
+    """
+    Worker entry point: render the frames at `times` off-screen. Returns
+    one (kind, data, palette) tuple per frame; palette is None for RGB.
+    """
+    from src.core.transitions import OffscreenDisplay
+    display = OffscreenDisplay(width, height)
+    out = []
+    for t in times:
+        display.clear()
+        render(display, t, **params)
+        rgb = display.snapshot()
+        indexed = _index_frame(rgb)
+        out.append((KIND_RGB, rgb, None) if indexed is None else (KIND_INDEXED,) + indexed)
+    return out
+
+
+class FramePack:
+    """The frames of one loop, deduplicated and palette-indexed where possible."""
+
+    def __init__(self, width, height, order, frames):
+        self.width = width
+        self.height = height
+        self.order = order      # frame number -> index into frames
+        self.frames = frames    # unique (kind, data, palette) tuples
+
+    @classmethod
+    def from_frames(cls, width, height, rendered):
+        unique, order, frames = {}, [], []
+        for frame in rendered:
+            key = frame[1:]
+            if key not in unique:
+                unique[key] = len(frames)
+                frames.append(frame)
+            order.append(unique[key])
+        return cls(width, height, order, frames)
+
+    def __len__(self):
+        return len(self.order)
+
+    @property
+    def nbytes(self):
+        return sum(len(data) + len(palette or b'') for _, data, palette in self.frames)
+
+    def blit(self, display, number):
+        kind, data, palette = self.frames[self.order[number % len(self.order)]]
+        if kind == KIND_INDEXED:
+            display.blit_indexed(data, palette)
+        else:
+            display.blit(data)
+
+    def to_bytes(self):
+        parts = [PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, self.width, self.height,
+                                  len(self.order), len(self.frames)),
+                 struct.pack(f'<{len(self.order)}H', *self.order)]
+        for kind, data, palette in self.frames:
+            parts.append(struct.pack('<BI', kind, len(data)) + data + (palette or b''))
+        return zlib.compress(b''.join(parts), 6)
+
+    @classmethod
+    def from_bytes(cls, blob):
+        raw = zlib.decompress(blob)
+        magic, version, width, height, count, unique = PACK_HEADER.unpack_from(raw)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError("Not a Pixie frame pack")
+        offset = PACK_HEADER.size
+        order = list(struct.unpack_from(f'<{count}H', raw, offset))
+        offset += count * 2
+        frames = []
+        for _ in range(unique):
+            kind, size = struct.unpack_from('<BI', raw, offset)
+            offset += 5
+            data = raw[offset:offset + size]
+            offset += size
+            palette = None
+            if kind == KIND_INDEXED:
+                palette = raw[offset:offset + PALETTE_BYTES]
+                offset += PALETTE_BYTES
+            frames.append((kind, data, palette))
+        return cls(width, height, order, frames)
+
+
+def _lower_priority():
+    try:
+        os.nice(WORKER_NICE)
+    except OSError:
+        pass
+
+
+class LoopRenderer:
+    """Renders loops on a process pool and caches the packs in memory and on disk."""
+
+    def __init__(self, workers=1, cache_dir=None, memory_limit=8 << 20):
+        self.workers = workers
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        self.memory_limit = memory_limit
+        self._pool = None
+        self._packs = OrderedDict()  # key -> FramePack, least recently used first
+        self._pending = {}           # key -> chunk futures
+        self._failed = set()
+        self._lock = threading.Lock()
+        self.rendered = 0
+        self.disk_hits = 0
+
+    def _get_pool(self):
+        if self._pool is None:
+            try:
+                context = multiprocessing.get_context('fork')
+            except ValueError:
+                context = multiprocessing.get_context()
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=context,
+                                             initializer=_lower_priority)
+            atexit.register(self.shutdown)
+        return self._pool
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pack") if self.cache_dir else None
+
+    def get(self, loop, width, height):
+        """
+        The loop's FramePack if it is ready. Otherwise starts rendering it
+        (once) and returns None.
+        """
+        key = loop.key(width, height)
+        with self._lock:
+            pack = self._packs.get(key)
+            if pack is not None:
+                self._packs.move_to_end(key)
+                return pack
+            if key in self._pending or key in self._failed:
+                return None
+            self._pending[key] = []
+        pack = self._load(key)
+        if pack is not None:
+            with self._lock:
+                self._pending.pop(key, None)
+                self._store(key, pack)
+            return pack
+        self._submit(key, loop, width, height)
+        return None
+
+    def _submit(self, key, loop, width, height):
+        times = [i / loop.fps for i in range(loop.frames)]
+        chunks = [times[i:i + CHUNK_FRAMES] for i in range(0, len(times), CHUNK_FRAMES)]
+        try:
+            pool = self._get_pool()
+            futures = [pool.submit(render_frames, loop.render, width, height, chunk, loop.params)
+                       for chunk in chunks]
+        except Exception as e:
+            self._fail(key, loop, e)
+            return
+        with self._lock:
+            self._pending[key] = futures
+        remaining = [len(futures)]
+
+        def done(_):
+            with self._lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            self._finish(key, loop, width, height, futures)
+
+        for future in futures:
+            future.add_done_callback(done)
+
+    def _finish(self, key, loop, width, height, futures):
+        try:
+            rendered = [frame for future in futures for frame in future.result()]
+        except Exception as e:
+            self._fail(key, loop, e)
+            return
+        pack = FramePack.from_frames(width, height, rendered)
+        self._save(key, pack)
+        with self._lock:
+            self._pending.pop(key, None)
+            self._store(key, pack)
+            self.rendered += 1
+        log.info(f"Rendered loop {loop.name}: {len(pack)} frames, {len(pack.frames)} unique, "
+                 f"{pack.nbytes // 1024} KB")
+
+    def _fail(self, key, loop, error):
+        log.error(f"Rendering loop {loop.name} failed, drawing it live: {error}")
+        with self._lock:
+            self._pending.pop(key, None)
+            self._failed.add(key)
+
+    def _store(self, key, pack):
+        self._packs[key] = pack
+        total = sum(p.nbytes for p in self._packs.values())
+        while total > self.memory_limit and len(self._packs) > 1:
+            _, evicted = self._packs.popitem(last=False)
+            total -= evicted.nbytes
+
+    def _load(self, key):
+        path = self._path(key)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                pack = FramePack.from_bytes(f.read())
+        except (OSError, ValueError, zlib.error, struct.error) as e:
+            log.warning(f"Ignoring unreadable frame pack {path}: {e}")
+            return None
+        self.disk_hits += 1
+        return pack
+
+    def _save(self, key, pack):
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(pack.to_bytes())
+            os.replace(tmp, path)
+        except OSError as e:
+            log.warning(f"Could not cache frame pack: {e}")
+
+    def evict(self, key):
+        """Drop a pack from memory (the disk copy stays)."""
+        with self._lock:
+            self._packs.pop(key, None)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def get_metrics(self):
+        with self._lock:
+            return {
+                "packs": len(self._packs),
+                "pending": len(self._pending),
+                "failed": len(self._failed),
+                "memory_kb": sum(p.nbytes for p in self._packs.values()) // 1024,
+                "rendered": self.rendered,
+                "disk_hits": self.disk_hits,
+            }
+
+
+class AnimationLoop:
+    """
+    A looping animation an app plays back from a precomputed FramePack.
+
+    `render(display, t, **params)` must be a module-level function (it is
+    pickled to the worker) that draws the frame at loop time t, with
+    0 <= t < duration, and depends on nothing else.
+    """
+
+    def __init__(self, render, duration, fps=30, params=None, version=1):
+        self.render = render
+        self.fps = fps
+        self.frames = max(1, round(duration * fps))
+        self.params = params or {}
+        self.version = version
+        self.name = f"{render.__module__}.{render.__qualname__}"
+        self._key = None
+        self._pack = None
+
+    def key(self, width, height):
+        if self._key is None or self._key[0] != (width, height):
+            spec = json.dumps([self.name, self.version, self.frames, self.fps, width, height,
+                               self.params], sort_keys=True, default=str)
+            self._key = ((width, height), hashlib.sha1(spec.encode()).hexdigest())
+        return self._key[1]
+
+    @property
+    def ready(self):
+        return self._pack is not None
+
+    def draw(self, display, t):
+        """Draw the frame at time t (seconds, wraps around); live until the pack is ready."""
+        number = int(t * self.fps) % self.frames
+        if self._pack is None or (self._pack.width, self._pack.height) != (display.width, display.height):
+            renderer = get_loop_renderer()
+            self._pack = renderer.get(self, display.width, display.height) if renderer else None
+            if self._pack is None:
+                self.render(display, number / self.fps, **self.params)
+                return
+        self._pack.blit(display, number)
+
+    def release(self):
+        """Free the pack's memory (e.g. from BaseApp.trim_caches); it reloads from disk."""
+        if self._pack is not None:
+            renderer = get_loop_renderer()
+            if renderer is not None:
+                renderer.evict(self.key(self._pack.width, self._pack.height))
+            self._pack = None
+
+
+_renderer = None
+_renderer_loaded = False
+
+
+def get_loop_renderer():
+    """The shared LoopRenderer ('loops' config section), or None when disabled."""
+    global _renderer, _renderer_loaded
+    if not _renderer_loaded:
+        from src.core.config import get_config
+        options = dict(DEFAULTS, **get_config().section('loops'))
+        if options["enabled"]:
+            _renderer = LoopRenderer(int(options["workers"]), options["cache_dir"],
+                                     int(options["memory_limit_mb"] * (1 << 20)))
+            from src.core.app_manager import register_metrics
+            register_metrics("loops", _renderer.get_metrics)
+        _renderer_loaded = True
+    return _renderer
@@ -1,66 +1,785 @@
+import importlib
+import sys
+import threading
 import time
+from collections import deque
 from src.core.base_app import BaseApp
+from src.core.clock import get_clock
+from src.core.command_queue import CommandQueue
+from src.core.frame_pacing import FramePacer
+from src.core.font import draw_text, text_width, GLYPH_HEIGHT
 from src.core.logger import get_logger
+from src.core.transitions import KINDS as TRANSITION_KINDS, Prewarm, Transition
 
 log = get_logger()
 
 MAX_CONSECUTIVE_ERRORS = 3
+OVERLAY_SCROLL_SPEED = 20  # pixels per second for overlay text too wide to fit
+POWER_CHECK_INTERVAL = 1.0  # seconds between schedule evaluations while on
+POWER_SAMPLE_INTERVAL = 60.0
+PREWARM_TTL = 10.0  # seconds a prewarmed app stays started without being switched to
+FAILURE_COOLDOWN = 300.0  # seconds the playlist skips an app after it failed
+
+_metrics_providers = {}  # key in get_metrics() -> callable returning a dict
+
+
+def register_metrics(key, provider):
+    """
+    Report `provider()` under `key` in AppManager.get_metrics(). For
+    subsystems loaded on demand (e.g. precomputed animation loops), which
+    register themselves once they exist instead of being imported here.
+    """
+    _metrics_providers[key] = provider
+
+
+def parse_overlay(text, duration=5.0, color=(255, 255, 255)):
+    """
+    Validate overlay arguments: `duration` a positive number of seconds and
+    `color` three ints in 0-255. Returns (text, duration, color) or raises
+    ValueError.
+    """
+    if isinstance(duration, bool) or not isinstance(duration, (int, float)) or not 0 < duration < float('inf'):
+        raise ValueError("'duration' must be a positive number of seconds")
+    if (not isinstance(color, (list, tuple)) or len(color) != 3
+            or not all(isinstance(c, int) and not isinstance(c, bool) and 0 <= c <= 255 for c in color)):
+        raise ValueError("'color' must be three integers in 0-255")
+    return str(text), float(duration), tuple(color)
 
 
 class AppManager:
     """
     Manages the lifecycle of apps and the main event loop.
     Handles per-frame errors gracefully with auto-recovery.
+
+    Other threads (e.g. the web server) must not call switch_to() or touch
+    the display directly; they submit() commands, which the loop applies
+    at the next frame boundary.
     """
-    def __init__(self, display):
+    def __init__(self, display, isolate_apps=False, worker_pool_size=2,
+                 transition='fade', transition_duration=0.4):
         self.display = display
-        self.apps = {}
+        self.apps = {}          # name -> instantiated app
+        self._factories = {}    # name -> ("module:Class", config), not yet loaded
+        self._app_order = []    # registration order, loaded or not
         self.active_app_name = None
         self.active_app = None
+        self.previous_app_name = None
         self._error_count = 0  # consecutive errors for active app
+        self.commands = CommandQueue()
+        self._overlay = None  # (text, color, started, expires)
+        self.frames_presented = 0
+        self.first_frame = threading.Event()
+        self.render_thread_id = None
+        self._load_lock = threading.Lock()
+
+        # App transitions (see src/core/transitions.py)
+        if transition not in TRANSITION_KINDS:
+            raise ValueError(f"Unknown transition '{transition}'")
+        self.transition = transition
+        self.transition_duration = transition_duration
+        self._prewarms = {}            # name -> Prewarm, started ahead of a switch
+        self._pending_switch = None    # (name, kind) waiting for its prewarm
+        self._transition = None        # (Transition, incoming app) while blending
+        self._switch_waiters = []      # switch commands completing with the transition
+        self.transitions_completed = 0
+
+        # Playlist rotation (see src/core/playlist.py)
+        self.playlist = None
+        self._playlist_index = None    # entry currently shown
+        self._playlist_started = 0.0   # monotonic time the entry started
+        self._playlist_next = None     # (index, entry) chosen and prewarmed ahead
+        self._playlist_hold_until = 0.0
+        self._app_failures = {}        # name -> monotonic time of last failure
+
+        # Per-app memory accounting and budgets (see src/core/memory.py)
+        self.memory = None
+        self._lazy_targets = {}        # name -> (target, config), so apps can be unloaded
+
+        # Display schedule (dimming / sleep) and power accounting
+        self.schedule = None
+        self.base_brightness = display.brightness  # user setting, before dimming
+        self.display_off = False
+        self._power_override = None   # (on, until_wall_time or None)
+        self._next_power_check = 0.0
+        self.wakeups = 0              # render loop iterations
+        self.parked_seconds = 0.0
+        self._power_samples = deque(maxlen=61)  # (monotonic, cpu seconds, wakeups)
+
+        # Frame pacing and interval statistics (set up by run_loop)
+        self.pacer = None
+
+        # Presented frames published to shared memory (see src/core/frame_export.py)
+        self.frame_export = None
+        # Presented frames for /api/snapshot.png (see src/core/snapshot.py)
+        self.snapshots = None
+
+        # Opt-in: run each app in its own worker process
+        self._worker_pool = None
+        if isolate_apps:
+            from src.core.app_process import WorkerPool
+            self._worker_pool = WorkerPool(display.width, display.height, size=worker_pool_size)
 
     def register_app(self, name, app_instance):
         if not isinstance(app_instance, BaseApp):
             raise ValueError("App instance must inherit from BaseApp")
+        if self._worker_pool is not None and not getattr(app_instance, 'is_process_proxy', False):
+            from src.core.app_process import ProcessApp, can_isolate
+            app_class = type(app_instance)
+            if can_isolate(app_class):
+                app_instance = ProcessApp(self.display, app_class.__module__, app_class.__qualname__,
+                                          self._worker_pool, config=app_instance.config)
+            else:
+                log.info(f"App '{name}' takes constructor arguments besides config; "
+                         f"running it in the main process")
         self.apps[name] = app_instance
+        self._factories.pop(name, None)
+        if name not in self._app_order:
+            self._app_order.append(name)
         log.info(f"Registered app: {name}")
 
-    def switch_to(self, name):
-        if name not in self.apps:
+    def register_lazy(self, name, target, config=None):
+        """
+        Register an app by "module:ClassName" without importing it.
+        The module is imported and the app instantiated on first use.
+        """
+        self._factories[name] = (target, config)
+        if name not in self._app_order:
+            self._app_order.append(name)
+
+    @property
+    def app_names(self):
+        """Names of all registered apps, loaded or not."""
+        return list(self._app_order)
+
+    def has_app(self, name):
+        return name in self.apps or name in self._factories
+
+    def get_app(self, name):
+        """Return the app instance, importing and creating it if needed."""
+        if name in self.apps:
+            return self.apps[name]
+        with self._load_lock:  # prewarm threads load apps too
+            if name in self.apps:
+                return self.apps[name]
+            return self._load_app(name)
+
+    def _load_app(self, name):
+        target, config = self._factories[name]
+        self._lazy_targets[name] = (target, config)
+        module_name, class_name = target.split(':')
+        start = time.perf_counter()
+        if self._worker_pool is not None:
+            # The worker process does the import; keep the main process lean
+            from src.core.app_process import ProcessApp
+            app = ProcessApp(self.display, module_name, class_name, self._worker_pool, config=config)
+        else:
+            app_class = getattr(importlib.import_module(module_name), class_name)
+            app = app_class(self.display, config)
+        self.register_app(name, app)
+        log.info(f"Loaded app '{name}' in {(time.perf_counter() - start) * 1000:.0f}ms")
+        return app
+
+    def switch_to(self, name, transition=None):
+        """
+        Switch apps (render thread only). With a 'fade' or 'slide'
+        transition the incoming app is prewarmed off-screen first and the
+        outgoing app keeps running until it is ready; 'cut' switches now.
+        """
+        if not self.has_app(name):
             log.warning(f"App '{name}' not found.")
             return
+        kind = transition or self.transition
+        if kind not in TRANSITION_KINDS:
+            raise ValueError(f"Unknown transition '{kind}'")
+
+        self._finish_transition()
+        self._pending_switch = None
+        if kind == 'cut' or self.active_app is None or self.display_off or name == self.active_app_name:
+            self._switch_now(name)
+            return
+        self.prewarm(name)
+        self._pending_switch = (name, kind)
 
-        if self.active_app:
+    def prewarm(self, name):
+        """Load and start an app on a helper thread ahead of switching to it."""
+        if name == self.active_app_name or name in self._prewarms or not self.has_app(name):
+            return
+        self._prewarms[name] = Prewarm(self, name)
+
+    def _switch_now(self, name):
+        prewarm = self._prewarms.pop(name, None)
+        if prewarm is not None:
+            prewarm.ready.wait()
+            if prewarm.error is not None:
+                log.error(f"Error starting {name}: {prewarm.error}")
+                return
+            app = prewarm.app
+        else:
+            try:
+                app = self.get_app(name)
+            except Exception as e:
+                log.error(f"Error loading {name}: {e}")
+                return
+        self._activate(name, app, started=prewarm is not None)
+        self.display.clear()
+
+    def _activate(self, name, app, started):
+        """Make `app` active, stopping the outgoing app; start it unless prewarmed."""
+        if self.active_app is not None and (self.active_app is not app or not started):
             try:
                 self.active_app.stop()
             except Exception as e:
                 log.error(f"Error stopping {self.active_app_name}: {e}")
 
+        if self.active_app_name != name:
+            self.previous_app_name = self.active_app_name
         self.active_app_name = name
-        self.active_app = self.apps[name]
+        self.active_app = app
+        self.active_app.exit_requested = False
         self._error_count = 0
+        if self._playlist_index is not None and self.playlist is not None \
+                and self._playlist_index < len(self.playlist.entries) \
+                and self.playlist.entries[self._playlist_index].app == name:
+            self._playlist_started = get_clock().monotonic()  # the entry's time starts on screen
 
+        if started:
+            log.info(f"Switched to app: {name}")
+            return
         try:
+            before = self.memory.begin_start() if self.memory else None
             self.active_app.start()
+            if self.memory:
+                self.memory.end_start(name, before)
             log.info(f"Switched to app: {name}")
         except Exception as e:
             log.error(f"Error starting {name}: {e}")
             self._handle_app_failure(name)
 
-        self.display.clear()
+    def _advance_switch(self):
+        """Begin the pending transition once the incoming app is prewarmed."""
+        name, kind = self._pending_switch
+        prewarm = self._prewarms.get(name)
+        if prewarm is None:
+            self.prewarm(name)
+            return
+        if not prewarm.ready.is_set():
+            return  # keep showing the outgoing app meanwhile
+        self._pending_switch = None
+        del self._prewarms[name]
+        if prewarm.error is not None:
+            log.error(f"Error starting {name}: {prewarm.error}")
+            self._app_failures[name] = get_clock().monotonic()
+            return
+
+        outgoing = self.display.snapshot()
+        self._activate(name, prewarm.app, started=True)
+        if prewarm.can_blend:
+            prewarm.app.display = prewarm.offscreen
+            self._transition = (Transition(kind, outgoing, prewarm.offscreen, self.transition_duration),
+                                prewarm.app)
+
+    def _draw_transition(self):
+        """Draw one transition frame. Returns False once the transition is over."""
+        transition, app = self._transition
+        transition.offscreen.clear()
+        app.draw()
+        frame = transition.compose()
+        if frame is None:
+            self._finish_transition()
+            return False
+        self.display.blit(frame)
+        return True
+
+    def _finish_transition(self):
+        if self._transition is None:
+            return
+        transition, app = self._transition
+        app.display = self.display
+        self._transition = None
+        self.transitions_completed += 1
+        log.debug(f"Transition ({transition.kind}) finished after {transition.frames} frames")
+
+    def set_playlist(self, playlist):
+        """Install a Playlist, or None to stop rotating (render thread only)."""
+        self.playlist = playlist
+        self._playlist_index = None
+        self._playlist_next = None
+        self._playlist_hold_until = 0.0
+
+    def _hold_playlist(self):
+        """A manual switch pauses rotation for the playlist's manual_hold."""
+        if self.playlist is not None:
+            self._playlist_hold_until = get_clock().monotonic() + self.playlist.manual_hold
+            self._playlist_next = None
+
+    def _entry_usable(self, entry):
+        if not self.has_app(entry.app):
+            return False
+        failed = self._app_failures.get(entry.app)
+        if failed is not None and get_clock().monotonic() - failed < FAILURE_COOLDOWN:
+            return False
+        app = self.apps.get(entry.app)
+        try:
+            return app is None or not app.is_stale()
+        except Exception:
+            return False
+
+    def _run_playlist(self):
+        """Rotate to the next entry when due, prewarming it shortly before."""
+        now = get_clock().monotonic()
+        if self._playlist_hold_until:
+            if now < self._playlist_hold_until:
+                return
+            self._playlist_hold_until = 0.0
+            self._playlist_started = now
+        if self._pending_switch is not None:
+            return  # the entry's time starts once its app is on screen
+
+        playlist = self.playlist
+        if self._playlist_index is None:
+            choice = playlist.next_entry(-1, self._entry_usable)
+            if choice is not None:
+                self._start_entry(*choice)
+            return
+
+        entry = playlist.entries[self._playlist_index]
+        remaining = self._playlist_started + entry.duration - now
+        if self._playlist_next is None and remaining <= playlist.prefetch_seconds:
+            self._playlist_next = playlist.next_entry(self._playlist_index, self._entry_usable)
+            if self._playlist_next is not None:
+                self.prewarm(self._playlist_next[1].app)
+        if remaining > 0:
+            return
+
+        choice, self._playlist_next = self._playlist_next, None
+        if choice is not None and not self._entry_usable(choice[1]):
+            # Its data went stale or failed while prefetching: skip it
+            log.info(f"Playlist: skipping '{choice[1].app}' (stale or failing)")
+            choice = playlist.next_entry(choice[0], self._entry_usable)
+        if choice is None:
+            choice = playlist.next_entry(self._playlist_index, self._entry_usable)
+        if choice is None:
+            self._playlist_started = now  # nothing else to show; keep the current app
+            return
+        self._start_entry(*choice)
+
+    def _start_entry(self, index, entry):
+        self._playlist_index = index
+        self._playlist_started = get_clock().monotonic()
+        if entry.app != self.active_app_name:
+            self.switch_to(entry.app, entry.transition)
+
+    def get_playlist_state(self):
+        if self.playlist is None:
+            return {"enabled": False}
+        state = {"enabled": self.playlist.enabled,
+                 "held": self._playlist_hold_until > get_clock().monotonic()}
+        if self._playlist_index is not None and self._playlist_index < len(self.playlist.entries):
+            entry = self.playlist.entries[self._playlist_index]
+            state["index"] = self._playlist_index
+            state["app"] = entry.app
+            state["remaining"] = round(max(0.0, self._playlist_started + entry.duration
+                                           - get_clock().monotonic()), 1)
+        if self._playlist_next is not None:
+            state["next"] = self._playlist_next[1].app
+        return state
+
+    def _expire_prewarms(self):
+        """Stop prewarmed apps that were never switched to."""
+        now = get_clock().monotonic()
+        keep = {self._pending_switch[0] if self._pending_switch else None,
+                self._playlist_next[1].app if self._playlist_next else None}
+        for name, prewarm in list(self._prewarms.items()):
+            if name in keep or not prewarm.ready.is_set() or now - prewarm.finished_at < PREWARM_TTL:
+                continue
+            del self._prewarms[name]
+            if prewarm.error is None and prewarm.app is not self.active_app:
+                try:
+                    prewarm.app.stop()
+                except Exception as e:
+                    log.error(f"Error stopping prewarmed {name}: {e}")
+
+    def set_frame_export(self, segment):
+        """Publish every presented frame into a FrameSegment, or None to stop (before run_loop)."""
+        self.frame_export = segment
+
+    def set_snapshots(self, cache):
+        """Hand presented frames to a SnapshotCache, or None to stop."""
+        self.snapshots = cache
+
+    def set_memory(self, accountant):
+        """Install a MemoryAccountant, or None to stop accounting (before run_loop)."""
+        self.memory = accountant
+
+    def _check_memory(self):
+        """Trim apps over their memory budget; suspend those that stay over."""
+        for action, name in self.memory.check(self.apps):
+            app = self.apps.get(name)
+            if app is None:
+                continue
+            if action == 'trim':
+                log.warning(f"App '{name}' is over its memory budget, trimming caches.")
+                before = self.memory.begin()
+                try:
+                    app.trim_caches()
+                except Exception as e:
+                    log.error(f"Error trimming {name}: {e}")
+                self.memory.end(name, before)
+                self.memory.trimmed(name)
+            else:
+                self._suspend_app(name)
+
+    def _suspend_app(self, name):
+        """Stop an app that stays over budget and unload it to free its memory."""
+        now = get_clock().monotonic()
+        others = [n for n in self._app_order if n != name
+                  and now - self._app_failures.get(n, -FAILURE_COOLDOWN) >= FAILURE_COOLDOWN]
+        if name == self.active_app_name and not others:
+            log.warning(f"App '{name}' is over its memory budget but is the only app left.")
+            return
+        log.warning(f"App '{name}' stayed over its memory budget, suspending it.")
+        self.memory.suspended(name)
+        self._app_failures[name] = now  # the playlist skips it for a while
+        if name == self.active_app_name:
+            target = self.previous_app_name if self.previous_app_name in others else others[0]
+            self.switch_to(target, 'cut')
+        prewarm = self._prewarms.pop(name, None)
+        app = self.apps[name]
+        if app is not self.active_app and (prewarm is not None or app.is_active):
+            try:
+                app.stop()
+            except Exception as e:
+                log.error(f"Error stopping {name}: {e}")
+        if name in self._lazy_targets and app is not self.active_app:
+            # Drop the instance; it is re-created (with empty caches) on next use
+            del self.apps[name]
+            self._factories[name] = self._lazy_targets[name]
+            self.memory.forget(name)
+
+    def reload_modules(self, module_names):
+        """
+        Re-import changed app modules and re-create the apps defined in
+        them with their current config (render thread only; dev mode).
+        If a module fails to import, the old code keeps running. Returns
+        the names of the re-created apps.
+        """
+        if self._worker_pool is not None:
+            raise RuntimeError("Hot reload is not supported with isolated apps")
+        importlib.invalidate_caches()
+        for module_name in module_names:
+            module = sys.modules.get(module_name)
+            if module is not None:
+                importlib.reload(module)  # a SyntaxError here aborts the reload
+
+        affected = [name for name, app in self.apps.items()
+                    if type(app).__module__ in module_names]
+        if self.active_app_name in affected:
+            self._finish_transition()
+            self._pending_switch = None
+        for name in affected:
+            old = self.apps[name]
+            prewarm = self._prewarms.pop(name, None)
+            if old is not self.active_app and (prewarm is not None or old.is_active):
+                try:
+                    old.stop()
+                except Exception as e:
+                    log.error(f"Error stopping {name}: {e}")
+            try:
+                app_class = getattr(sys.modules[type(old).__module__], type(old).__name__)
+                app = app_class(self.display, old.config)
+            except Exception as e:
+                log.error(f"Error re-creating {name}, keeping the old instance: {e}")
+                continue
+            self.apps[name] = app
+            self._app_failures.pop(name, None)
+            if self.memory is not None:
+                self.memory.forget(name)
+            if old is self.active_app:
+                self._activate(name, app, started=False)
+                self.display.clear()
+        return affected
+
+    def submit(self, kind, key=None, **payload):
+        """
+        Queue a state change from any thread; returns the Command.
+        Kinds: switch(app, transition), prewarm(app), brightness(brightness),
+        config(app, config), overlay(text, duration, color), power(on),
+        schedule(schedule), playlist(playlist), profile(profiler, enable),
+        reload(modules).
+        """
+        if key is None and kind == 'config':
+            key = ('config', payload.get('app'))
+        return self.commands.submit(kind, payload, key=key)
+
+    def _apply_commands(self):
+        """Apply queued commands (render thread only). Returns those applied."""
+        applied = []
+        for cmd in self.commands.drain():
+            try:
+                result = self._apply_command(cmd.kind, cmd.payload)
+            except Exception as e:
+                log.error(f"Command {cmd.id} ({cmd.kind}) failed: {e}")
+                self.commands.mark_failed(cmd, e)
+                continue
+            self.commands.mark_applied(cmd, result)
+            applied.append(cmd)
+        return applied
+
+    def _apply_command(self, kind, payload):
+        if kind == 'switch':
+            name = payload['app']
+            if not self.has_app(name):
+                raise ValueError(f"App '{name}' not found")
+            if self.display_off:
+                # Picking an app on the remote wakes the display
+                self._override_power(True)
+                self._set_display_off(False)
+            self._hold_playlist()
+            self.switch_to(name, payload.get('transition'))
+            return {"current_app": name}
+        if kind == 'prewarm':
+            if not self.has_app(payload['app']):
+                raise ValueError(f"App '{payload['app']}' not found")
+            self.prewarm(payload['app'])
+            return {"app": payload['app']}
+        if kind == 'brightness':
+            self.base_brightness = max(0, min(100, int(payload['brightness'])))
+            self._next_power_check = 0.0
+            if self.schedule is None:
+                self.display.set_brightness(self.base_brightness)
+            return {"brightness": self.base_brightness}
+        if kind == 'power':
+            self._override_power(payload.get('on'))
+            return {"display_off": self._evaluate_power()}
+        if kind == 'schedule':
+            self.set_schedule(payload['schedule'])
+            return {"display_off": self._evaluate_power()}
+        if kind == 'profile':
+            # cProfile only profiles the thread that enables it
+            if payload['enable']:
+                payload['profiler'].enable()
+            else:
+                payload['profiler'].disable()
+            return {"enabled": payload['enable']}
+        if kind == 'playlist':
+            self.set_playlist(payload['playlist'])
+            return self.get_playlist_state()
+        if kind == 'config':
+            name = payload['app']
+            if not self.has_app(name):
+                raise ValueError(f"App '{name}' not found")
+            self.get_app(name).configure(payload['config'])
+            return {"app": name, "config": self.apps[name].config}
+        if kind == 'reload':
+            return {"apps": self.reload_modules(payload['modules'])}
+        if kind == 'overlay':
+            self.show_overlay(payload['text'], payload.get('duration', 5.0),
+                              payload.get('color', (255, 255, 255)))
+            return {"text": payload['text']}
+        raise ValueError(f"Unknown command '{kind}'")
+
+    def set_schedule(self, schedule):
+        """Install a DisplaySchedule, or None to disable (render thread only)."""
+        self.schedule = schedule
+        self._power_override = None
+        self._next_power_check = 0.0
+        if schedule is None:
+            self.display.set_brightness(self.base_brightness)
+
+    def _override_power(self, on):
+        """
+        Force the display on/off until the schedule next switches it on or
+        off (None = follow schedule). Brightness ramps don't end it.
+        """
+        self._next_power_check = 0.0
+        if on is None:
+            self._power_override = None
+            return
+        until = None
+        if self.schedule is not None:
+            remaining = self.schedule.seconds_until_power_change()
+            until = get_clock().time() + remaining if remaining is not None else None
+        self._power_override = (bool(on), until)
+
+    def _evaluate_power(self):
+        """Apply scheduled brightness. Returns True if the display should be off."""
+        if self._power_override and self._power_override[1] is not None \
+                and get_clock().time() >= self._power_override[1]:
+            self._power_override = None
+
+        level = self.schedule.level_at() if self.schedule else 100
+        if self._power_override is not None:
+            if not self._power_override[0]:
+                level = None
+            elif level is None:
+                level = 100
+        if level is None:
+            return True
+
+        effective = round(self.base_brightness * level / 100)
+        if effective != self.display.brightness:
+            self.display.set_brightness(effective)
+        return False
+
+    def _set_display_off(self, off):
+        if off == self.display_off:
+            return
+        self.display_off = off
+        if off:
+            log.info("Display off (sleep schedule), parking render loop.")
+            self._finish_transition()
+            if self.active_app:
+                try:
+                    self.active_app.stop()
+                except Exception as e:
+                    log.error(f"Error stopping {self.active_app_name}: {e}")
+            self.display.clear()
+            self.display.update()
+        else:
+            log.info("Display on, resuming render loop.")
+            if self.active_app:
+                try:
+                    self.active_app.start()
+                except Exception as e:
+                    log.error(f"Error starting {self.active_app_name}: {e}")
+                    self._handle_app_failure(self.active_app_name)
+
+    def _park(self):
+        """
+        Sleep with zero wakeups until the next schedule change or until a
+        control-plane command arrives.
+        """
+        timeout = None
+        if self.schedule is not None:
+            timeout = self.schedule.seconds_until_change()
+        if self._power_override and self._power_override[1] is not None:
+            remaining = max(0.0, self._power_override[1] - get_clock().time())
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        clock = get_clock()
+        start = clock.monotonic()
+        clock.wait(self.commands.wakeup, timeout)
+        self.parked_seconds += clock.monotonic() - start
+        self._next_power_check = 0.0
+
+    def _sample_power(self):
+        now = time.monotonic()
+        if not self._power_samples or now - self._power_samples[-1][0] >= POWER_SAMPLE_INTERVAL:
+            self._power_samples.append((now, time.process_time(), self.wakeups))
+
+    def get_power_metrics(self):
+        """CPU time and render-loop wakeups, overall and over the last hour."""
+        now, cpu = time.monotonic(), time.process_time()
+        metrics = {
+            "display_off": self.display_off,
+            "brightness": self.display.brightness,
+            "cpu_seconds": round(cpu, 2),
+            "wakeups": self.wakeups,
+            "parked_seconds": round(self.parked_seconds, 1),
+        }
+        if self._power_samples:
+            t0, cpu0, wakeups0 = self._power_samples[0]
+            elapsed = now - t0
+            if elapsed > 0:
+                metrics["cpu_percent"] = round((cpu - cpu0) / elapsed * 100, 2)
+                metrics["wakeups_per_hour"] = round((self.wakeups - wakeups0) / elapsed * 3600)
+        return metrics
+
+    def show_overlay(self, text, duration=5.0, color=(255, 255, 255)):
+        """
+        Show a text banner over the active app (render thread only).
+        Raises ValueError for a bad duration or color (see parse_overlay).
+        """
+        text, duration, color = parse_overlay(text, duration, color)
+        now = get_clock().monotonic()
+        self._overlay = (text, color, now, now + duration) if text else None
+
+    def _draw_overlay(self):
+        text, color, started, expires = self._overlay
+        now = get_clock().monotonic()
+        if now >= expires:
+            self._overlay = None
+            return
+
+        d = self.display
+        banner_h = GLYPH_HEIGHT + 2
+        top = d.height - banner_h
+        for y in range(top, d.height):
+            for x in range(d.width):
+                d.set_pixel(x, y, 0, 0, 0)
+
+        width = text_width(text)
+        if width <= d.width - 2:
+            x = (d.width - width) // 2
+        else:
+            # Scroll right-to-left, wrapping around
+            travel = int((now - started) * OVERLAY_SCROLL_SPEED) % (width + d.width)
+            x = d.width - travel
+        draw_text(d, x, top + 1, text, color)
+
+    def _return_to_previous(self):
+        """Leave the active app (it requested exit) for the previous one."""
+        target = self.previous_app_name
+        if not self.has_app(target) or target == self.active_app_name:
+            target = next((n for n in self._app_order if n != self.active_app_name), None)
+        if target is None:
+            self.active_app.exit_requested = False
+            return
+        log.info(f"App '{self.active_app_name}' exited, returning to '{target}'.")
+        self.switch_to(target)
+
+    def get_metrics(self):
+        """Collect metrics from the manager and every registered app."""
+        apps = {}
+        for name, app in self.apps.items():
+            try:
+                metrics = app.get_metrics()
+            except Exception as e:
+                metrics = {"error": str(e)}
+            if metrics:
+                apps[name] = metrics
+        metrics = {
+            "active_app": self.active_app_name,
+            "apps": apps,
+            "commands": self.commands.get_metrics(),
+            "power": self.get_power_metrics(),
+            "playlist": self.get_playlist_state(),
+            "transitions": {
+                "type": self.transition,
+                "duration": self.transition_duration,
+                "completed": self.transitions_completed,
+                "prewarmed": sorted(self._prewarms),
+            },
+        }
+        if self.memory is not None:
+            metrics["memory"] = self.memory.get_metrics(self.apps)
+        if self.pacer is not None:
+            metrics["pacing"] = self.pacer.get_metrics()
+        if self.frame_export is not None:
+            metrics["frame_export"] = self.frame_export.get_metrics()
+        if self.snapshots is not None:
+            metrics["snapshots"] = self.snapshots.get_metrics()
+        for key, provider in list(_metrics_providers.items()):
+            metrics[key] = provider()
+        display_metrics = self.display.get_metrics()
+        if display_metrics:
+            metrics["display"] = display_metrics
+        return metrics
 
     def _handle_app_failure(self, failed_app_name):
         """When an app exceeds max errors, switch to the next available app."""
         log.error(f"App '{failed_app_name}' failed {MAX_CONSECUTIVE_ERRORS} times, switching away.")
+        self._finish_transition()
+        self._app_failures[failed_app_name] = get_clock().monotonic()
 
         # Find another app to switch to
-        for name in self.apps:
+        for name in self._app_order:
             if name != failed_app_name:
                 log.info(f"Falling back to app: {name}")
-                self.active_app_name = name
-                self.active_app = self.apps[name]
-                self._error_count = 0
                 try:
+                    app = self.get_app(name)
+                    self.active_app_name = name
+                    self.active_app = app
+                    self._error_count = 0
                     self.active_app.start()
                     return
                 except Exception as e:
@@ -70,25 +789,75 @@ class AppManager:
         log.error("All apps failed. Showing error screen.")
         self._error_count = 0
 
-    def run_loop(self, fps=30):
+    def run_loop(self, fps=30, pacing='auto'):
+        """
+        Run the render loop. `pacing` is 'vsync' (the display's swap is the
+        clock), 'sleep' (monotonic frame deadlines) or 'auto' (vsync if the
+        display supports it); see src/core/frame_pacing.py.
+        """
         if not self.active_app:
             log.warning("No active app to run.")
             return
 
-        ms_per_frame = 1.0 / fps
+        self.pacer = pacer = FramePacer(self.display, fps, pacing)
+        log.info(f"Frame pacing: {pacer.mode} at {1e9 / pacer.period_ns:.1f} fps")
+        power_check_ns = int(POWER_CHECK_INTERVAL * 1e9)
+        self.render_thread_id = threading.get_ident()
 
         try:
             while True:
-                start_time = time.time()
+                start_ns = get_clock().monotonic_ns()
+                self.wakeups += 1
+                applied = self._apply_commands()
+
+                if start_ns >= self._next_power_check:
+                    self._sample_power()
+                    self._expire_prewarms()
+                    if self.memory is not None:
+                        self._check_memory()
+                    self._set_display_off(self._evaluate_power())
+                    self._next_power_check = start_ns + power_check_ns
+                if self.display_off:
+                    self.commands.mark_presented(applied)
+                    self._park()
+                    pacer.restart()
+                    continue
+
+                if self.playlist is not None and self.playlist.enabled:
+                    self._run_playlist()
+                if self._pending_switch is not None:
+                    self._advance_switch()
 
                 try:
+                    memory_before = self.memory.begin() if self.memory else None
                     # Logic
                     self.active_app.update()
+                    if self.active_app.exit_requested and self._pending_switch is None:
+                        self._return_to_previous()
 
-                    # Rendering
-                    self.display.clear()
-                    self.active_app.draw()
+                    # Rendering (incoming app draws off-screen while transitioning)
+                    if self._transition is None or not self._draw_transition():
+                        self.display.clear()
+                        self.active_app.draw()
+                    if memory_before is not None:
+                        self.memory.end(self.active_app_name, memory_before)
+                    if self._overlay:
+                        try:
+                            self._draw_overlay()
+                        except Exception as e:
+                            # The overlay isn't the app's fault: drop it, don't count an app error
+                            log.error(f"Dropping overlay: {e}")
+                            self._overlay = None
                     self.display.update()
+                    if self.frame_export is not None:
+                        try:
+                            self.frame_export.write(self.display.snapshot())
+                        except Exception as e:
+                            # Not the app's fault either; readers keep the last frame
+                            log.error(f"Stopping frame export: {e}")
+                            self.frame_export = None
+                    if self.snapshots is not None:
+                        self.snapshots.capture()
 
                     # Success — reset error counter
                     if self._error_count > 0:
@@ -96,6 +865,7 @@ class AppManager:
                     self._error_count = 0
 
                 except Exception as e:
+                    self._finish_transition()
                     self._error_count += 1
                     log.error(f"Frame error in '{self.active_app_name}' "
                               f"({self._error_count}/{MAX_CONSECUTIVE_ERRORS}): {e}")
@@ -111,10 +881,21 @@ class AppManager:
                     if self._error_count >= MAX_CONSECUTIVE_ERRORS:
                         self._handle_app_failure(self.active_app_name)
 
-                # Timing
-                elapsed = time.time() - start_time
-                sleep_time = max(0, ms_per_frame - elapsed)
-                time.sleep(sleep_time)
+                # Commands applied this frame are now visible; a switch is
+                # only visible once its transition has begun
+                self._switch_waiters.extend(c for c in applied if c.kind == 'switch')
+                applied = [c for c in applied if c.kind != 'switch']
+                if self._pending_switch is None:
+                    applied.extend(self._switch_waiters)
+                    self._switch_waiters.clear()
+                self.commands.mark_presented(applied)
+                self.frames_presented += 1
+                if not self.first_frame.is_set():
+                    self.first_frame.set()
+
+                # Timing: with vsync pacing the next display.update() blocks instead
+                pacer.presented()
+                pacer.wait()
 
         except KeyboardInterrupt:
             log.info("Exiting AppManager loop.")
@@ -0,0 +1,366 @@
+"""
+Process-isolated app execution.
+
+In isolated mode every app runs in its own worker process and draws into
+a multiprocessing.shared_memory framebuffer. The render loop only sends
+a "render a frame" tick, waits a bounded time for the reply, and blits
+the shared frame onto the real display. A hung or CPU-heavy app can no
+longer freeze the device or starve the Flask threads of the GIL.
+
+ProcessApp is a BaseApp proxy, so AppManager's lifecycle and error
+handling apply unchanged. WorkerPool keeps pre-forked idle workers so
+switching apps doesn't pay process startup cost. A worker rebuilds its
+app from the module, class name and config alone, so apps whose
+constructor needs other arguments stay in the main process
+(see can_isolate()).
+"""
+
+import atexit
+import importlib
+import inspect
+import multiprocessing
+import threading
+import time
+from multiprocessing import shared_memory
+
+from src.core.base_app import BaseApp
+from src.core.display_interface import DisplayInterface
+from src.core.matrix_buffer import MatrixBuffer
+from src.core.logger import get_logger
+
+log = get_logger()
+
+# Workers are started while the web and render threads run, so a plain
+# fork() could copy a lock some other thread holds (logging, imports)
+# and deadlock the child. A forkserver is exec'd once, single-threaded,
+# with this module preloaded; forking workers from it stays cheap.
+try:
+    _mp = multiprocessing.get_context('forkserver')
+    _mp.set_forkserver_preload([__name__])
+except ValueError:
+    _mp = multiprocessing.get_context('spawn')
+
+METRICS_EVERY_N_FRAMES = 30
+ERROR_SCREEN_AFTER = 1.0  # seconds without any good frame
+
+
+class SharedFrameDisplay(DisplayInterface):
+    """Display used inside a worker: draws straight into shared memory."""
+
+    def __init__(self, width, height, shm):
+        super().__init__(width, height)
+        self.buffer = MatrixBuffer(width, height, pixels=shm.buf[:width * height * 3])
+
+    def set_brightness(self, value):
+        # Brightness is applied by the real display in the main process
+        self._brightness = max(0, min(100, int(value)))
+
+    def set_pixel(self, x, y, r, g, b):
+        self.buffer.set_pixel(x, y, r, g, b)
+
+    def fill(self, r, g, b):
+        self.buffer.fill(r, g, b)
+
+    def clear(self):
+        self.buffer.clear()
+
+    def blit(self, frame):
+        self.buffer.blit(frame)
+
+    def update(self):
+        pass
+
+
+def _worker_main(conn, shm, width, height):
+    """Worker process loop: load one app, then render frames on request."""
+    display = SharedFrameDisplay(width, height, shm)
+    app = None
+    frames = 0
+    deferred_error = None  # from fire-and-forget messages, reported on next frame
+
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        kind = msg[0]
+        try:
+            if kind == 'load':
+                _, module_name, class_name, config = msg
+                app_class = getattr(importlib.import_module(module_name), class_name)
+                app = app_class(display, config)
+                app.start()
+                conn.send(('ok',))
+            elif kind == 'configure':
+                try:
+                    app.configure(msg[1])
+                except Exception as e:
+                    deferred_error = e
+            elif kind == 'trim':
+                try:
+                    app.trim_caches()
+                except Exception as e:
+                    deferred_error = e
+            elif kind == 'frame':
+                if deferred_error is not None:
+                    error, deferred_error = deferred_error, None
+                    raise error
+                app.update()
+                display.clear()
+                app.draw()
+                frames += 1
+                metrics = app.get_metrics() if frames % METRICS_EVERY_N_FRAMES == 1 else None
+                conn.send(('frame', app.exit_requested, metrics))
+                app.exit_requested = False
+            elif kind == 'stop':
+                if app:
+                    app.stop()
+                conn.send(('ok',))
+                return
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+
+
+class Worker:
+    """Main-process handle for one worker process and its framebuffer."""
+
+    def __init__(self, width, height):
+        self.shm = shared_memory.SharedMemory(create=True, size=width * height * 3)
+        self.conn, child_conn = _mp.Pipe()
+        self.process = _mp.Process(target=_worker_main, args=(child_conn, self.shm, width, height),
+                                   daemon=True, name='pixie-app-worker')
+        self.process.start()
+        child_conn.close()
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def frame(self):
+        """Memoryview of the worker's current frame."""
+        return self.shm.buf[:self.shm.size]
+
+    def shutdown(self, graceful=True):
+        if graceful and self.process.is_alive():
+            try:
+                self.conn.send(('stop',))
+                if self.conn.poll(1.0):
+                    self.conn.recv()
+            except (OSError, EOFError):
+                pass
+            self.process.join(timeout=1.0)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=1.0)
+        self.conn.close()
+        self.shm.close()
+        self.shm.unlink()
+
+
+class WorkerPool:
+    """Keeps `size` pre-forked idle workers ready to load an app."""
+
+    def __init__(self, width, height, size=2):
+        self.width = width
+        self.height = height
+        self.size = size
+        self._idle = []
+        self._live = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(size):
+            self._idle.append(self._fork())
+        atexit.register(self.shutdown)
+
+    def _fork(self):
+        worker = Worker(self.width, self.height)
+        with self._lock:
+            self._live.add(worker)
+        return worker
+
+    def acquire(self):
+        with self._lock:
+            worker = self._idle.pop() if self._idle else None
+        if worker is None or not worker.process.is_alive():
+            worker = self._fork()
+        # Fork the replacement off the render thread
+        threading.Thread(target=self._replenish, daemon=True).start()
+        return worker
+
+    def release(self, worker, graceful=True):
+        """Workers are single-use: a released one is shut down, never reused."""
+        with self._lock:
+            self._live.discard(worker)
+        threading.Thread(target=worker.shutdown, args=(graceful,), daemon=True).start()
+
+    def _replenish(self):
+        with self._lock:
+            missing = self.size - len(self._idle)
+        for _ in range(missing):
+            if self._closed:
+                return
+            worker = self._fork()
+            with self._lock:
+                self._idle.append(worker)
+
+    def shutdown(self):
+        """Kill every worker and free its shared memory (called at exit)."""
+        with self._lock:
+            self._closed = True
+            workers = list(self._live)
+            self._live.clear()
+            self._idle.clear()
+        for worker in workers:
+            worker.shutdown(graceful=False)
+
+
+def can_isolate(app_class):
+    """True if the app can be rebuilt in a worker from (display, config) alone."""
+    try:
+        params = inspect.signature(app_class).parameters
+    except (TypeError, ValueError):
+        return False
+    return all(name in ('display', 'config') for name in params)
+
+
+class AppHangError(RuntimeError):
+    pass
+
+
+class ProcessApp(BaseApp):
+    """
+    Proxy that runs an app class (given by module and class name, so the
+    main process never has to import it) in a worker process.
+
+    frame_deadline: how long update() waits for a fresh frame before
+        presenting the last good one instead.
+    hang_timeout: how long a frame may stay outstanding before the
+        worker is killed and restarted.
+    """
+
+    is_process_proxy = True
+
+    def __init__(self, display, module_name, class_name, pool, config=None,
+                 frame_deadline=0.025, hang_timeout=3.0):
+        super().__init__(display, config)
+        self.module_name = module_name
+        self.class_name = class_name
+        self.pool = pool
+        self.frame_deadline = frame_deadline
+        self.hang_timeout = hang_timeout
+
+        self._worker = None
+        self._pending_since = None
+        self._last_good = None
+        self._app_metrics = {}
+        self.frames = 0
+        self.missed_deadlines = 0
+        self.restarts = 0
+
+    def start(self):
+        super().start()
+        self._spawn()
+
+    def stop(self):
+        super().stop()
+        if self._worker:
+            self.pool.release(self._worker, graceful=self._pending_since is None)
+            self._worker = None
+        self._pending_since = None
+
+    def _spawn(self):
+        self._worker = self.pool.acquire()
+        self._pending_since = None
+        self._worker.conn.send(('load', self.module_name, self.class_name, self.config))
+        if not self._worker.conn.poll(self.hang_timeout):
+            self._kill_worker()
+            raise AppHangError(f"{self.class_name}.start() did not finish "
+                               f"within {self.hang_timeout:g}s")
+        reply = self._worker.conn.recv()
+        if reply[0] == 'error':
+            self._kill_worker()
+            raise RuntimeError(reply[1])
+
+    def configure(self, config):
+        super().configure(config)
+        if self._worker:
+            self._worker.conn.send(('configure', config))
+
+    def trim_caches(self):
+        if self._worker:
+            self._worker.conn.send(('trim',))
+
+    @property
+    def worker_pid(self):
+        """PID of the worker process, for memory accounting."""
+        return self._worker.pid if self._worker else None
+
+    def _kill_worker(self):
+        if self._worker:
+            self.pool.release(self._worker, graceful=False)
+            self._worker = None
+        self._pending_since = None
+
+    def update(self):
+        if self._worker is None:
+            self._spawn()
+
+        now = time.monotonic()
+        if self._pending_since is None:
+            self._worker.conn.send(('frame',))
+            self._pending_since = now
+
+        if self._worker.conn.poll(self.frame_deadline):
+            self._receive()
+        elif now - self._pending_since > self.hang_timeout:
+            pid = self._worker.pid
+            self._kill_worker()
+            self.restarts += 1
+            log.error(f"App worker {pid} hung for {self.hang_timeout:g}s, restarting.")
+            raise AppHangError(f"{self.class_name} stopped responding")
+        else:
+            self.missed_deadlines += 1
+
+    def _receive(self):
+        try:
+            reply = self._worker.conn.recv()
+        except EOFError:
+            self._kill_worker()
+            self.restarts += 1
+            raise RuntimeError(f"{self.class_name} worker exited unexpectedly")
+        self._pending_since = None
+        if reply[0] == 'error':
+            raise RuntimeError(reply[1])
+
+        _, exit_requested, metrics = reply
+        frame = self._worker.frame()
+        if self._last_good is None:
+            self._last_good = bytearray(frame)
+        else:
+            self._last_good[:] = frame
+        frame.release()
+        self.frames += 1
+        if metrics is not None:
+            self._app_metrics = metrics
+        if exit_requested:
+            self.request_exit()
+
+    def draw(self):
+        if self._last_good is not None:
+            self.display.blit(self._last_good)
+        elif (self._pending_since is not None
+              and time.monotonic() - self._pending_since > ERROR_SCREEN_AFTER):
+            # No good frame yet and the first one is very late
+            self.draw_error()
+
+    def get_metrics(self):
+        if not self.frames and not self.restarts:
+            return {}
+        metrics = dict(self._app_metrics)
+        metrics["worker"] = {
+            "pid": self._worker.pid if self._worker else None,
+            "frames": self.frames,
+            "missed_deadlines": self.missed_deadlines,
+            "restarts": self.restarts,
+        }
+        return metrics
@@ -9,6 +9,7 @@ class BaseApp(ABC):
         self.display = display
         self.config = config or {}
         self.is_active = False
+        self.exit_requested = False
 
     def start(self):
         """Called when the app becomes active."""
@@ -18,6 +19,42 @@ class BaseApp(ABC):
         """Called when the app becomes inactive."""
         self.is_active = False
 
+    def request_exit(self):
+        """
+        Ask the AppManager to leave this app and return to the
+        previously active one at the next frame boundary.
+        """
+        self.exit_requested = True
+
+    def configure(self, config):
+        """
+        Apply new settings while running. Called on the render thread;
+        override to react to changes.
+        """
+        self.config.update(config)
+
+    def get_metrics(self):
+        """Return a dict of app-specific metrics (exposed via /api/metrics)."""
+        return {}
+
+    def prefetch(self):
+        """
+        Start loading data ahead of being shown (e.g. by the playlist).
+        Runs on a helper thread before start(); must not draw.
+        """
+        pass
+
+    def trim_caches(self):
+        """
+        Drop cached data (decoded images, rendered text, ...) to free memory.
+        Called on the render thread when the app is over its memory budget.
+        """
+        pass
+
+    def is_stale(self):
+        """Return True if the app has no fresh data to show (the playlist skips it)."""
+        return False
+
     @abstractmethod
     def update(self):
         """Called every frame to update application logic."""
@@ -35,7 +72,7 @@ class BaseApp(ABC):
         Can be called by AppManager when an app crashes.
         """
         d = self.display
-        w, h = 64, 64
+        w, h = d.width, d.height
 
         # Red border
         for x in range(w):
@@ -52,10 +89,10 @@ class BaseApp(ABC):
         # Exclamation mark in center (red on black)
         cx = w // 2
         # Vertical bar of !
-        for y in range(20, 38):
+        for y in range(h * 20 // 64, h * 38 // 64):
             d.set_pixel(cx, y, 255, 50, 50)
             d.set_pixel(cx - 1, y, 255, 50, 50)
         # Dot of !
-        for dy in range(42, 45):
+        for dy in range(h * 42 // 64, h * 42 // 64 + 3):
             d.set_pixel(cx, dy, 255, 50, 50)
             d.set_pixel(cx - 1, dy, 255, 50, 50)
@@ -0,0 +1,123 @@
+"""
+Injectable time source for the render loop, the scheduler and apps.
+
+Everything that decides *what* to show reads time through get_clock()
+instead of the time/datetime modules: the render loop and frame pacing,
+transitions, the sleep schedule, the playlist and the built-in apps.
+Normally that is the wall clock. A simulation installs a VirtualClock,
+where sleeping advances time instantly, so a day of rotation schedules,
+sleep windows and clock rollovers runs as fast as frames can be drawn
+(see src/core/simulation.py).
+
+Real-world measurements stay on the time module: command latency, web
+timeouts, worker-process watchdogs, profiling.
+"""
+
+import time
+from datetime import datetime
+
+
+class SimulationEnded(Exception):
+    """Raised by VirtualClock.sleep()/wait() once virtual time passes `until`."""
+
+
+class Clock:
+    """The wall clock."""
+
+    virtual = False
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def monotonic_ns(self):
+        return time.monotonic_ns()
+
+    def now(self):
+        """Local time as a naive datetime, like datetime.now()."""
+        return datetime.now()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def wait(self, event, timeout=None):
+        """event.wait(timeout), in this clock's time."""
+        return event.wait(timeout)
+
+
+class VirtualClock(Clock):
+    """
+    Time that only moves when someone sleeps or waits. Starts at `start`
+    (a datetime or epoch seconds; default now). Past `until` seconds of
+    virtual time, sleep() and wait() raise SimulationEnded. on_advance,
+    if given, is called with the length of every step before it is taken.
+    """
+
+    virtual = True
+
+    def __init__(self, start=None, until=None, on_advance=None):
+        if start is None:
+            start = time.time()
+        elif isinstance(start, datetime):
+            start = start.timestamp()
+        self.start = start
+        self.elapsed_ns = 0
+        self.until_ns = None if until is None else int(until * 1e9)
+        self.on_advance = on_advance
+
+    def time(self):
+        return self.start + self.elapsed_ns / 1e9
+
+    def monotonic(self):
+        return self.elapsed_ns / 1e9
+
+    def monotonic_ns(self):
+        return self.elapsed_ns
+
+    def now(self):
+        return datetime.fromtimestamp(self.time())
+
+    def advance(self, seconds):
+        step = max(0, int(seconds * 1e9))
+        if self.until_ns is not None:
+            if self.elapsed_ns >= self.until_ns:
+                raise SimulationEnded()
+            step = min(step, self.until_ns - self.elapsed_ns)
+        if self.on_advance is not None:
+            self.on_advance(step / 1e9)
+        self.elapsed_ns += step
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def wait(self, event, timeout=None):
+        """
+        Returns at once if the event is set; otherwise time jumps ahead by
+        `timeout` (to the end of the simulation if None).
+        """
+        if event.is_set():
+            return True
+        if timeout is None:
+            if self.until_ns is None:
+                return event.wait()
+            timeout = (self.until_ns - self.elapsed_ns) / 1e9
+        self.advance(timeout)
+        return event.is_set()
+
+
+_clock = Clock()
+
+
+def get_clock():
+    """The current time source (the wall clock unless a simulation is running)."""
+    return _clock
+
+
+def set_clock(clock):
+    """Install a time source; None restores the wall clock. Returns the previous one."""
+    global _clock
+    previous = _clock
+    _clock = clock or Clock()
+    return previous
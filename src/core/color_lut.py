@@ -0,0 +1,82 @@
+"""
+Per-channel color lookup tables applied at present time.
+
+Apps draw in linear, full-scale color. Adapters pass the finished frame
+through a ColorLUT once per update(), which folds brightness, gamma and
+white balance into one 256-entry table per channel. The tables are
+rebuilt only when a setting changes, so presenting a frame is three
+C-level bytes.translate() calls (one when all channels match).
+
+Config section 'color':
+    {"gamma": 2.2, "white_balance": [1.0, 0.85, 0.7]}
+"""
+
+
+def _build_table(scale, gamma):
+    """value -> round(255 * scale * (value / 255) ** gamma)"""
+    return bytes(min(255, int(round(255 * scale * (v / 255) ** gamma))) for v in range(256))
+
+
+class ColorLUT:
+    def __init__(self, brightness=100, gamma=1.0, white_balance=(1.0, 1.0, 1.0)):
+        self.brightness = brightness
+        self.gamma = gamma
+        self.white_balance = tuple(white_balance)
+        self.tables = None  # (r, g, b) tables, or None when the LUT is identity
+        self._rebuild()
+
+    @classmethod
+    def from_config(cls, section, brightness=100):
+        return cls(brightness=brightness,
+                   gamma=float(section.get('gamma', 1.0)),
+                   white_balance=section.get('white_balance', (1.0, 1.0, 1.0)))
+
+    def configure(self, brightness=None, gamma=None, white_balance=None):
+        """Change any setting and rebuild the tables if something changed."""
+        changed = False
+        if brightness is not None and brightness != self.brightness:
+            self.brightness, changed = brightness, True
+        if gamma is not None and gamma != self.gamma:
+            self.gamma, changed = gamma, True
+        if white_balance is not None and tuple(white_balance) != self.white_balance:
+            self.white_balance, changed = tuple(white_balance), True
+        if changed:
+            self._rebuild()
+
+    def _rebuild(self):
+        if len(self.white_balance) != 3:
+            raise ValueError("white_balance must be three channel factors")
+        level = max(0, min(100, self.brightness)) / 100.0
+        scales = [level * max(0.0, min(1.0, float(wb))) for wb in self.white_balance]
+        if self.gamma == 1.0 and all(s == 1.0 for s in scales):
+            self.tables = None
+            return
+        built = {}
+        self.tables = tuple(built.setdefault(s, _build_table(s, self.gamma)) for s in scales)
+
+    @property
+    def is_identity(self):
+        return self.tables is None
+
+    def apply(self, frame):
+        """
+        Return `frame` (packed RGB) with the LUT applied. Returns the
+        input object itself when the LUT is identity.
+        """
+        if self.tables is None:
+            return frame
+        r, g, b = self.tables
+        if r is g is b:
+            return bytes(frame).translate(r)
+        out = bytearray(frame)
+        out[0::3] = out[0::3].translate(r)
+        out[1::3] = out[1::3].translate(g)
+        out[2::3] = out[2::3].translate(b)
+        return out
+
+    def color(self, r, g, b):
+        """Apply the LUT to a single color."""
+        if self.tables is None:
+            return r, g, b
+        tr, tg, tb = self.tables
+        return tr[r], tg[g], tb[b]
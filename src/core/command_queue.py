@@ -0,0 +1,160 @@
+"""
+Control-plane command queue.
+
+Web handlers (and any other thread) never touch AppManager state
+directly. They submit a Command, which the render loop drains and
+applies at the next frame boundary. A command is complete once the
+first frame reflecting it has been presented, which is also how the
+command-to-visible-frame latency is measured.
+"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+
+PENDING = 'pending'
+APPLIED = 'applied'
+DONE = 'done'
+FAILED = 'failed'
+COALESCED = 'coalesced'
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Command:
+    """A single state mutation requested from outside the render thread."""
+
+    def __init__(self, command_id, kind, payload, key):
+        self.id = command_id
+        self.kind = kind
+        self.payload = payload
+        self.key = key
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.superseded_by = None
+        self.created = time.monotonic()
+        self.latency = None
+        self._done = threading.Event()
+
+    @property
+    def finished(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the command is presented (or failed). Returns True if finished."""
+        return self._done.wait(timeout)
+
+    def _finish(self, status, result=None, error=None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.latency = time.monotonic() - self.created
+        self._done.set()
+
+    def to_dict(self):
+        data = {"id": self.id, "kind": self.kind, "status": self.status}
+        if self.result is not None:
+            data["result"] = self.result
+        if self.error is not None:
+            data["error"] = self.error
+        if self.superseded_by is not None:
+            data["superseded_by"] = self.superseded_by
+        if self.latency is not None:
+            data["latency_ms"] = round(self.latency * 1000, 2)
+        return data
+
+
+class CommandQueue:
+    """
+    Bounded, coalescing queue drained by the render loop.
+
+    Commands with the same coalescing key replace each other while still
+    pending (e.g. ten brightness drags become one brightness change);
+    the replaced command finishes immediately as 'coalesced'.
+    """
+
+    def __init__(self, maxsize=64, history=256, latency_samples=512):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()          # key -> Command
+        self._recent = OrderedDict()           # id -> Command, for lookups
+        self._history = history
+        self._latencies = deque(maxlen=latency_samples)
+        self._ids = itertools.count(1)
+        self.submitted = 0
+        self.coalesced = 0
+        self.wakeup = threading.Event()        # set whenever a command arrives
+
+    def submit(self, kind, payload=None, key=None):
+        """
+        Queue a command. `key` controls coalescing and defaults to the
+        kind; pass a unique key to opt out. Raises QueueFull when full.
+        """
+        key = key if key is not None else kind
+        with self._lock:
+            replaced = self._pending.pop(key, None)
+            if replaced is None and len(self._pending) >= self.maxsize:
+                raise QueueFull(f"Command queue full ({self.maxsize} pending)")
+            cmd = Command(next(self._ids), kind, payload or {}, key)
+            self._pending[key] = cmd
+            self._recent[cmd.id] = cmd
+            while len(self._recent) > self._history:
+                self._recent.popitem(last=False)
+            self.submitted += 1
+        if replaced is not None:
+            self.coalesced += 1
+            replaced.superseded_by = cmd.id
+            replaced._finish(COALESCED)
+        self.wakeup.set()
+        return cmd
+
+    def drain(self):
+        """Take every pending command (render thread, at a frame boundary)."""
+        with self._lock:
+            commands = list(self._pending.values())
+            self._pending.clear()
+            self.wakeup.clear()
+        return commands
+
+    def get(self, command_id):
+        with self._lock:
+            return self._recent.get(command_id)
+
+    def mark_applied(self, cmd, result=None):
+        cmd.status = APPLIED
+        cmd.result = result
+
+    def mark_failed(self, cmd, error):
+        cmd._finish(FAILED, error=str(error))
+
+    def mark_presented(self, commands):
+        """Complete applied commands once their frame is on the display."""
+        for cmd in commands:
+            if cmd.status == APPLIED:
+                cmd._finish(DONE, result=cmd.result)
+                self._latencies.append(cmd.latency)
+
+    def get_metrics(self):
+        samples = sorted(self._latencies)
+        metrics = {
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "pending": len(self._pending),
+        }
+        if samples:
+            metrics["latency_ms"] = {
+                "p50": round(_percentile(samples, 50) * 1000, 2),
+                "p99": round(_percentile(samples, 99) * 1000, 2),
+                "max": round(samples[-1] * 1000, 2),
+                "samples": len(samples),
+            }
+        return metrics
+
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
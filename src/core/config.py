@@ -0,0 +1,66 @@
+import json
+import os
+import threading
+
+from src.core.logger import get_logger
+
+log = get_logger()
+
+# Singleton config for the entire Pixie application
+_config = None
+
+DEFAULT_CONFIG_PATH = os.path.expanduser('~/pixie_config.json')
+
+
+class Config:
+    """
+    Persistent settings stored as one JSON file of named sections,
+    e.g. {"display": {"chain_length": 2}}.
+    Missing or unreadable files simply yield empty sections.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = {}
+        try:
+            with open(path) as f:
+                self._data = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            log.warning(f"Could not read config at {path}: {e}")
+
+    def section(self, name):
+        """Return a copy of a config section (empty dict if missing)."""
+        with self._lock:
+            return dict(self._data.get(name, {}))
+
+    def update_section(self, name, values):
+        """Merge values into a section and persist the file."""
+        with self._lock:
+            self._data.setdefault(name, {}).update(values)
+            self._save()
+
+    def replace_section(self, name, values):
+        """Overwrite a section and persist the file."""
+        with self._lock:
+            self._data[name] = values
+            self._save()
+
+    def _save(self):
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            log.error(f"Could not write config at {self.path}: {e}")
+
+
+def get_config():
+    """Get the shared Pixie config. Loads it on first call."""
+    global _config
+    if _config is None:
+        _config = Config(os.environ.get('PIXIE_CONFIG', DEFAULT_CONFIG_PATH))
+    return _config
@@ -1,12 +1,17 @@
 from abc import ABC, abstractmethod
 
+from src.core.indexed_buffer import expand
+
 class DisplayInterface(ABC):
     """
     Abstract base class for display adapters.
     Defines the contract for drawing to a display (hardware or virtual).
+    Apps should lay out against `width` and `height` rather than assuming 64x64.
     """
 
-    def __init__(self):
+    def __init__(self, width=64, height=64):
+        self.width = width
+        self.height = height
         self._brightness = 100  # 0-100
 
     @property
@@ -20,7 +25,10 @@ class DisplayInterface(ABC):
 
     @abstractmethod
     def set_pixel(self, x, y, r, g, b):
-        """Sets a single pixel at (x, y) to color (r, g, b)."""
+        """
+        Sets a single pixel at (x, y) to color (r, g, b). Components are
+        clamped to 0-255 and truncated to int.
+        """
         pass
 
     @abstractmethod
@@ -38,3 +46,45 @@ class DisplayInterface(ABC):
         """Refreshes the display (if needed)."""
         pass
 
+    def sync_to_vsync(self, fps):
+        """
+        Ask the adapter to present at `fps` by blocking update() until the
+        panel's vsync. Returns the resulting frame period in nanoseconds,
+        or None if update() does not block on vsync (the loop then sleeps).
+        """
+        return None
+
+    def get_metrics(self):
+        """Return a dict of adapter-specific metrics (exposed via /api/metrics)."""
+        return {}
+
+    def snapshot(self):
+        """
+        Return a copy of the current frame as packed RGB bytes (as drawn,
+        before color correction). Used as the outgoing frame of a
+        transition, for PNG snapshots and for frame export. The default
+        copies `self.buffer` (a MatrixBuffer); adapters without one can't
+        read their pixels back and report a black frame.
+        """
+        buffer = getattr(self, 'buffer', None)
+        if buffer is None:
+            return bytes(self.width * self.height * 3)
+        return bytes(buffer.get_bytes())
+
+    def blit(self, frame):
+        """
+        Copies a full frame of packed RGB bytes (row-major, width*height*3)
+        onto the display. Adapters override this with a bulk copy.
+        """
+        w = self.width
+        for i in range(self.width * self.height):
+            o = i * 3
+            self.set_pixel(i % w, i // w, frame[o], frame[o + 1], frame[o + 2])
+
+    def blit_indexed(self, indices, palette):
+        """
+        Copies a palette-indexed frame (one index byte per pixel, row-major,
+        and a packed 256-entry RGB palette; see src/core/indexed_buffer.py).
+        Adapters that present indexed frames directly override this.
+        """
+        self.blit(expand(indices, palette))
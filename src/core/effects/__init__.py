@@ -0,0 +1,26 @@
+"""
+Vectorized procedural effects (plasma, fire, starfield, gradients, noise).
+
+Each Effect renders a whole frame with NumPy array math into buffers it
+allocated up front. Ready-made apps live in src/apps/effect_apps.py;
+`python3 tools/bench_effects.py` reports per-effect frame times.
+"""
+
+from src.core.effects.base import Effect
+from src.core.effects.fire import Fire
+from src.core.effects.gradient import Gradient
+from src.core.effects.noise import Noise
+from src.core.effects.plasma import Plasma
+from src.core.effects.starfield import Starfield
+from src.core.effects.tables import PALETTES, get_palette
+
+EFFECTS = {
+    'plasma': Plasma,
+    'fire': Fire,
+    'starfield': Starfield,
+    'gradient': Gradient,
+    'noise': Noise,
+}
+
+__all__ = ['Effect', 'Fire', 'Gradient', 'Noise', 'Plasma', 'Starfield',
+           'EFFECTS', 'PALETTES', 'get_palette']
@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from src.core.effects.tables import get_palette
+
+
+class Effect(ABC):
+    """
+    A full-screen procedural animation rendered with NumPy.
+
+    Subclasses allocate every array they need in __init__ (or
+    _allocate) and write into them with out= arguments in render(), so
+    producing a frame allocates nothing. `frame` is the (height, width, 3)
+    uint8 result; `frame_bytes` is a flat byte view of it suitable for
+    display.blit().
+    """
+
+    default_palette = 'rainbow'
+
+    def __init__(self, width, height, speed=1.0, palette=None, seed=None):
+        self.width = width
+        self.height = height
+        self.speed = speed
+        self.palette = get_palette(palette or self.default_palette)
+        self.rng = np.random.default_rng(seed)
+        self.frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self.frame_bytes = memoryview(self.frame).cast('B')
+
+    def set_palette(self, name):
+        self.palette = get_palette(name)
+
+    @abstractmethod
+    def render(self, t):
+        """Render the frame for time `t` (seconds) into self.frame and return it."""
+        pass
+
+    def _apply_palette(self, index):
+        """Map a uint8 index plane through the palette into self.frame."""
+        np.take(self.palette, index, axis=0, out=self.frame)
@@ -0,0 +1,61 @@
+import numpy as np
+
+from src.core.effects.base import Effect
+
+
+class Fire(Effect):
+    """
+    Rising fire: a heat field seeded with random embers along the bottom
+    row, where each cell averages the cells below it and cools.
+    """
+
+    default_palette = 'fire'
+
+    def __init__(self, width, height, cooling=6, intensity=0.6, **kwargs):
+        super().__init__(width, height, **kwargs)
+        self.cooling = cooling
+        self.intensity = intensity
+        # Two hidden rows below the screen feed the visible area
+        self._heat = np.zeros((height + 2, width + 2), dtype=np.int16)
+        self._next = np.zeros((height, width), dtype=np.int16)
+        self._noise = np.empty((height, width), dtype=np.float32)
+        self._cool = np.empty((height, width), dtype=np.int16)
+        self._embers = np.empty(width, dtype=np.float32)
+        self._index = np.empty((height, width), dtype=np.uint8)
+        self._last_t = None
+        self._pending = 0.0
+
+    def _step(self):
+        heat = self._heat
+        w, h = self.width, self.height
+        self.rng.random(dtype=np.float32, out=self._embers)
+        np.greater(self._embers, 1 - self.intensity, out=self._embers)
+        np.multiply(self._embers, 255, out=self._embers)
+        np.copyto(heat[h:, 1:-1], self._embers, casting='unsafe')
+
+        # new[y, x] = (below-left + below + below-right + two-below) / 4 - cooling
+        below = heat[1:h + 1]
+        np.add(below[:, :-2], below[:, 1:-1], out=self._next)
+        np.add(self._next, below[:, 2:], out=self._next)
+        np.add(self._next, heat[2:h + 2, 1:-1], out=self._next)
+        np.right_shift(self._next, 2, out=self._next)
+        self.rng.random(dtype=np.float32, out=self._noise)
+        np.multiply(self._noise, self.cooling, out=self._noise)
+        np.copyto(self._cool, self._noise, casting='unsafe')
+        np.subtract(self._next, self._cool, out=self._next)
+        np.maximum(self._next, 0, out=self._next)
+        heat[:h, 1:-1] = self._next
+
+    def render(self, t):
+        # Simulate at a fixed 30 steps per second of effect time
+        if self._last_t is None:
+            self._last_t = t
+        self._pending += (t - self._last_t) * 30 * self.speed
+        self._last_t = t
+        steps = min(int(self._pending), 4)
+        self._pending -= int(self._pending)
+        for _ in range(steps):
+            self._step()
+        np.copyto(self._index, self._heat[:self.height, 1:-1], casting='unsafe')
+        self._apply_palette(self._index)
+        return self.frame
@@ -0,0 +1,33 @@
+import math
+
+import numpy as np
+
+from src.core.effects.base import Effect
+
+
+class Gradient(Effect):
+    """A slowly rotating, scrolling linear gradient through the palette."""
+
+    def __init__(self, width, height, bands=1.0, **kwargs):
+        super().__init__(width, height, **kwargs)
+        y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+        scale = 256 * bands / max(width, height)
+        self._x = (x - width / 2) * scale
+        self._y = (y - height / 2) * scale
+        self._pos = np.empty((height, width), dtype=np.float32)
+        self._term = np.empty((height, width), dtype=np.float32)
+        self._int = np.empty((height, width), dtype=np.int32)
+        self._index = np.empty((height, width), dtype=np.uint8)
+
+    def render(self, t):
+        t = t * self.speed
+        angle = t * 0.2
+        np.multiply(self._x, math.cos(angle), out=self._pos)
+        np.multiply(self._y, math.sin(angle), out=self._term)
+        np.add(self._pos, self._term, out=self._pos)
+        np.add(self._pos, t * 40, out=self._pos)
+        np.copyto(self._int, self._pos, casting='unsafe')
+        np.bitwise_and(self._int, 255, out=self._int)
+        np.copyto(self._index, self._int, casting='unsafe')
+        self._apply_palette(self._index)
+        return self.frame
@@ -0,0 +1,61 @@
+import numpy as np
+
+from src.core.effects.base import Effect
+
+TEXTURE_SIZE = 256   # tileable noise texture, power of two
+TEXTURE_MASK = TEXTURE_SIZE - 1
+
+
+def _smooth_noise(rng, cells):
+    """Tileable value noise: a random lattice upsampled with smoothstep."""
+    lattice = rng.random((cells, cells)).astype(np.float32)
+    coords = np.arange(TEXTURE_SIZE, dtype=np.float32) * cells / TEXTURE_SIZE
+    i0 = coords.astype(np.intp)
+    i1 = (i0 + 1) % cells
+    f = coords - i0
+    f = f * f * (3 - 2 * f)
+    rows = lattice[i0] * (1 - f)[:, None] + lattice[i1] * f[:, None]
+    return rows[:, i0] * (1 - f)[None, :] + rows[:, i1] * f[None, :]
+
+
+class Noise(Effect):
+    """
+    Drifting clouds: two octaves of a precomputed tileable noise texture
+    scrolled in different directions and summed.
+    """
+
+    default_palette = 'lava'
+
+    def __init__(self, width, height, **kwargs):
+        super().__init__(width, height, **kwargs)
+        texture = _smooth_noise(self.rng, 8) * 0.65 + _smooth_noise(self.rng, 32) * 0.35
+        self._texture = (texture * 255).astype(np.uint8).reshape(-1)
+        y, x = np.mgrid[0:height, 0:width]
+        self._x = x.astype(np.int32)
+        self._y = y.astype(np.int32)
+        self._col = np.empty((height, width), dtype=np.int32)
+        self._row = np.empty((height, width), dtype=np.int32)
+        self._a = np.empty((height, width), dtype=np.uint8)
+        self._b = np.empty((height, width), dtype=np.uint8)
+        self._index = np.empty((height, width), dtype=np.uint8)
+
+    def _sample(self, ox, oy, out):
+        np.add(self._x, ox, out=self._col)
+        np.bitwise_and(self._col, TEXTURE_MASK, out=self._col)
+        np.add(self._y, oy, out=self._row)
+        np.bitwise_and(self._row, TEXTURE_MASK, out=self._row)
+        np.left_shift(self._row, 8, out=self._row)
+        np.add(self._row, self._col, out=self._row)
+        np.take(self._texture, self._row, out=out)
+
+    def render(self, t):
+        t = t * self.speed
+        self._sample(int(t * 6), int(t * 4), self._a)
+        self._sample(int(-t * 9) + 97, int(t * 7) + 31, self._b)
+        # Average the two layers, then cycle the palette slowly
+        np.right_shift(self._a, 1, out=self._a)
+        np.right_shift(self._b, 1, out=self._b)
+        np.add(self._a, self._b, out=self._index)
+        np.add(self._index, np.uint8(int(t * 10) & 255), out=self._index)
+        self._apply_palette(self._index)
+        return self.frame
@@ -0,0 +1,42 @@
+import numpy as np
+
+from src.core.effects.base import Effect
+from src.core.effects.tables import SIN_MASK, SIN_TABLE
+
+
+class Plasma(Effect):
+    """Classic demoscene plasma: four sine fields summed and palette-mapped."""
+
+    def __init__(self, width, height, scale=1.0, **kwargs):
+        super().__init__(width, height, **kwargs)
+        y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+        size = max(width, height) / 64 * scale
+        cx, cy = width / 2, height / 2
+        # Per-pixel phase offsets into SIN_TABLE for each field
+        self._fields = [
+            (x * 16 / size).astype(np.int32),
+            (y * 12 / size).astype(np.int32),
+            ((x + y) * 9 / size).astype(np.int32),
+            (np.sqrt((x - cx) ** 2 + (y - cy) ** 2) * 20 / size).astype(np.int32),
+        ]
+        self._rates = (37, -23, 29, -41)   # table steps per second, per field
+        self._phase = np.empty((height, width), dtype=np.int32)
+        self._term = np.empty((height, width), dtype=np.int32)
+        self._sum = np.empty((height, width), dtype=np.int32)
+        self._index = np.empty((height, width), dtype=np.uint8)
+
+    def render(self, t):
+        ticks = t * self.speed * 16
+        self._sum.fill(0)
+        for field, rate in zip(self._fields, self._rates):
+            np.add(field, int(ticks * rate), out=self._phase)
+            np.bitwise_and(self._phase, SIN_MASK, out=self._phase)
+            np.take(SIN_TABLE, self._phase, out=self._term)
+            np.add(self._sum, self._term, out=self._sum)
+        # Sum is -508..508; map to 0..255 and cycle the palette over time
+        np.right_shift(self._sum, 1, out=self._sum)
+        np.add(self._sum, int(ticks * 8), out=self._sum)
+        np.bitwise_and(self._sum, 255, out=self._sum)
+        np.copyto(self._index, self._sum, casting='unsafe')
+        self._apply_palette(self._index)
+        return self.frame
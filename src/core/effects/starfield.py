@@ -0,0 +1,73 @@
+import numpy as np
+
+from src.core.effects.base import Effect
+
+NEAR, FAR = 0.05, 1.0
+
+
+class Starfield(Effect):
+    """Stars flying towards the viewer, brighter as they get closer."""
+
+    default_palette = 'ocean'
+
+    def __init__(self, width, height, stars=200, **kwargs):
+        super().__init__(width, height, **kwargs)
+        self.count = stars
+        self._x = self.rng.uniform(-1, 1, stars).astype(np.float32)
+        self._y = self.rng.uniform(-1, 1, stars).astype(np.float32)
+        self._z = self.rng.uniform(NEAR, FAR, stars).astype(np.float32)
+        self._respawn = np.empty(stars, dtype=bool)
+        self._random = np.empty(stars, dtype=np.float32)
+        self._sx = np.empty(stars, dtype=np.float32)
+        self._sy = np.empty(stars, dtype=np.float32)
+        self._flat = np.empty(stars, dtype=np.intp)
+        self._iy = np.empty(stars, dtype=np.intp)
+        self._level = np.empty(stars, dtype=np.float32)
+        self._index = np.empty(stars, dtype=np.uint8)
+        self._color = np.empty((stars, 3), dtype=np.uint8)
+        # Off-screen stars are clipped onto a one-pixel border that is never shown
+        self._canvas = np.zeros((height + 2, width + 2, 3), dtype=np.uint8)
+        self._canvas_flat = self._canvas.reshape(-1, 3)
+        self._last_t = None
+
+    def _reseed(self, values, low, high):
+        self.rng.random(dtype=np.float32, out=self._random)
+        np.multiply(self._random, high - low, out=self._random)
+        np.add(self._random, low, out=self._random)
+        np.copyto(values, self._random, where=self._respawn)
+
+    def render(self, t):
+        dt = 0.0 if self._last_t is None else t - self._last_t
+        self._last_t = t
+        np.subtract(self._z, dt * 0.4 * self.speed, out=self._z)
+        np.less(self._z, NEAR, out=self._respawn)
+        self._reseed(self._x, -1, 1)
+        self._reseed(self._y, -1, 1)
+        np.copyto(self._z, FAR, where=self._respawn)
+
+        # Perspective projection onto the padded canvas
+        w, h = self.width, self.height
+        np.divide(self._x, self._z, out=self._sx)
+        np.multiply(self._sx, w / 2, out=self._sx)
+        np.add(self._sx, w / 2 + 1, out=self._sx)
+        np.clip(self._sx, 0, w + 1, out=self._sx)
+        np.divide(self._y, self._z, out=self._sy)
+        np.multiply(self._sy, h / 2, out=self._sy)
+        np.add(self._sy, h / 2 + 1, out=self._sy)
+        np.clip(self._sy, 0, h + 1, out=self._sy)
+        np.copyto(self._flat, self._sx, casting='unsafe')
+        np.copyto(self._iy, self._sy, casting='unsafe')
+        np.multiply(self._iy, w + 2, out=self._iy)
+        np.add(self._flat, self._iy, out=self._flat)
+
+        # Nearer stars take brighter palette entries
+        np.subtract(FAR, self._z, out=self._level)
+        np.multiply(self._level, 255 / (FAR - NEAR), out=self._level)
+        np.clip(self._level, 0, 255, out=self._level)
+        np.copyto(self._index, self._level, casting='unsafe')
+        np.take(self.palette, self._index, axis=0, out=self._color)
+
+        self._canvas.fill(0)
+        self._canvas_flat[self._flat] = self._color
+        np.copyto(self.frame, self._canvas[1:-1, 1:-1])
+        return self.frame
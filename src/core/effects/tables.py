@@ -0,0 +1,60 @@
+"""
+Lookup tables shared by the effects: a fixed-point sine table and
+256-entry RGB palettes. Built once at import; effects index them with
+np.take() instead of calling sin() or converting colors per pixel.
+"""
+
+import numpy as np
+
+SIN_SIZE = 1024
+SIN_MASK = SIN_SIZE - 1
+# sin() scaled to -127..127, indexed by angle * SIN_SIZE / 2pi
+SIN_TABLE = np.round(np.sin(np.arange(SIN_SIZE) * 2 * np.pi / SIN_SIZE) * 127).astype(np.int32)
+
+
+def gradient_palette(stops):
+    """
+    Build a (256, 3) uint8 palette by linear interpolation between
+    (position 0-255, (r, g, b)) stops.
+    """
+    positions = [p for p, _ in stops]
+    colors = np.array([c for _, c in stops], dtype=np.float32)
+    index = np.arange(256)
+    channels = [np.interp(index, positions, colors[:, c]) for c in range(3)]
+    return np.stack(channels, axis=1).round().astype(np.uint8)
+
+
+def hsv_palette(saturation=1.0, value=1.0):
+    """Full hue circle as a (256, 3) uint8 palette."""
+    h = np.arange(256) / 256 * 6
+    sector = np.floor(h).astype(int) % 6
+    f = h - np.floor(h)
+    p = value * (1 - saturation)
+    q = value * (1 - saturation * f)
+    t = value * (1 - saturation * (1 - f))
+    v = np.full(256, value)
+    r = np.choose(sector, [v, q, p, p, t, v])
+    g = np.choose(sector, [t, v, v, q, p, p])
+    b = np.choose(sector, [p, p, t, v, v, q])
+    return (np.stack([r, g, b], axis=1) * 255).round().astype(np.uint8)
+
+
+PALETTES = {
+    'rainbow': hsv_palette(),
+    'fire': gradient_palette([(0, (0, 0, 0)), (64, (128, 0, 0)), (128, (255, 80, 0)),
+                              (192, (255, 200, 0)), (255, (255, 255, 200))]),
+    'ocean': gradient_palette([(0, (0, 0, 32)), (96, (0, 64, 160)), (176, (0, 180, 200)),
+                               (255, (200, 255, 255))]),
+    'lava': gradient_palette([(0, (20, 0, 0)), (100, (160, 20, 0)), (180, (255, 120, 0)),
+                              (220, (255, 60, 0)), (255, (40, 0, 0))]),
+    'forest': gradient_palette([(0, (0, 20, 0)), (128, (30, 140, 20)), (200, (160, 200, 40)),
+                                (255, (0, 40, 0))]),
+}
+
+
+def get_palette(name):
+    """Look up a named palette; raises ValueError for unknown names."""
+    try:
+        return PALETTES[name]
+    except KeyError:
+        raise ValueError(f"Unknown palette '{name}' (choose from {', '.join(PALETTES)})")
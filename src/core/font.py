@@ -0,0 +1,88 @@
+"""
+Tiny 3x5 pixel font for status text and overlays.
+Lowercase letters render as uppercase; unknown characters render as '?'.
+"""
+
+GLYPH_WIDTH = 3
+GLYPH_HEIGHT = 5
+SPACING = 1
+
+# Each glyph is 5 rows of 3 bits, most significant bit on the left
+GLYPHS = {
+    'A': (0b010, 0b101, 0b111, 0b101, 0b101),
+    'B': (0b110, 0b101, 0b110, 0b101, 0b110),
+    'C': (0b011, 0b100, 0b100, 0b100, 0b011),
+    'D': (0b110, 0b101, 0b101, 0b101, 0b110),
+    'E': (0b111, 0b100, 0b110, 0b100, 0b111),
+    'F': (0b111, 0b100, 0b110, 0b100, 0b100),
+    'G': (0b011, 0b100, 0b101, 0b101, 0b011),
+    'H': (0b101, 0b101, 0b111, 0b101, 0b101),
+    'I': (0b111, 0b010, 0b010, 0b010, 0b111),
+    'J': (0b001, 0b001, 0b001, 0b101, 0b010),
+    'K': (0b101, 0b101, 0b110, 0b101, 0b101),
+    'L': (0b100, 0b100, 0b100, 0b100, 0b111),
+    'M': (0b101, 0b111, 0b111, 0b101, 0b101),
+    'N': (0b110, 0b101, 0b101, 0b101, 0b101),
+    'O': (0b010, 0b101, 0b101, 0b101, 0b010),
+    'P': (0b110, 0b101, 0b110, 0b100, 0b100),
+    'Q': (0b010, 0b101, 0b101, 0b110, 0b011),
+    'R': (0b110, 0b101, 0b110, 0b101, 0b101),
+    'S': (0b011, 0b100, 0b010, 0b001, 0b110),
+    'T': (0b111, 0b010, 0b010, 0b010, 0b010),
+    'U': (0b101, 0b101, 0b101, 0b101, 0b111),
+    'V': (0b101, 0b101, 0b101, 0b101, 0b010),
+    'W': (0b101, 0b101, 0b111, 0b111, 0b101),
+    'X': (0b101, 0b101, 0b010, 0b101, 0b101),
+    'Y': (0b101, 0b101, 0b010, 0b010, 0b010),
+    'Z': (0b111, 0b001, 0b010, 0b100, 0b111),
+    '0': (0b111, 0b101, 0b101, 0b101, 0b111),
+    '1': (0b010, 0b110, 0b010, 0b010, 0b111),
+    '2': (0b110, 0b001, 0b010, 0b100, 0b111),
+    '3': (0b110, 0b001, 0b010, 0b001, 0b110),
+    '4': (0b101, 0b101, 0b111, 0b001, 0b001),
+    '5': (0b111, 0b100, 0b110, 0b001, 0b110),
+    '6': (0b011, 0b100, 0b111, 0b101, 0b111),
+    '7': (0b111, 0b001, 0b010, 0b010, 0b010),
+    '8': (0b111, 0b101, 0b111, 0b101, 0b111),
+    '9': (0b111, 0b101, 0b111, 0b001, 0b110),
+    ' ': (0b000, 0b000, 0b000, 0b000, 0b000),
+    '.': (0b000, 0b000, 0b000, 0b000, 0b010),
+    ',': (0b000, 0b000, 0b000, 0b010, 0b100),
+    ':': (0b000, 0b010, 0b000, 0b010, 0b000),
+    '!': (0b010, 0b010, 0b010, 0b000, 0b010),
+    '?': (0b110, 0b001, 0b010, 0b000, 0b010),
+    '-': (0b000, 0b000, 0b111, 0b000, 0b000),
+    '+': (0b000, 0b010, 0b111, 0b010, 0b000),
+    '=': (0b000, 0b111, 0b000, 0b111, 0b000),
+    '_': (0b000, 0b000, 0b000, 0b000, 0b111),
+    '/': (0b001, 0b001, 0b010, 0b100, 0b100),
+    "'": (0b010, 0b010, 0b000, 0b000, 0b000),
+    '%': (0b101, 0b001, 0b010, 0b100, 0b101),
+    '(': (0b010, 0b100, 0b100, 0b100, 0b010),
+    ')': (0b010, 0b001, 0b001, 0b001, 0b010),
+    '#': (0b101, 0b111, 0b101, 0b111, 0b101),
+}
+
+
+def text_width(text):
+    """Width in pixels of `text` rendered with draw_text."""
+    if not text:
+        return 0
+    return len(text) * (GLYPH_WIDTH + SPACING) - SPACING
+
+
+def draw_text(display, x, y, text, color=(255, 255, 255)):
+    """Draw `text` with its top-left corner at (x, y), clipped to the display."""
+    r, g, b = color
+    w, h = display.width, display.height
+    for ch in text.upper():
+        glyph = GLYPHS.get(ch, GLYPHS['?'])
+        if -GLYPH_WIDTH < x < w:
+            for row, bits in enumerate(glyph):
+                py = y + row
+                if not 0 <= py < h:
+                    continue
+                for col in range(GLYPH_WIDTH):
+                    if bits & (0b100 >> col) and 0 <= x + col < w:
+                        display.set_pixel(x + col, py, r, g, b)
+        x += GLYPH_WIDTH + SPACING
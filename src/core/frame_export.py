@@ -0,0 +1,252 @@
+"""
+Frames in named POSIX shared memory, for sidecar processes.
+
+With the 'shared_memory' config section set, the render loop publishes
+every presented frame into a segment (default /dev/shm/pixie_frames)
+that recorders, QA rigs or visualizers map and read at full rate without
+going through the web server. An optional input segment
+(/dev/shm/pixie_input) works the other way round: an external process
+writes frames and the "shm_input" app shows them.
+
+Segment layout (little-endian), frame data at HEADER_SIZE:
+
+    magic        4s  b'PXFB'
+    version      H   2
+    header_size  H   64
+    width        H
+    height       H
+    frame_size   I   width * height * 3 (packed RGB, row-major)
+    seq          Q   seqlock: odd while a frame is being written
+    timestamp    Q   time.monotonic_ns() of the last complete frame
+    owner_pid    I   process that created the segment
+    checksum     I   zlib.crc32 of the last complete frame
+
+A single writer bumps `seq` to odd, copies the frame, stores the
+timestamp and checksum and bumps `seq` to even. Readers copy the frame
+(or use the `frame` memoryview in place) between begin_read() and
+end_read() and retry if `seq` changed, so they never block the writer.
+
+Python has no memory barriers: the stores are plain memcpys, which x86
+keeps in order but ARM (a Raspberry Pi) may let another core see out of
+order. end_read() therefore also checks the frame against its checksum,
+so a reader never accepts a torn frame even when `seq` looks unchanged.
+
+This module only uses the standard library; sidecars can import it (or
+copy it) as their client library:
+
+    from src.core.frame_export import FrameSegment
+    seg = FrameSegment.attach('pixie_frames')
+    seq, frame = 0, bytearray(seg.frame_size)
+    while True:
+        seq, timestamp_ns, frame = seg.wait_frame(after=seq, out=frame)
+"""
+
+import atexit
+import os
+import struct
+import time
+import zlib
+from multiprocessing import shared_memory
+
+MAGIC = b'PXFB'
+VERSION = 2
+HEADER_SIZE = 64
+HEADER = struct.Struct('<4sHHHHIQQII')
+SEQ = struct.Struct('<Q')
+SEQ_OFFSET = 16
+TIMESTAMP_OFFSET = 24
+CHECKSUM = struct.Struct('<I')
+OWNER_OFFSET = 32
+CHECKSUM_OFFSET = 36
+DEFAULT_EXPORT_NAME = 'pixie_frames'
+DEFAULT_INPUT_NAME = 'pixie_input'
+POLL_INTERVAL = 0.001
+
+_created = {}  # name -> FrameSegment created by this process
+
+
+def _attach_untracked(name):
+    """
+    Map an existing segment without registering it with this process's
+    resource tracker, which would otherwise unlink it when we exit.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        except Exception:
+            pass
+        return shm
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+def _remove_stale(name):
+    """
+    Unlink a segment left behind by a run that died without cleaning up.
+    Raises FileExistsError if it belongs to a live process or isn't ours.
+    """
+    stale = _attach_untracked(name)
+    owner = 0
+    try:
+        if stale.size >= HEADER.size:
+            magic, version, *_, owner, _ = HEADER.unpack_from(stale.buf)
+            if magic != MAGIC or version != VERSION:
+                owner = 0
+    finally:
+        stale.close()
+    if not owner:
+        raise FileExistsError(f"Shared memory '{name}' exists and is not a Pixie frame segment "
+                              f"(remove /dev/shm/{name} if it is left over)")
+    if name in _created or (owner != os.getpid() and _pid_alive(owner)):
+        raise FileExistsError(f"Shared memory '{name}' is in use by process {owner}")
+    stale.unlink()
+
+
+class FrameSegment:
+    """One frame behind a seqlock header in a named shared-memory segment."""
+
+    def __init__(self, shm, owner):
+        self._shm = shm
+        self.owner = owner
+        self.name = shm.name.lstrip('/')
+        magic, version, header_size, width, height, frame_size, *_ = HEADER.unpack_from(shm.buf)
+        if magic != MAGIC or version != VERSION:
+            shm.close()
+            raise ValueError(f"Shared memory '{self.name}' is not a Pixie frame segment")
+        self.width = width
+        self.height = height
+        self.frame_size = frame_size
+        self._buf = shm.buf
+        # Zero-copy view of the pixel data; validate with begin_read()/end_read()
+        self.frame = shm.buf[header_size:header_size + frame_size]
+        atexit.register(self.close)
+
+    @classmethod
+    def create(cls, name, width, height):
+        """
+        Create a segment; it is unlinked when this process exits. One left
+        behind by a crashed run (its owner is gone) is replaced; raises
+        FileExistsError if the name is held by a live process.
+        """
+        frame_size = width * height * 3
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER_SIZE + frame_size)
+        except FileExistsError:
+            _remove_stale(name)
+            shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER_SIZE + frame_size)
+        HEADER.pack_into(shm.buf, 0, MAGIC, VERSION, HEADER_SIZE, width, height, frame_size, 0, 0,
+                         os.getpid(), zlib.crc32(bytes(frame_size)))
+        segment = _created[name] = cls(shm, owner=True)
+        return segment
+
+    @classmethod
+    def attach(cls, name):
+        """Map an existing segment (raises FileNotFoundError if it doesn't exist)."""
+        if name in _created and _created[name]._shm is not None:
+            return _created[name]  # ours; mapping it again would confuse the resource tracker
+        return cls(_attach_untracked(name), owner=False)
+
+    @property
+    def seq(self):
+        return SEQ.unpack_from(self._buf, SEQ_OFFSET)[0]
+
+    @property
+    def frames(self):
+        """Frames written so far."""
+        return self.seq // 2
+
+    # --- Writer (one per segment) ---
+
+    def write(self, frame):
+        """Publish a frame of packed RGB bytes. Returns its (even) sequence number."""
+        if len(frame) != self.frame_size:
+            raise ValueError(f"Frame must be {self.frame_size} bytes, got {len(frame)}")
+        seq = self.seq
+        if seq & 1:
+            seq += 1  # a previous writer died mid-frame
+        SEQ.pack_into(self._buf, SEQ_OFFSET, seq + 1)
+        self.frame[:] = frame
+        SEQ.pack_into(self._buf, TIMESTAMP_OFFSET, time.monotonic_ns())
+        CHECKSUM.pack_into(self._buf, CHECKSUM_OFFSET, zlib.crc32(frame))
+        SEQ.pack_into(self._buf, SEQ_OFFSET, seq + 2)
+        return seq + 2
+
+    # --- Readers ---
+
+    def begin_read(self):
+        """Sequence number to pass to end_read(), or None while a write is in progress."""
+        seq = self.seq
+        return None if seq & 1 else seq
+
+    def end_read(self, seq, frame=None):
+        """
+        True if the frame read since begin_read(seq) was not overwritten
+        meanwhile and matches its checksum. Pass the copy as `frame`, or
+        leave it None if the `frame` view was read in place.
+        """
+        checksum = CHECKSUM.unpack_from(self._buf, CHECKSUM_OFFSET)[0]
+        return zlib.crc32(self.frame if frame is None else frame) == checksum and self.seq == seq
+
+    def read(self, out=None, timeout=1.0):
+        """
+        Copy the latest frame into `out` (a bytearray, allocated if None).
+        Returns (seq, timestamp_ns, out); seq is 0 before the first frame.
+        Raises TimeoutError if no consistent frame shows up (the writer
+        died mid-frame).
+        """
+        if out is None:
+            out = bytearray(self.frame_size)
+        deadline = time.monotonic() + timeout
+        while True:
+            seq = self.begin_read()
+            if seq is not None:
+                out[:] = self.frame
+                timestamp = SEQ.unpack_from(self._buf, TIMESTAMP_OFFSET)[0]
+                if self.end_read(seq, out):
+                    return seq, timestamp, out
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Writer of '{self.name}' is stuck mid-frame")
+            time.sleep(0)
+
+    def wait_frame(self, after=0, out=None, timeout=None, poll=POLL_INTERVAL):
+        """
+        Block until a frame newer than `after` is available, then read it.
+        Polls every `poll` seconds (0 spins, for benchmarks). Returns
+        (seq, timestamp_ns, out), or None on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.seq <= after or self.seq & 1:
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(poll)
+        return self.read(out)
+
+    def close(self):
+        """Unmap the segment; the owner also unlinks it."""
+        if self._shm is None:
+            return
+        self.frame.release()
+        self._buf = None
+        self._shm.close()
+        if self.owner:
+            _created.pop(self.name, None)
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._shm = None
+
+    def get_metrics(self):
+        return {"name": self.name, "frames": self.frames}
@@ -0,0 +1,130 @@
+"""
+Frame pacing for the render loop, with frame-interval statistics.
+
+Two modes:
+  - "vsync": the display's update() blocks until the panel swaps buffers,
+    so the swap is the clock and the loop never sleeps on its own. The
+    adapter is told the target fps and shows each frame for a whole number
+    of refreshes (see DisplayInterface.sync_to_vsync).
+  - "sleep": the loop sleeps until absolute monotonic deadlines one frame
+    period apart, so a slow frame shortens the next sleep instead of
+    shifting every later frame.
+
+"auto" picks vsync when the display supports it. All timestamps are
+monotonic_ns() of the current clock (src/core/clock.py); intervals are measured between consecutive
+presents, which is what the viewer sees.
+"""
+
+from collections import deque
+
+from src.core.clock import get_clock
+from src.core.logger import get_logger
+
+log = get_logger()
+
+MODES = ('auto', 'vsync', 'sleep')
+STATS_WINDOW = 600  # frame intervals kept for percentiles (~20 s at 30 fps)
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class FrameStats:
+    """Rolling frame-interval statistics against a nominal period."""
+
+    def __init__(self, period_ns, window=STATS_WINDOW):
+        self.period_ns = period_ns
+        self.intervals = deque(maxlen=window)  # ns between consecutive presents
+        self.frames = 0
+        self.missed = 0      # periods that passed without a new frame
+        self._last = None
+
+    def record(self, now_ns):
+        self.frames += 1
+        if self._last is not None:
+            interval = now_ns - self._last
+            self.intervals.append(interval)
+            # An interval of ~2 periods means one vsync (or deadline) was missed
+            skipped = (interval + self.period_ns // 2) // self.period_ns - 1
+            if skipped > 0:
+                self.missed += skipped
+        self._last = now_ns
+
+    def restart(self):
+        """Forget the last present (e.g. after parking) so the gap isn't counted."""
+        self._last = None
+
+    def get_metrics(self):
+        metrics = {"frames": self.frames, "missed_frames": self.missed}
+        if not self.intervals:
+            return metrics
+        ordered = sorted(self.intervals)
+        deviation = sorted(abs(i - self.period_ns) for i in self.intervals)
+        mean = sum(ordered) / len(ordered)
+        metrics.update({
+            "fps": round(1e9 / mean, 2) if mean else None,
+            "interval_p50_ms": round(_percentile(ordered, 0.50) / 1e6, 3),
+            "interval_p99_ms": round(_percentile(ordered, 0.99) / 1e6, 3),
+            "interval_max_ms": round(ordered[-1] / 1e6, 3),
+            "jitter_p50_ms": round(_percentile(deviation, 0.50) / 1e6, 3),
+            "jitter_p99_ms": round(_percentile(deviation, 0.99) / 1e6, 3),
+        })
+        return metrics
+
+
+class FramePacer:
+    """
+    Paces the render loop. Call presented() right after display.update()
+    and wait() at the end of each frame.
+    """
+
+    def __init__(self, display, fps=30, mode='auto'):
+        if mode not in MODES:
+            raise ValueError(f"Unknown pacing mode '{mode}' (expected one of {', '.join(MODES)})")
+        self.fps = fps
+        vsync_period = display.sync_to_vsync(fps) if mode != 'sleep' else None
+        if mode == 'vsync' and vsync_period is None:
+            log.warning("Display has no vsync to lock to, pacing with sleep instead.")
+        self.mode = 'vsync' if vsync_period else 'sleep'
+        self.period_ns = vsync_period or round(1e9 / fps)
+        self.stats = FrameStats(self.period_ns)
+        self._deadline = None
+
+    def presented(self):
+        self.stats.record(get_clock().monotonic_ns())
+
+    def wait(self):
+        """Sleep until the next frame deadline (no-op with vsync pacing)."""
+        if self.mode == 'vsync':
+            return  # the next display.update() blocks until the swap
+        clock = get_clock()
+        now = clock.monotonic_ns()
+        if self._deadline is None:
+            self._deadline = now
+        self._deadline += self.period_ns
+        if self._deadline <= now:
+            # Behind schedule: catch up by at most one frame rather than
+            # bursting frames to make up for a long stall
+            if now - self._deadline > self.period_ns:
+                self._deadline = now
+            return
+        clock.sleep((self._deadline - now) / 1e9)
+
+    def restart(self):
+        """Resume after the loop was parked, without counting the gap."""
+        self._deadline = None
+        self.stats.restart()
+
+    def reset_stats(self):
+        """Start a fresh statistics window (e.g. when a benchmark begins measuring)."""
+        self.stats = FrameStats(self.period_ns)
+
+    def get_metrics(self):
+        metrics = {
+            "mode": self.mode,
+            "target_fps": self.fps,
+            "period_ms": round(self.period_ns / 1e6, 3),
+        }
+        metrics.update(self.stats.get_metrics())
+        return metrics
@@ -0,0 +1,460 @@
+"""
+GTFS transit data for a handful of watched stops.
+
+Static GTFS (a zip of CSV tables, tens of MB for the MTA subway) is
+compiled once into a small indexed SQLite file that holds only what the
+watched stops need: the stops themselves (and a parent station's
+platforms), their scheduled stop times, the trips and services behind
+those, and the route list. The zip is streamed row by row, so compiling
+never holds a whole table in memory. The store is cached under
+~/.cache/pixie/gtfs, keyed by the zip's size and mtime and the stop
+list; later starts just open it.
+
+GTFS-realtime feeds are protobuf FeedMessages. TripUpdateReader walks
+the wire format directly (no protobuf dependency) one FeedEntity at a
+time straight off the HTTP response. An entity whose bytes don't
+contain any watched stop id is skipped without decoding, so a feed of
+thousands of trips costs little more than reading it:
+
+    store = open_store("google_transit.zip", ["127"])
+    reader = TripUpdateReader(store.watched, resolve=store.scheduled_time)
+    with open_feed(url) as stream:
+        arrivals = reader.read(stream)
+"""
+
+import csv
+import hashlib
+import io
+import os
+import re
+import sqlite3
+import time
+import urllib.request
+import zipfile
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from src.core.clock import get_clock
+from src.core.logger import get_logger
+
+log = get_logger()
+
+SCHEMA_VERSION = 1
+MAX_ENTITY_BYTES = 1 << 20   # larger entities mean a corrupt or non-GTFS-rt feed
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE stops (stop_id TEXT PRIMARY KEY, name TEXT, parent TEXT) WITHOUT ROWID;
+CREATE TABLE routes (route_id TEXT PRIMARY KEY, short_name TEXT, color TEXT, text_color TEXT) WITHOUT ROWID;
+CREATE TABLE trips (trip_id TEXT PRIMARY KEY, route_id TEXT, service_id TEXT, headsign TEXT) WITHOUT ROWID;
+CREATE TABLE stop_times (stop_id TEXT, arrival INTEGER, trip_id TEXT,
+                         PRIMARY KEY (stop_id, arrival, trip_id)) WITHOUT ROWID;
+CREATE INDEX stop_times_trip ON stop_times (trip_id, stop_id);
+CREATE TABLE calendar (service_id TEXT PRIMARY KEY, days INTEGER, start TEXT, end TEXT) WITHOUT ROWID;
+CREATE TABLE calendar_dates (date TEXT, service_id TEXT, added INTEGER,
+                             PRIMARY KEY (date, service_id)) WITHOUT ROWID;
+"""
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+Arrival = namedtuple('Arrival', 'time stop_id route_id trip_id realtime')
+Route = namedtuple('Route', 'short_name color text_color')
+
+
+def _seconds(hms):
+    """'25:10:00' -> seconds after the service day's midnight (may exceed 24h)."""
+    h, m, s = hms.strip().split(':')
+    return int(h) * 3600 + int(m) * 60 + int(s)
+
+
+def _hex_color(value, default):
+    value = (value or '').strip().lstrip('#')
+    try:
+        return (int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16)) if len(value) == 6 else default
+    except ValueError:
+        return default
+
+
+def _rows(zf, name, *columns):
+    """Yield the requested columns of a GTFS table, streamed from the zip."""
+    if name not in zf.namelist():
+        return
+    with zf.open(name) as raw:
+        reader = csv.reader(io.TextIOWrapper(raw, encoding='utf-8-sig', newline=''))
+        header = [h.strip() for h in next(reader, [])]
+        index = [header.index(c) if c in header else None for c in columns]
+        for row in reader:
+            yield [row[i] if i is not None and i < len(row) else '' for i in index]
+
+
+def compile_static(zip_path, stop_ids, db_path):
+    """
+    Build the SQLite store at `db_path` from a GTFS zip, keeping only
+    `stop_ids` (plus the platforms of any parent station among them).
+    Writes to a temp file first, so a failed compile leaves no store.
+    """
+    tmp = f"{db_path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    db = sqlite3.connect(tmp)
+    try:
+        db.executescript(SCHEMA)
+        wanted = set(stop_ids)
+        with zipfile.ZipFile(zip_path) as zf:
+            stops = [(sid, name, parent) for sid, name, parent in _rows(zf, 'stops.txt', 'stop_id', 'stop_name',
+                                                                        'parent_station')
+                     if sid in wanted or parent in wanted]
+            db.executemany("INSERT INTO stops VALUES (?, ?, ?)", stops)
+            watched = {s[0] for s in stops}
+
+            # The big table: only the rows at watched stops survive
+            trip_ids = set()
+            times = []
+            for trip_id, stop_id, arrival, departure in _rows(zf, 'stop_times.txt', 'trip_id', 'stop_id',
+                                                              'arrival_time', 'departure_time'):
+                if stop_id in watched and (arrival or departure):
+                    times.append((stop_id, _seconds(arrival or departure), trip_id))
+                    trip_ids.add(trip_id)
+            db.executemany("INSERT OR IGNORE INTO stop_times VALUES (?, ?, ?)", times)
+            del times
+
+            services = set()
+            trips = []
+            for trip_id, route_id, service_id, headsign in _rows(zf, 'trips.txt', 'trip_id', 'route_id',
+                                                                 'service_id', 'trip_headsign'):
+                if trip_id in trip_ids:
+                    trips.append((trip_id, route_id, service_id, headsign))
+                    services.add(service_id)
+            db.executemany("INSERT INTO trips VALUES (?, ?, ?, ?)", trips)
+
+            # Routes are few; keep them all so realtime-only trips still get a name and color
+            db.executemany("INSERT OR REPLACE INTO routes VALUES (?, ?, ?, ?)",
+                           _rows(zf, 'routes.txt', 'route_id', 'route_short_name', 'route_color',
+                                 'route_text_color'))
+            calendar = []
+            for row in _rows(zf, 'calendar.txt', 'service_id', *WEEKDAYS, 'start_date', 'end_date'):
+                if row[0] in services:
+                    days = sum(1 << i for i, flag in enumerate(row[1:8]) if flag.strip() == '1')
+                    calendar.append((row[0], days, row[8], row[9]))
+            db.executemany("INSERT INTO calendar VALUES (?, ?, ?, ?)", calendar)
+            db.executemany("INSERT OR REPLACE INTO calendar_dates VALUES (?, ?, ?)",
+                           ((day, sid, int(kind == '1'))
+                            for sid, day, kind in _rows(zf, 'calendar_dates.txt', 'service_id', 'date',
+                                                        'exception_type')
+                            if sid in services))
+        db.executemany("INSERT INTO meta VALUES (?, ?)",
+                       [('schema', str(SCHEMA_VERSION)), ('source', os.path.abspath(zip_path)),
+                        ('stops', ','.join(sorted(wanted)))])
+        db.commit()
+        db.execute("VACUUM")
+    except BaseException:
+        db.close()
+        os.remove(tmp)
+        raise
+    db.close()
+    os.replace(tmp, db_path)
+
+
+def fetch_static(url, cache_dir, max_age_days=7, timeout=60):
+    """Download a GTFS zip into cache_dir unless a copy younger than max_age_days is there."""
+    path = os.path.join(os.path.expanduser(cache_dir), os.path.basename(url.split('?')[0]) or 'gtfs.zip')
+    try:
+        if (time.time() - os.path.getmtime(path)) < max_age_days * 86400:
+            return path
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    log.info(f"Downloading GTFS static data from {url}")
+    with urllib.request.urlopen(url, timeout=timeout) as response, open(tmp, 'wb') as f:
+        while True:
+            chunk = response.read(1 << 16)
+            if not chunk:
+                break
+            f.write(chunk)
+    os.replace(tmp, path)
+    return path
+
+
+def open_store(zip_path, stop_ids, cache_dir="~/.cache/pixie/gtfs"):
+    """The compiled store for these stops, compiling it first if the zip or stop list changed."""
+    cache_dir = os.path.expanduser(cache_dir)
+    st = os.stat(zip_path)
+    key = f"{SCHEMA_VERSION}|{os.path.abspath(zip_path)}|{st.st_size}|{st.st_mtime_ns}|{','.join(sorted(stop_ids))}"
+    stem = os.path.splitext(os.path.basename(zip_path))[0]
+    db_path = os.path.join(cache_dir, f"{stem}-{hashlib.sha1(key.encode()).hexdigest()[:16]}.sqlite")
+    if not os.path.exists(db_path):
+        os.makedirs(cache_dir, exist_ok=True)
+        started = time.monotonic()
+        compile_static(zip_path, stop_ids, db_path)
+        log.info(f"Compiled GTFS store for {len(stop_ids)} stops in "
+                 f"{time.monotonic() - started:.1f}s ({os.path.getsize(db_path)} bytes)")
+        for name in os.listdir(cache_dir):  # older compiles of the same zip
+            if name.startswith(f"{stem}-") and name.endswith('.sqlite') and name != os.path.basename(db_path):
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                except OSError:
+                    pass
+    return GtfsStore(db_path)
+
+
+class GtfsStore:
+    """Read-only queries against a compiled store. Use from one thread at a time."""
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self.stops = {sid: (name, parent) for sid, name, parent in self.db.execute("SELECT * FROM stops")}
+        self.watched = frozenset(self.stops)
+        self.routes = {rid: Route(short or rid, _hex_color(color, (120, 120, 120)),
+                                  _hex_color(text, (255, 255, 255)))
+                       for rid, short, color, text in self.db.execute("SELECT * FROM routes")}
+        self._services = {}  # date -> set of service_ids running that day
+
+    def close(self):
+        self.db.close()
+
+    def size(self):
+        return os.path.getsize(self.path)
+
+    def stop_name(self, stop_id):
+        name, parent = self.stops.get(stop_id, (None, ''))
+        return name or (parent and self.stop_name(parent)) or stop_id
+
+    def headsign(self, trip_id):
+        row = self.db.execute("SELECT headsign FROM trips WHERE trip_id = ?", (trip_id,)).fetchone()
+        return row[0] if row else None
+
+    def services_on(self, day):
+        """The service_ids running on a date (calendar plus calendar_dates exceptions)."""
+        services = self._services.get(day)
+        if services is None:
+            ymd = day.strftime('%Y%m%d')
+            services = {sid for sid, in self.db.execute(
+                "SELECT service_id FROM calendar WHERE days & ? AND start <= ? AND end >= ?",
+                (1 << day.weekday(), ymd, ymd))}
+            for sid, added in self.db.execute("SELECT service_id, added FROM calendar_dates WHERE date = ?", (ymd,)):
+                (services.add if added else services.discard)(sid)
+            if len(self._services) > 4:
+                self._services.clear()
+            self._services[day] = services
+        return services
+
+    def scheduled_time(self, trip_id, stop_id, start_date=None):
+        """Scheduled epoch time of a trip at a stop on its service date ('YYYYMMDD', default today)."""
+        row = self.db.execute("SELECT arrival FROM stop_times WHERE trip_id = ? AND stop_id = ?",
+                              (trip_id, stop_id)).fetchone()
+        if row is None:
+            return None
+        if start_date:
+            day = datetime.strptime(start_date, '%Y%m%d')
+        else:
+            day = datetime.combine(get_clock().now().date(), datetime.min.time())
+        return (day + timedelta(seconds=row[0])).timestamp()
+
+    def scheduled(self, now, horizon):
+        """
+        Timetabled arrivals at the watched stops from `now` (a naive local
+        datetime) to `horizon` seconds later, including trips of yesterday's
+        service day that run past midnight.
+        """
+        arrivals = []
+        marks = ','.join('?' * len(self.watched))
+        for days_back in (1, 0):
+            day = now.date() - timedelta(days=days_back)
+            services = self.services_on(day)
+            if not services:
+                continue
+            midnight = datetime.combine(day, datetime.min.time())
+            start = int((now - midnight).total_seconds())
+            rows = self.db.execute(
+                f"SELECT st.stop_id, st.arrival, st.trip_id, t.route_id, t.service_id FROM stop_times st "
+                f"JOIN trips t ON t.trip_id = st.trip_id "
+                f"WHERE st.stop_id IN ({marks}) AND st.arrival BETWEEN ? AND ?",
+                (*self.watched, start, start + horizon))
+            base = midnight.timestamp()
+            arrivals.extend(Arrival(base + seconds, stop_id, route_id, trip_id, False)
+                            for stop_id, seconds, trip_id, route_id, service_id in rows
+                            if service_id in services)
+        arrivals.sort()
+        return arrivals
+
+
+# --- GTFS-realtime wire format -------------------------------------------------
+
+def _varint(buf, pos):
+    result = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7f) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _fields(buf):
+    """Yield (field number, wire type, value) for one message; bytes fields as memoryviews."""
+    pos, end = 0, len(buf)
+    while pos < end:
+        tag, pos = _varint(buf, pos)
+        wire = tag & 7
+        if wire == 0:
+            value, pos = _varint(buf, pos)
+        elif wire == 2:
+            size, pos = _varint(buf, pos)
+            value = buf[pos:pos + size]
+            pos += size
+        elif wire == 1:
+            value, pos = int.from_bytes(buf[pos:pos + 8], 'little'), pos + 8
+        elif wire == 5:
+            value, pos = int.from_bytes(buf[pos:pos + 4], 'little'), pos + 4
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire}")
+        yield tag >> 3, wire, value
+
+
+def _signed(value):
+    """Protobuf int32/int64 varints are two's complement in 64 bits."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _read_varint(stream):
+    result = shift = 0
+    while True:
+        b = stream.read(1)
+        if not b:
+            if shift:
+                raise ValueError("Truncated varint")
+            return None
+        result |= (b[0] & 0x7f) << shift
+        if not b[0] & 0x80:
+            return result
+        shift += 7
+
+
+def _read_exact(stream, size):
+    chunks, remaining = [], size
+    while remaining:
+        chunk = stream.read(remaining)
+        if not chunk:
+            raise ValueError(f"Feed truncated ({size - remaining} of {size} bytes)")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return chunks[0] if len(chunks) == 1 else b''.join(chunks)
+
+
+class TripUpdateReader:
+    """
+    Reads GTFS-realtime FeedMessages and keeps only the arrivals at
+    `stop_ids`. `resolve(trip_id, stop_id, start_date)`, if given, turns
+    delay-only updates into times (e.g. GtfsStore.scheduled_time).
+    Counters accumulate over every read() for metrics.
+    """
+
+    def __init__(self, stop_ids, resolve=None):
+        self.watched = frozenset(stop_ids)
+        # One C-level scan tells whether a message mentions any watched stop
+        self._mentions = re.compile(b'|'.join(re.escape(s.encode()) for s in sorted(self.watched))).search
+        self.resolve = resolve
+        self.timestamp = None       # header timestamp of the last feed read
+        self.bytes = 0
+        self.entities = 0
+        self.skipped = 0            # entities never decoded: no watched stop id in them
+
+    def read(self, stream):
+        """Arrivals at watched stops in one feed, read from a binary stream."""
+        arrivals = []
+        while True:
+            tag = _read_varint(stream)
+            if tag is None:
+                break
+            field, wire = tag >> 3, tag & 7
+            if wire != 2:
+                if wire == 0:
+                    _read_varint(stream)
+                else:
+                    _read_exact(stream, {1: 8, 5: 4}[wire])
+                continue
+            size = _read_varint(stream)
+            if size > MAX_ENTITY_BYTES:
+                raise ValueError(f"Feed message field of {size} bytes")
+            data = _read_exact(stream, size)
+            self.bytes += size
+            if field == 1:      # FeedHeader
+                self.timestamp = next((v for f, w, v in _fields(memoryview(data)) if f == 3 and w == 0), None)
+            elif field == 2:    # FeedEntity
+                self.entities += 1
+                if not self._mentions(data):
+                    self.skipped += 1
+                    continue
+                for f, w, value in _fields(memoryview(data)):
+                    if f == 3 and w == 2:   # trip_update
+                        self._trip_update(value, arrivals)
+        return arrivals
+
+    def _trip_update(self, buf, arrivals):
+        trip_id = route_id = start_date = None
+        updates = []
+        for f, w, value in _fields(buf):
+            if f == 1 and w == 2:           # TripDescriptor
+                for tf, tw, tv in _fields(value):
+                    if tf == 1 and tw == 2:
+                        trip_id = bytes(tv).decode()
+                    elif tf == 3 and tw == 2:
+                        start_date = bytes(tv).decode()
+                    elif tf == 4 and tw == 0 and tv == 3:   # CANCELED
+                        return
+                    elif tf == 5 and tw == 2:
+                        route_id = bytes(tv).decode()
+            elif f == 2 and w == 2:         # StopTimeUpdate
+                updates.append(value)
+        mentions = self._mentions
+        for buf in updates:
+            if not mentions(buf):
+                continue
+            stop_id = None
+            arrival = departure = None
+            skipped = False
+            for f, w, value in _fields(buf):
+                if f == 4 and w == 2:
+                    stop_id = bytes(value).decode()
+                elif f == 2 and w == 2:
+                    arrival = value
+                elif f == 3 and w == 2:
+                    departure = value
+                elif f == 5 and w == 0 and value == 1:  # SKIPPED
+                    skipped = True
+            if skipped or stop_id not in self.watched:
+                continue
+            when = self._event_time(arrival if arrival is not None else departure, trip_id, stop_id, start_date)
+            if when is not None:
+                arrivals.append(Arrival(when, stop_id, route_id, trip_id, True))
+
+    def _event_time(self, event, trip_id, stop_id, start_date):
+        if event is None:
+            return None
+        delay = None
+        for f, w, value in _fields(event):
+            if f == 2 and w == 0:
+                return _signed(value)
+            if f == 1 and w == 0:
+                delay = _signed(value)
+        if delay is not None and self.resolve is not None and trip_id:
+            scheduled = self.resolve(trip_id, stop_id, start_date)
+            if scheduled is not None:
+                return scheduled + delay
+        return None
+
+    def get_metrics(self):
+        return {"bytes": self.bytes, "entities": self.entities, "entities_skipped": self.skipped,
+                "feed_timestamp": self.timestamp}
+
+
+def open_feed(source, headers=None, timeout=10):
+    """A binary stream for a feed URL or, for offline fixtures, a local file path."""
+    if source.startswith(('http://', 'https://')):
+        request = urllib.request.Request(source, headers=dict(headers or {}))
+        return urllib.request.urlopen(request, timeout=timeout)
+    if source.startswith('file://'):
+        source = source[len('file://'):]
+    return open(os.path.expanduser(source), 'rb', buffering=1 << 16)
@@ -0,0 +1,244 @@
+"""
+Dev-mode hot reload.
+
+`run_pixie.py --dev` runs Pixie in a child process with a HotReloader.
+When a module under src/apps changes, the reloader submits a 'reload'
+command: the render loop re-imports the module at the next frame
+boundary and re-creates the apps defined in it (see
+AppManager.reload_modules), while the web server and emulator sockets
+stay up. Any other change (core modules, templates, static files,
+src/apps/__init__.py) exits the child with RESTART_EXIT_CODE and the
+parent starts a fresh one.
+
+Changes are detected with inotify on Linux, falling back to watchdog and
+then to polling file mtimes elsewhere.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from pathlib import Path
+
+from src.core.logger import get_logger
+
+log = get_logger()
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+WATCH_DIR = PROJECT_ROOT / 'src'
+APPS_PACKAGE = 'src.apps'
+WATCHED_SUFFIXES = ('.py', '.html', '.css', '.js')
+RESTART_EXIT_CODE = 3
+DEBOUNCE = 0.05     # seconds to collect the rest of an editor's save burst
+POLL_INTERVAL = 0.5
+
+# inotify(7)
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_ISDIR = 0x40000000
+_IN_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_MODIFY
+_EVENT = struct.Struct('iIII')
+
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1  # noqa: B018 - raises AttributeError off Linux
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher:
+    """Blocks until watched files under `root` change; returns their paths."""
+
+    def __init__(self, root=WATCH_DIR, suffixes=WATCHED_SUFFIXES):
+        self.root = Path(root)
+        self.suffixes = suffixes
+        self._fd = None
+        self._dirs = {}          # inotify watch descriptor -> directory
+        self._observer = None
+        self._mtimes = None
+        libc = _load_libc()
+        if libc is not None and self._start_inotify(libc):
+            self.backend = 'inotify'
+        elif self._start_watchdog():
+            self.backend = 'watchdog'
+        else:
+            self.backend = 'poll'
+            self._mtimes = self._scan()
+
+    def _start_inotify(self, libc):
+        fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if fd < 0:
+            return False
+        self._libc, self._fd = libc, fd
+        for directory, _, _ in os.walk(self.root):
+            self._add_watch(directory)
+        return True
+
+    def _add_watch(self, directory):
+        if '__pycache__' in directory:
+            return
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _IN_MASK)
+        if wd >= 0:
+            self._dirs[wd] = directory
+
+    def _start_watchdog(self):
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return False
+        self._pending = set()
+        self._event = threading.Event()
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                for path in (event.src_path, getattr(event, 'dest_path', '')):
+                    if path:
+                        watcher._pending.add(path)
+                watcher._event.set()
+
+        self._observer = Observer()
+        self._observer.schedule(Handler(), str(self.root), recursive=True)
+        self._observer.start()
+        return True
+
+    def _wanted(self, path):
+        return path.endswith(self.suffixes) and '__pycache__' not in path
+
+    def _read_inotify(self, timeout):
+        changed = set()
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return changed
+        data = os.read(self._fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    self._add_watch(path)
+            else:
+                changed.add(path)
+        return changed
+
+    def _scan(self):
+        mtimes = {}
+        for directory, _, files in os.walk(self.root):
+            for f in files:
+                path = os.path.join(directory, f)
+                if self._wanted(path):
+                    try:
+                        mtimes[path] = os.stat(path).st_mtime_ns
+                    except OSError:
+                        pass
+        return mtimes
+
+    def _collect(self, timeout):
+        if self.backend == 'inotify':
+            return self._read_inotify(timeout)
+        if self.backend == 'watchdog':
+            if not self._event.wait(timeout):
+                return set()
+            self._event.clear()
+            changed, self._pending = self._pending, set()
+            return changed
+        time.sleep(POLL_INTERVAL if timeout is None else min(timeout, POLL_INTERVAL))
+        mtimes = self._scan()
+        changed = {p for p in mtimes.keys() | self._mtimes.keys()
+                   if mtimes.get(p) != self._mtimes.get(p)}
+        self._mtimes = mtimes
+        return changed
+
+    def wait(self):
+        """Block until at least one watched file changes; returns the changed paths."""
+        while True:
+            changed = {p for p in self._collect(None) if self._wanted(p)}
+            if changed:
+                # Editors often write, rename and touch in quick succession
+                changed |= {p for p in self._collect(DEBOUNCE) if self._wanted(p)}
+                return changed
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+
+
+def module_for_path(path):
+    """'src/apps/clock_app.py' -> 'src.apps.clock_app' (None outside the project)."""
+    try:
+        rel = Path(path).resolve().relative_to(PROJECT_ROOT)
+    except ValueError:
+        return None
+    parts = rel.with_suffix('').parts
+    if parts[-1] == '__init__':
+        parts = parts[:-1]
+    return '.'.join(parts)
+
+
+def reloadable_modules(paths):
+    """
+    The app modules to reload in place for `paths`, or None if any change
+    needs a full restart.
+    """
+    modules = set()
+    for path in paths:
+        module = module_for_path(path)
+        if (module is None or not path.endswith('.py') or module == APPS_PACKAGE
+                or not module.startswith(APPS_PACKAGE + '.')):
+            return None
+        modules.add(module)
+    return modules
+
+
+class HotReloader:
+    """Watches src/ in the dev-mode child and reloads app modules in place."""
+
+    def __init__(self, app_manager, root=WATCH_DIR):
+        self.app_manager = app_manager
+        self.root = root
+        self.reloads = 0
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True, name='hot-reload').start()
+
+    def _run(self):
+        watcher = FileWatcher(self.root)
+        log.info(f"Hot reload: watching {self.root} ({watcher.backend})")
+        while True:
+            changed = watcher.wait()
+            modules = reloadable_modules(changed)
+            if modules is None:
+                names = ', '.join(sorted(os.path.relpath(p, PROJECT_ROOT) for p in changed))
+                log.info(f"Hot reload: {names} changed, restarting.")
+                watcher.close()
+                os._exit(RESTART_EXIT_CODE)
+            start = time.monotonic()
+            command = self.app_manager.submit('reload', modules=sorted(modules))
+            command.wait(5.0)
+            if command.error is not None:
+                log.error(f"Hot reload failed, still running the old code: {command.error}")
+                continue
+            self.reloads += 1
+            log.info(f"Hot reloaded {', '.join(sorted(modules))} "
+                     f"in {(time.monotonic() - start) * 1000:.0f}ms")
@@ -0,0 +1,138 @@
+"""
+Palette-indexed framebuffer.
+
+Most frames (clock faces, text, QR codes, pixel art, palette-mapped
+effects) use fewer than 256 colors. An IndexedBuffer keeps them as one
+byte per pixel plus a 256-entry packed RGB palette: a third of the size
+of packed RGB, and rewriting the palette recolors the whole frame
+(color cycling) without touching a pixel.
+
+Apps draw into an IndexedBuffer and hand it to display.blit_indexed().
+Adapters expand it to RGB only at present time, so the color LUT is
+applied to the 256 palette entries instead of every pixel. The network
+adapter ships the index plane and palette changes as they are.
+"""
+
+from src.core.matrix_buffer import clamp_color
+
+PALETTE_SIZE = 256
+PALETTE_BYTES = PALETTE_SIZE * 3
+
+
+def expand(indices, palette):
+    """Packed RGB for an index plane and a packed 256-entry palette (C-level translates)."""
+    if len(palette) != PALETTE_BYTES:
+        raise ValueError(f"Palette must be {PALETTE_BYTES} bytes, got {len(palette)}")
+    palette = bytes(palette)
+    indices = bytes(indices)
+    out = bytearray(len(indices) * 3)
+    out[0::3] = indices.translate(palette[0::3])
+    out[1::3] = indices.translate(palette[1::3])
+    out[2::3] = indices.translate(palette[2::3])
+    return out
+
+
+def diff_palette(old, new):
+    """Changed entries of `new` relative to `old`, as packed (index, r, g, b) records."""
+    out = bytearray()
+    for i in range(0, PALETTE_BYTES, 3):
+        if old[i:i + 3] != new[i:i + 3]:
+            out.append(i // 3)
+            out += new[i:i + 3]
+    return bytes(out)
+
+
+def apply_palette_diff(palette, diff):
+    """Apply diff_palette() records to a bytearray palette in place."""
+    for i in range(0, len(diff), 4):
+        o = diff[i] * 3
+        palette[o:o + 3] = diff[i + 1:i + 4]
+
+
+class IndexedBuffer:
+    """
+    One palette index per pixel (row-major) and a packed RGB palette.
+    set_pixel() by color allocates palette entries on first use; apps that
+    animate the palette set it explicitly and draw with set_index().
+    """
+
+    def __init__(self, width=64, height=64, palette=None):
+        self.width = width
+        self.height = height
+        self.indices = bytearray(width * height)
+        self.palette = bytearray(PALETTE_BYTES)
+        self._colors = {}       # (r, g, b) -> index, for set_pixel() by color
+        self._allocated = 0
+        if palette is not None:
+            self.set_palette(palette)
+
+    # --- Palette ---
+
+    def set_palette(self, palette, start=0):
+        """Overwrite palette entries from `start` with packed RGB bytes."""
+        palette = bytes(palette)
+        if len(palette) % 3 or start * 3 + len(palette) > PALETTE_BYTES:
+            raise ValueError("Palette must be packed RGB with at most 256 entries")
+        self.palette[start * 3:start * 3 + len(palette)] = palette
+        self._allocated = max(self._allocated, start + len(palette) // 3)
+        self._colors = {}
+        for i in range(self._allocated - 1, -1, -1):
+            self._colors[tuple(self.palette[i * 3:i * 3 + 3])] = i
+
+    def set_color(self, index, r, g, b):
+        self.set_palette(bytes((r, g, b)), start=index)
+
+    def rotate_palette(self, start=0, end=PALETTE_SIZE, step=1):
+        """Cycle entries start..end-1 by `step` (color cycling)."""
+        span = self.palette[start * 3:end * 3]
+        shift = (step % (end - start)) * 3
+        self.set_palette(span[shift:] + span[:shift], start=start)
+
+    def color_index(self, r, g, b):
+        """Palette index for a color, allocating an entry if needed."""
+        color = (r, g, b)
+        index = self._colors.get(color)
+        if index is None:
+            color = clamp_color(r, g, b)
+            index = self._colors.get(color)
+        if index is None:
+            if self._allocated >= PALETTE_SIZE:
+                raise ValueError("Palette is full (256 colors)")
+            index = self._allocated
+            self._allocated += 1
+            self.palette[index * 3:index * 3 + 3] = bytes(color)
+            self._colors[color] = index
+        return index
+
+    # --- Pixels ---
+
+    def set_index(self, x, y, index):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.indices[y * self.width + x] = index
+
+    def set_pixel(self, x, y, r, g, b):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.indices[y * self.width + x] = self.color_index(r, g, b)
+
+    def get_index(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.indices[y * self.width + x]
+        return 0
+
+    def get_pixel(self, x, y):
+        i = self.get_index(x, y) * 3
+        return tuple(self.palette[i:i + 3])
+
+    def fill_index(self, index):
+        self.indices[:] = bytes((index,)) * len(self.indices)
+
+    def fill(self, r, g, b):
+        self.fill_index(self.color_index(r, g, b))
+
+    def clear(self):
+        """Set every pixel to index 0 (the background entry)."""
+        self.indices[:] = bytes(len(self.indices))
+
+    def get_bytes(self):
+        """Expand to packed RGB (row-major)."""
+        return expand(self.indices, self.palette)
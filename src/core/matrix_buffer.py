@@ -1,29 +1,62 @@
+def clamp_color(r, g, b):
+    """Coerce a color to ints in 0-255 (float math, fades that overshoot)."""
+    return (max(0, min(255, int(r))), max(0, min(255, int(g))), max(0, min(255, int(b))))
+
+
 class MatrixBuffer:
     """
     Holds the state of the matrix pixels.
+    Pixels are stored as packed RGB bytes in row-major order so whole
+    frames can be copied in and out with a single slice assignment.
     """
-    def __init__(self, width=64, height=64):
+    def __init__(self, width=64, height=64, pixels=None):
         self.width = width
         self.height = height
-        # Initialize buffer with (0, 0, 0)
-        self.buffer = [[(0, 0, 0) for _ in range(height)] for _ in range(width)]
+        self.frame_size = width * height * 3
+        # Initialize buffer with (0, 0, 0), unless backed by external
+        # memory (e.g. a shared memory segment)
+        self.pixels = pixels if pixels is not None else bytearray(self.frame_size)
 
     def set_pixel(self, x, y, r, g, b):
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.buffer[x][y] = (r, g, b)
+            i = (y * self.width + x) * 3
+            try:
+                self.pixels[i] = r
+                self.pixels[i + 1] = g
+                self.pixels[i + 2] = b
+            except (TypeError, ValueError):
+                # Only off-range or float colors pay for the conversion
+                self.pixels[i:i + 3] = bytes(clamp_color(r, g, b))
 
     def get_pixel(self, x, y):
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.buffer[x][y]
+            i = (y * self.width + x) * 3
+            return tuple(self.pixels[i:i + 3])
         return (0, 0, 0)
 
     def fill(self, r, g, b):
-        for x in range(self.width):
-            for y in range(self.height):
-                self.buffer[x][y] = (r, g, b)
+        try:
+            color = bytes((r, g, b))
+        except (TypeError, ValueError):
+            color = bytes(clamp_color(r, g, b))
+        self.pixels[:] = color * (self.width * self.height)
 
     def clear(self):
-        self.fill(0, 0, 0)
+        self.pixels[:] = bytes(self.frame_size)
+
+    def blit(self, frame):
+        """Copy a full frame of packed RGB bytes into the buffer."""
+        if len(frame) != self.frame_size:
+            raise ValueError(f"Frame must be {self.frame_size} bytes, got {len(frame)}")
+        self.pixels[:] = frame
+
+    def get_bytes(self):
+        """Return the packed RGB bytes (row-major, no copy)."""
+        return self.pixels
 
     def get_buffer(self):
-        return self.buffer
+        """Return the buffer as a column-major [x][y] -> (r, g, b) grid."""
+        p = self.pixels
+        w = self.width
+        return [[tuple(p[(y * w + x) * 3:(y * w + x) * 3 + 3]) for y in range(self.height)]
+                for x in range(w)]
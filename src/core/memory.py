@@ -0,0 +1,204 @@
+"""
+Per-app memory accounting and budgets.
+
+The Pi Zero 2 W has 512 MB shared with the GPU; an app whose image or
+font caches grow without bound eventually pushes the device into swap
+or the OOM killer. The AppManager brackets each app's start(),
+prefetch(), update() and draw() calls with tracemalloc readings and
+charges the net change to that app, and records the process RSS change
+around start(). Apps running in worker processes (--isolate) are charged
+their worker's RSS instead, which is exact.
+
+Figures are approximate in-process: tracemalloc is process-wide, so
+allocations another thread makes during an app's call are charged to
+that app too.
+
+Budgets come from the 'memory' config section:
+    {"tracemalloc": null, "default_budget_mb": 0,
+     "budgets_mb": {"weather": 16}, "check_interval": 5, "suspend_after": 30}
+An app over budget is asked to trim_caches(); if it is still over after
+suspend_after seconds it is stopped and unloaded (see AppManager).
+
+tracemalloc slows every allocation in the process several times over, so
+it is only started when needed: "tracemalloc": null (the default) traces
+only if some budget is set, since in-process apps are measured that way.
+Without it, only RSS figures are kept. Accounting as a whole is off
+unless the 'memory' section exists.
+"""
+
+import os
+import tracemalloc
+
+from src.core.clock import get_clock
+from src.core.logger import get_logger
+
+log = get_logger()
+
+DEFAULTS = {
+    "tracemalloc": None,         # None: only when a budget is configured
+    "default_budget_mb": 0,      # 0 = no budget
+    "budgets_mb": {},
+    "check_interval": 5.0,
+    "suspend_after": 30.0,
+}
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def read_rss(pid='self'):
+    """Resident set size in bytes, or None where /proc is unavailable."""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _AppUsage:
+    __slots__ = ('traced', 'peak', 'start_rss', 'trims', 'over_since', 'suspended_at')
+
+    def __init__(self):
+        self.traced = 0           # net bytes allocated by the app's calls
+        self.peak = 0
+        self.start_rss = None     # RSS change across load + start()
+        self.trims = 0
+        self.over_since = None
+        self.suspended_at = None
+
+
+class MemoryAccountant:
+    def __init__(self, tracemalloc_enabled=True, default_budget_mb=0, budgets_mb=None,
+                 check_interval=5.0, suspend_after=30.0):
+        self.default_budget = int(default_budget_mb * 1024 * 1024)
+        self.budgets = {name: int(mb * 1024 * 1024) for name, mb in (budgets_mb or {}).items()}
+        self.check_interval = check_interval
+        self.suspend_after = suspend_after
+        self.suspensions = 0
+        self._usage = {}
+        self._next_check = 0.0
+        self.tracing = tracemalloc_enabled
+        if tracemalloc_enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(1)  # one frame per trace keeps the overhead down
+
+    @classmethod
+    def from_config(cls, section):
+        opts = dict(DEFAULTS)
+        opts.update(section or {})
+        tracing = opts["tracemalloc"]
+        if tracing is None:
+            tracing = bool(opts["default_budget_mb"] or any(opts["budgets_mb"].values()))
+        return cls(tracemalloc_enabled=bool(tracing),
+                   default_budget_mb=float(opts["default_budget_mb"]),
+                   budgets_mb=opts["budgets_mb"],
+                   check_interval=float(opts["check_interval"]),
+                   suspend_after=float(opts["suspend_after"]))
+
+    def _get(self, name):
+        usage = self._usage.get(name)
+        if usage is None:
+            usage = self._usage[name] = _AppUsage()
+        return usage
+
+    def begin(self):
+        """Reading to pass to end() after an app call."""
+        return tracemalloc.get_traced_memory()[0] if self.tracing else 0
+
+    def end(self, name, before):
+        """Charge the traced-memory change since begin() to `name`."""
+        if not self.tracing:
+            return
+        usage = self._get(name)
+        usage.traced = max(0, usage.traced + tracemalloc.get_traced_memory()[0] - before)
+        if usage.traced > usage.peak:
+            usage.peak = usage.traced
+
+    def begin_start(self):
+        return self.begin(), read_rss()
+
+    def end_start(self, name, before):
+        """Like end(), also recording the RSS change across start()."""
+        traced, rss = before
+        self.end(name, traced)
+        after = read_rss()
+        if rss is not None and after is not None:
+            self._get(name).start_rss = after - rss
+
+    def forget(self, name):
+        """Reset an app's figures (it was unloaded)."""
+        usage = self._usage.pop(name, None)
+        if usage is not None and usage.suspended_at is not None:
+            self._get(name).suspended_at = usage.suspended_at
+
+    def budget_for(self, name):
+        return self.budgets.get(name, self.default_budget)
+
+    def used_by(self, name, app):
+        """Bytes charged to an app: its worker's RSS if isolated, else traced memory."""
+        pid = getattr(app, 'worker_pid', None)
+        if pid is not None:
+            rss = read_rss(pid)
+            if rss is not None:
+                return rss
+        usage = self._usage.get(name)
+        return usage.traced if usage else 0
+
+    def check(self, apps, now=None):
+        """
+        Compare loaded apps against their budgets. Returns a list of
+        ('trim' | 'suspend', name) actions for the AppManager to carry out.
+        """
+        now = now or get_clock().monotonic()
+        if now < self._next_check:
+            return []
+        self._next_check = now + self.check_interval
+        actions = []
+        for name, app in apps.items():
+            budget = self.budget_for(name)
+            if not budget:
+                continue
+            usage = self._get(name)
+            if self.used_by(name, app) <= budget:
+                usage.over_since = None
+                continue
+            if usage.over_since is None:
+                usage.over_since = now
+                actions.append(('trim', name))
+            elif now - usage.over_since >= self.suspend_after:
+                usage.over_since = None
+                actions.append(('suspend', name))
+        return actions
+
+    def trimmed(self, name):
+        self._get(name).trims += 1
+
+    def suspended(self, name):
+        self._get(name).suspended_at = get_clock().time()
+        self.suspensions += 1
+
+    def get_metrics(self, apps):
+        metrics = {"tracemalloc": self.tracing, "suspensions": self.suspensions}
+        rss = read_rss()
+        if rss is not None:
+            metrics["rss_kb"] = rss // 1024
+        if self.tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            metrics["traced_kb"] = current // 1024
+            metrics["traced_peak_kb"] = peak // 1024
+        per_app = {}
+        for name in set(apps) | set(self._usage):
+            usage = self._usage.get(name) or _AppUsage()
+            entry = {"trims": usage.trims}
+            if name in apps:
+                entry["used_kb"] = self.used_by(name, apps[name]) // 1024
+            if self.tracing:
+                entry["peak_kb"] = usage.peak // 1024
+            if usage.start_rss is not None:
+                entry["start_rss_kb"] = usage.start_rss // 1024
+            budget = self.budget_for(name)
+            if budget:
+                entry["budget_kb"] = budget // 1024
+            if usage.suspended_at is not None:
+                entry["suspended_at"] = usage.suspended_at
+            per_app[name] = entry
+        metrics["apps"] = per_app
+        return metrics
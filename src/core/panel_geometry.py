@@ -0,0 +1,138 @@
+"""
+Panel geometry for single, chained and parallel-chain matrix builds.
+
+Apps draw on one virtual canvas (display.width x display.height). The
+hardware driver exposes a "native" canvas where chained panels extend
+to the right and parallel chains stack downwards. PanelGeometry
+precomputes a remap table from native pixels to virtual pixels so a
+whole frame can be rearranged in a single gather at present time.
+
+Arrangements (before rotation):
+  row         chained panels left -> right, parallel chains top -> bottom
+  column      chained panels top -> bottom, parallel chains left -> right
+  serpentine  each chain folds into rows of `panels_per_row`, every
+              other row running right -> left with panels upside down
+              (the usual "U" cable layout)
+
+Rotation (0, 90, 180, 270) is applied clockwise to the whole canvas.
+"""
+
+ARRANGEMENTS = ('row', 'column', 'serpentine')
+ROTATIONS = (0, 90, 180, 270)
+
+
+class PanelGeometry:
+    def __init__(self, panel_width=64, panel_height=64, chain_length=1, parallel=1,
+                 rotation=0, arrangement='row', panels_per_row=None):
+        if arrangement not in ARRANGEMENTS:
+            raise ValueError(f"Unknown panel arrangement '{arrangement}'")
+        if rotation not in ROTATIONS:
+            raise ValueError(f"Rotation must be one of {ROTATIONS}, got {rotation}")
+
+        self.panel_width = panel_width
+        self.panel_height = panel_height
+        self.chain_length = chain_length
+        self.parallel = parallel
+        self.rotation = rotation
+        self.arrangement = arrangement
+        self.panels_per_row = panels_per_row or chain_length
+        if arrangement == 'serpentine' and chain_length % self.panels_per_row:
+            raise ValueError("chain_length must be a multiple of panels_per_row")
+
+        # Native canvas as seen by the driver
+        self.native_width = panel_width * chain_length
+        self.native_height = panel_height * parallel
+
+        # Layout canvas (panels arranged, not yet rotated)
+        if arrangement == 'row':
+            self._layout_size = (self.native_width, self.native_height)
+        elif arrangement == 'column':
+            self._layout_size = (panel_width * parallel, panel_height * chain_length)
+        else:
+            rows_per_chain = chain_length // self.panels_per_row
+            self._layout_size = (panel_width * self.panels_per_row,
+                                 panel_height * rows_per_chain * parallel)
+
+        lw, lh = self._layout_size
+        if rotation in (90, 270):
+            self.width, self.height = lh, lw
+        else:
+            self.width, self.height = lw, lh
+
+        self.remap = self._build_remap()
+        self.is_identity = self.remap == list(range(len(self.remap)))
+        self._remap_array = None
+        if not self.is_identity:
+            # numpy is only needed (and only imported, which is slow on a
+            # Pi Zero) when the frame actually has to be rearranged
+            try:
+                import numpy as np
+                self._remap_array = np.array(self.remap, dtype=np.intp)
+            except ImportError:
+                pass
+
+    @classmethod
+    def from_config(cls, section):
+        """Build a geometry from the 'display' config section."""
+        keys = ('panel_width', 'panel_height', 'chain_length', 'parallel',
+                'rotation', 'arrangement', 'panels_per_row')
+        return cls(**{k: section[k] for k in keys if k in section})
+
+    def virtual_to_native(self, x, y):
+        """Map a virtual canvas coordinate to the driver's native canvas."""
+        lw, lh = self._layout_size
+        if self.rotation == 90:
+            lx, ly = y, lh - 1 - x
+        elif self.rotation == 180:
+            lx, ly = lw - 1 - x, lh - 1 - y
+        elif self.rotation == 270:
+            lx, ly = lw - 1 - y, x
+        else:
+            lx, ly = x, y
+
+        pw, ph = self.panel_width, self.panel_height
+        col, ix = divmod(lx, pw)
+        row, iy = divmod(ly, ph)
+        flipped = False
+
+        if self.arrangement == 'row':
+            chain_pos, chain = col, row
+        elif self.arrangement == 'column':
+            chain_pos, chain = row, col
+        else:
+            rows_per_chain = self.chain_length // self.panels_per_row
+            chain, fold = divmod(row, rows_per_chain)
+            if fold % 2:
+                chain_pos = fold * self.panels_per_row + (self.panels_per_row - 1 - col)
+                flipped = True
+            else:
+                chain_pos = fold * self.panels_per_row + col
+
+        if flipped:
+            ix, iy = pw - 1 - ix, ph - 1 - iy
+        return chain_pos * pw + ix, chain * ph + iy
+
+    def _build_remap(self):
+        """remap[native pixel index] = virtual pixel index."""
+        remap = [0] * (self.native_width * self.native_height)
+        for y in range(self.height):
+            for x in range(self.width):
+                nx, ny = self.virtual_to_native(x, y)
+                remap[ny * self.native_width + nx] = y * self.width + x
+        return remap
+
+    def to_native(self, pixels):
+        """
+        Rearrange a packed RGB virtual frame into native driver order.
+        Returns the input unchanged for single-panel, unrotated builds.
+        """
+        if self.is_identity:
+            return pixels
+        if self._remap_array is not None:
+            import numpy as np
+            src = np.frombuffer(pixels, dtype=np.uint8).reshape(-1, 3)
+            return src[self._remap_array].tobytes()
+        out = bytearray(len(pixels))
+        for native, virtual in enumerate(self.remap):
+            out[native * 3:native * 3 + 3] = pixels[virtual * 3:virtual * 3 + 3]
+        return out
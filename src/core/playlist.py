@@ -0,0 +1,105 @@
+"""
+Playlist: rotate through apps on configurable durations and time-of-day
+rules.
+
+AppManager owns the rotation state and asks the playlist what comes
+next. Shortly before an entry's time is up, the next usable entry is
+chosen and its app prewarmed (BaseApp.prefetch() and start() on a helper
+thread), so by the switch its data is already loaded. Entries whose app
+is missing, recently failed or reports stale data are skipped.
+
+Config section 'playlist':
+    {
+      "enabled": true,
+      "entries": [
+        {"app": "clock", "duration": 30},
+        {"app": "weather", "duration": 20, "transition": "slide"},
+        {"app": "fire", "duration": 60, "hours": "19:00-23:00"}
+      ],
+      "prefetch_seconds": 5,
+      "manual_hold": 300
+    }
+"""
+
+from src.core.clock import get_clock
+from src.core.schedule import parse_minute
+from src.core.transitions import KINDS as TRANSITION_KINDS
+
+
+class PlaylistEntry:
+    def __init__(self, app, duration=30.0, transition=None, hours=None, days=None):
+        if duration <= 0:
+            raise ValueError("Playlist entry duration must be positive")
+        if transition is not None and transition not in TRANSITION_KINDS:
+            raise ValueError(f"Unknown transition '{transition}'")
+        self.app = app
+        self.duration = float(duration)
+        self.transition = transition
+        self.hours = hours
+        self.days = days  # weekday numbers, Monday = 0
+        self._window = None
+        if hours:
+            start, end = hours.split('-')
+            self._window = (parse_minute(start), parse_minute(end))
+
+    @classmethod
+    def from_config(cls, data):
+        return cls(data['app'], duration=data.get('duration', 30.0), transition=data.get('transition'),
+                   hours=data.get('hours'), days=data.get('days'))
+
+    def to_config(self):
+        data = {"app": self.app, "duration": self.duration}
+        for key in ('transition', 'hours', 'days'):
+            if getattr(self, key) is not None:
+                data[key] = getattr(self, key)
+        return data
+
+    def active_at(self, when):
+        """Whether the entry's time-of-day / weekday rules allow it at `when`."""
+        if self.days is not None and when.weekday() not in self.days:
+            return False
+        if self._window is None:
+            return True
+        start, end = self._window
+        minute = when.hour * 60 + when.minute
+        if start <= end:
+            return start <= minute < end
+        return minute >= start or minute < end  # window wraps past midnight
+
+
+class Playlist:
+    def __init__(self, entries, enabled=True, prefetch_seconds=5.0, manual_hold=300.0):
+        self.entries = entries
+        self.enabled = enabled
+        self.prefetch_seconds = prefetch_seconds
+        self.manual_hold = manual_hold
+
+    @classmethod
+    def from_config(cls, section):
+        return cls([PlaylistEntry.from_config(e) for e in section.get('entries', [])],
+                   enabled=section.get('enabled', True),
+                   prefetch_seconds=section.get('prefetch_seconds', 5.0),
+                   manual_hold=section.get('manual_hold', 300.0))
+
+    def to_config(self):
+        return {
+            "enabled": self.enabled,
+            "entries": [e.to_config() for e in self.entries],
+            "prefetch_seconds": self.prefetch_seconds,
+            "manual_hold": self.manual_hold,
+        }
+
+    def next_entry(self, after, usable, when=None):
+        """
+        First entry after index `after` (wrapping around) that is active
+        now and for which usable(entry) is true. Returns (index, entry)
+        or None if nothing qualifies.
+        """
+        when = when or get_clock().now()
+        count = len(self.entries)
+        for step in range(1, count + 1):
+            index = (after + step) % count
+            entry = self.entries[index]
+            if entry.active_at(when) and usable(entry):
+                return index, entry
+        return None
@@ -0,0 +1,43 @@
+"""
+Minimal PNG encoder for packed RGB frames (no PIL on the render path).
+
+Writes 8-bit truecolor, non-interlaced PNGs with filter type 0 on every
+row: LED frames are mostly flat areas and repeated rows, which zlib
+compresses well without per-row filter selection.
+"""
+
+import struct
+import zlib
+
+SIGNATURE = b'\x89PNG\r\n\x1a\n'
+MAX_SCALE = 16
+
+
+def _chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def _scale_row(row, scale):
+    """Repeat every 3-byte pixel of a packed RGB row `scale` times."""
+    return b''.join(row[i:i + 3] * scale for i in range(0, len(row), 3))
+
+
+def encode_png(rgb, width, height, scale=1, level=6):
+    """
+    Encode packed row-major RGB bytes as a PNG, optionally upscaled by an
+    integer factor (nearest neighbour, so pixels stay crisp).
+    """
+    if len(rgb) != width * height * 3:
+        raise ValueError(f"Expected {width * height * 3} bytes for {width}x{height}, got {len(rgb)}")
+    if not 1 <= scale <= MAX_SCALE:
+        raise ValueError(f"scale must be between 1 and {MAX_SCALE}")
+    rgb = bytes(rgb)
+    stride = width * 3
+    raw = bytearray()
+    for y in range(height):
+        row = rgb[y * stride:(y + 1) * stride]
+        line = b'\x00' + (_scale_row(row, scale) if scale > 1 else row)
+        raw += line * scale
+    header = struct.pack('>IIBBBBB', width * scale, height * scale, 8, 2, 0, 0, 0)
+    return b''.join((SIGNATURE, _chunk(b'IHDR', header),
+                     _chunk(b'IDAT', zlib.compress(bytes(raw), level)), _chunk(b'IEND', b'')))
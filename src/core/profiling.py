@@ -0,0 +1,166 @@
+"""
+On-device profiling for the render loop (served at /api/profile).
+
+Two modes:
+  sample    A statistical sampler: the requesting thread wakes at a fixed
+            low rate and records the stacks of the selected threads via
+            sys._current_frames(). Nothing runs inside the profiled
+            threads, so the loop is never paused.
+  cprofile  Deterministic profiling of the render thread only. cProfile is
+            enabled and disabled from inside the loop via the command
+            queue; overhead is higher, but call counts are exact.
+
+Only one profile runs at a time, and durations are capped.
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+MAX_SECONDS = 30.0
+DEFAULT_INTERVAL = 0.01  # 100 Hz
+MAX_CONCURRENT = 1
+
+_slots = threading.BoundedSemaphore(MAX_CONCURRENT)
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+class profile_slot:
+    """Context manager that claims the single profiling slot or raises ProfilerBusy."""
+
+    def __enter__(self):
+        if not _slots.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already running")
+        return self
+
+    def __exit__(self, *exc):
+        _slots.release()
+        return False
+
+
+def _frame_label(code, cache):
+    label = cache.get(code)
+    if label is None:
+        module = os.path.splitext(os.path.basename(code.co_filename))[0]
+        label = cache[code] = f"{module}:{code.co_name}"
+    return label
+
+
+class SampleProfile:
+    """Aggregated stack samples: collapsed stacks and a function table."""
+
+    def __init__(self, stacks, samples, interval, seconds):
+        self.stacks = stacks      # Counter of "thread;outer;...;leaf" -> hits
+        self.samples = samples
+        self.interval = interval
+        self.seconds = seconds
+
+    def collapsed(self):
+        """Collapsed-stack text, one 'frame;frame;... count' line per stack (flamegraph.pl input)."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def top(self, n=20):
+        """Functions ranked by self samples, with inclusive ('total') samples."""
+        self_hits, total_hits = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')[1:]  # drop the thread label
+            if not frames:
+                continue
+            self_hits[frames[-1]] += count
+            for frame in set(frames):
+                total_hits[frame] += count
+        hits = sum(self.stacks.values()) or 1
+        return [{
+            "function": name,
+            "self": count,
+            "total": total_hits[name],
+            "self_pct": round(count * 100 / hits, 1),
+            "total_pct": round(total_hits[name] * 100 / hits, 1),
+        } for name, count in self_hits.most_common(n)]
+
+
+def sample_threads(threads, seconds, interval=DEFAULT_INTERVAL):
+    """
+    Sample the stacks of `threads` ({ident: label}) every `interval`
+    seconds for `seconds`, from the calling thread.
+    """
+    stacks = Counter()
+    cache = {}
+    samples = 0
+    start = time.monotonic()
+    deadline = start + seconds
+    next_tick = start
+    while True:
+        frames = sys._current_frames()
+        for ident, label in threads.items():
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code, cache))
+                frame = frame.f_back
+            stack.append(label)
+            stacks[';'.join(reversed(stack))] += 1
+        del frames
+        samples += 1
+        next_tick += interval
+        if next_tick >= deadline:
+            break
+        time.sleep(max(0.0, next_tick - time.monotonic()))
+    return SampleProfile(stacks, samples, interval, time.monotonic() - start)
+
+
+def select_threads(render_thread_id, which='render'):
+    """
+    Map thread idents to labels for sampling. `which` is 'render',
+    'web' (render + HTTP worker threads) or 'all'.
+    """
+    me = threading.get_ident()
+    threads = {}
+    for t in threading.enumerate():
+        if t.ident == me:
+            continue
+        if t.ident == render_thread_id:
+            threads[t.ident] = 'render'
+        elif which == 'all' or (which == 'web' and t.name.startswith(('http', 'Thread-'))):
+            threads[t.ident] = t.name
+    return threads
+
+
+def cprofile_top(profiler, n=20):
+    """Top-N functions by own time from a finished cProfile.Profile."""
+    stats = pstats.Stats(profiler)
+    total = stats.total_tt or 1e-9
+    rows = sorted(stats.stats.items(), key=lambda kv: kv[1][2], reverse=True)[:n]
+    return [{
+        "function": f"{os.path.splitext(os.path.basename(filename))[0]}:{name}:{line}",
+        "calls": nc,
+        "self_ms": round(tt * 1000, 2),
+        "total_ms": round(ct * 1000, 2),
+        "self_pct": round(tt * 100 / total, 1),
+    } for (filename, line, name), (cc, nc, tt, ct, callers) in rows]
+
+
+def profile_render_thread(app_manager, seconds, wait=2.0):
+    """
+    cProfile the render thread for `seconds`. The loop itself enables and
+    disables the profiler (cProfile only sees the thread it runs on).
+    """
+    profiler = cProfile.Profile()
+    cmd = app_manager.submit('profile', key=('profile', id(profiler), True), profiler=profiler, enable=True)
+    if not cmd.wait(wait) or cmd.status == 'failed':
+        raise RuntimeError("Render loop did not start the profiler")
+    try:
+        time.sleep(seconds)
+    finally:
+        app_manager.submit('profile', key=('profile', id(profiler), False),
+                           profiler=profiler, enable=False).wait(wait)
+    return profiler
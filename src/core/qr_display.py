@@ -1,5 +1,5 @@
 """
-QR Code renderer for the 64x64 LED matrix.
+QR Code renderer for the LED matrix.
 Pure Python implementation — no external libraries needed.
 Supports WiFi QR codes for the provisioning flow.
 """
@@ -49,8 +49,8 @@ def generate_qr_matrix(data):
 
 def draw_qr_on_display(display, data, color=(255, 255, 255)):
     """
-    Render a QR code centered on the 64x64 display.
-    Scales the QR modules to fit with a quiet zone.
+    Render a QR code centered on the display.
+    Scales the QR modules to fit the shorter side with a quiet zone.
     """
     grid = generate_qr_matrix(data)
 
@@ -60,10 +60,11 @@ def draw_qr_on_display(display, data, color=(255, 255, 255)):
         return
 
     qr_size = len(grid)
-    display_size = 64
+    width, height = display.width, display.height
+    display_size = min(width, height)
 
     # Calculate scale: leave 2px quiet zone on each side
-    usable = display_size - 4  # 60px usable
+    usable = display_size - 4  # 60px usable on a 64x64 panel
     scale = usable // qr_size
 
     if scale < 1:
@@ -71,12 +72,12 @@ def draw_qr_on_display(display, data, color=(255, 255, 255)):
 
     # Center the QR code
     total_qr_px = qr_size * scale
-    offset_x = (display_size - total_qr_px) // 2
-    offset_y = (display_size - total_qr_px) // 2
+    offset_x = (width - total_qr_px) // 2
+    offset_y = (height - total_qr_px) // 2
 
     # Draw white background behind QR (needed for scanning)
-    for y in range(max(0, offset_y - 2), min(display_size, offset_y + total_qr_px + 2)):
-        for x in range(max(0, offset_x - 2), min(display_size, offset_x + total_qr_px + 2)):
+    for y in range(max(0, offset_y - 2), min(height, offset_y + total_qr_px + 2)):
+        for x in range(max(0, offset_x - 2), min(width, offset_x + total_qr_px + 2)):
             display.set_pixel(x, y, 255, 255, 255)
 
     # Draw QR modules (black on white)
@@ -88,14 +89,15 @@ def draw_qr_on_display(display, data, color=(255, 255, 255)):
                     for dx in range(scale):
                         px = offset_x + qx * scale + dx
                         py = offset_y + qy * scale + dy
-                        if 0 <= px < display_size and 0 <= py < display_size:
+                        if 0 <= px < width and 0 <= py < height:
                             display.set_pixel(px, py, r, g, b)
 
 
 def _draw_wifi_icon(display, color):
     """Fallback: draw a simple WiFi icon when QR library isn't available."""
     r, g, b = color
-    cx, cy = 32, 40
+    w, h = display.width, display.height
+    cx, cy = w // 2, h * 40 // 64
 
     # WiFi arcs (concentric quarter circles)
     import math
@@ -104,7 +106,7 @@ def _draw_wifi_icon(display, color):
             rad = math.radians(angle + 225)  # Top-facing arc
             x = int(cx + radius * math.cos(rad))
             y = int(cy + radius * math.sin(rad))
-            if 0 <= x < 64 and 0 <= y < 64:
+            if 0 <= x < w and 0 <= y < h:
                 display.set_pixel(x, y, r, g, b)
 
     # Center dot
@@ -0,0 +1,162 @@
+"""
+Display schedule: auto-dimming and sleep (display off) windows.
+
+A schedule is a list of daily time windows, each either dimming the
+display to a brightness level or turning it off. The resulting
+brightness curve is precomputed once per minute of the day (with eased
+ramps into dimmed windows), so evaluating it every frame is a list
+lookup. An optional ambient light sensor scales the scheduled level.
+
+Config section 'schedule':
+    {
+      "windows": [
+        {"start": "22:00", "end": "23:30", "brightness": 30},
+        {"start": "23:30", "end": "07:00", "mode": "off"}
+      ],
+      "transition_minutes": 15,
+      "sensor": {"type": "file", "path": "/sys/bus/iio/devices/iio:device0/in_illuminance_input"}
+    }
+"""
+
+import math
+from abc import ABC, abstractmethod
+
+from src.core.clock import get_clock
+from src.core.logger import get_logger
+
+log = get_logger()
+
+MINUTES_PER_DAY = 24 * 60
+OFF = None  # curve value meaning "display off"
+
+
+def parse_minute(hhmm):
+    """'HH:MM' -> minute of the day."""
+    hours, minutes = hhmm.split(':')
+    return (int(hours) * 60 + int(minutes)) % MINUTES_PER_DAY
+
+
+class LightSensor(ABC):
+    """Pluggable ambient light sensor."""
+
+    @abstractmethod
+    def read_lux(self):
+        """Return the current illuminance in lux, or None if unavailable."""
+        pass
+
+
+class FileLightSensor(LightSensor):
+    """Reads lux from a file, e.g. an IIO sysfs node (BH1750, TSL2561...)."""
+
+    def __init__(self, path, scale=1.0):
+        self.path = path
+        self.scale = scale
+
+    def read_lux(self):
+        try:
+            with open(self.path) as f:
+                return float(f.read().strip()) * self.scale
+        except (OSError, ValueError):
+            return None
+
+
+class AmbientDimmer:
+    """
+    Maps lux to a brightness factor (0-1) on a log scale, using a
+    precomputed table indexed by round(log10(lux) * 10).
+    """
+
+    def __init__(self, sensor, dark_lux=1.0, bright_lux=500.0, min_factor=0.1):
+        self.sensor = sensor
+        lo, hi = math.log10(dark_lux), math.log10(bright_lux)
+        self._table_offset = int(round(lo * 10))
+        size = int(round(hi * 10)) - self._table_offset + 1
+        self._table = [min_factor + (1 - min_factor) * i / max(1, size - 1) for i in range(size)]
+        self.last_lux = None
+
+    def factor(self):
+        lux = self.sensor.read_lux()
+        self.last_lux = lux
+        if lux is None:
+            return 1.0
+        index = int(round(math.log10(max(lux, 1e-3)) * 10)) - self._table_offset
+        return self._table[max(0, min(len(self._table) - 1, index))]
+
+
+class DisplaySchedule:
+    def __init__(self, windows, default_brightness=100, transition_minutes=15, dimmer=None):
+        self.windows = windows
+        self.default_brightness = default_brightness
+        self.transition_minutes = transition_minutes
+        self.dimmer = dimmer
+        self.curve = self._build_curve()
+
+    @classmethod
+    def from_config(cls, section):
+        dimmer = None
+        sensor_config = section.get('sensor')
+        if sensor_config and sensor_config.get('type') == 'file':
+            dimmer = AmbientDimmer(
+                FileLightSensor(sensor_config['path'], sensor_config.get('scale', 1.0)),
+                dark_lux=sensor_config.get('dark_lux', 1.0),
+                bright_lux=sensor_config.get('bright_lux', 500.0),
+                min_factor=sensor_config.get('min_factor', 0.1),
+            )
+        return cls(section.get('windows', []),
+                   default_brightness=section.get('default_brightness', 100),
+                   transition_minutes=section.get('transition_minutes', 15),
+                   dimmer=dimmer)
+
+    def _build_curve(self):
+        """Brightness (0-100, or OFF) for every minute of the day."""
+        steps = [self.default_brightness] * MINUTES_PER_DAY
+        for window in self.windows:  # later windows win where they overlap
+            start, end = parse_minute(window['start']), parse_minute(window['end'])
+            level = OFF if window.get('mode') == 'off' else int(window.get('brightness', 0))
+            length = (end - start) % MINUTES_PER_DAY or MINUTES_PER_DAY
+            for i in range(length):
+                steps[(start + i) % MINUTES_PER_DAY] = level
+
+        # Ease into each change between two brightness levels; on/off is a hard edge
+        curve = list(steps)
+        ramp = self.transition_minutes
+        if ramp > 0:
+            for m in range(MINUTES_PER_DAY):
+                before, after = steps[m - 1], steps[m]
+                if before == after or before is OFF or after is OFF:
+                    continue
+                for i in range(ramp):
+                    t = (i + 1) / (ramp + 1)
+                    eased = (1 - math.cos(math.pi * t)) / 2
+                    idx = (m - ramp + i) % MINUTES_PER_DAY
+                    if steps[idx] == before and curve[idx] is not OFF:
+                        curve[idx] = round(before + (after - before) * eased)
+        return curve
+
+    def level_at(self, when=None):
+        """Scheduled brightness (0-100) at `when`, or OFF."""
+        when = when or get_clock().now()
+        level = self.curve[when.hour * 60 + when.minute]
+        if level is OFF or self.dimmer is None:
+            return level
+        return round(level * self.dimmer.factor())
+
+    def seconds_until_change(self, when=None):
+        """Seconds until the curve next changes value, or None if it never does."""
+        return self._seconds_until(lambda level: level, when)
+
+    def seconds_until_power_change(self, when=None):
+        """
+        Seconds until the display next switches on or off (brightness ramps
+        don't count), or None if it never does.
+        """
+        return self._seconds_until(lambda level: level is OFF, when)
+
+    def _seconds_until(self, key, when):
+        when = when or get_clock().now()
+        minute = when.hour * 60 + when.minute
+        current = key(self.curve[minute])
+        for ahead in range(1, MINUTES_PER_DAY):
+            if key(self.curve[(minute + ahead) % MINUTES_PER_DAY]) != current:
+                return ahead * 60 - when.second - when.microsecond / 1e6
+        return None
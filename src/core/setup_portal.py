@@ -1,9 +1,11 @@
 import threading
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, jsonify, request
 import logging
 import os
 
 from src.core.logger import get_logger
+from src.core.web_assets import get_assets
+from src.core.web_server import make_server
 
 log = get_logger()
 
@@ -13,7 +15,6 @@ werkzeug_log.setLevel(logging.ERROR)
 
 _SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 _TEMPLATE_DIR = os.path.join(_SRC_DIR, 'web', 'templates')
-_STATIC_DIR = os.path.join(_SRC_DIR, 'web', 'static')
 
 
 class SetupPortal:
@@ -27,7 +28,12 @@ class SetupPortal:
         self._connected = threading.Event()
         self._result_ip = None
 
-        self.app = Flask(__name__, template_folder=_TEMPLATE_DIR, static_folder=_STATIC_DIR)
+        self.app = Flask(__name__, template_folder=_TEMPLATE_DIR, static_folder=None)
+
+        # Render the page once up front; phones on the AP link get it gzipped
+        self.assets = get_assets()
+        self.assets.register_static_route(self.app)
+        self.assets.add_page('setup', self.app, 'setup.html', ap_ssid=self.wifi.ap_ssid)
 
         # Routes
         self.app.add_url_rule('/', 'setup', self.setup_page)
@@ -53,7 +59,7 @@ class SetupPortal:
     # --- Portal Pages ---
 
     def setup_page(self):
-        return render_template('setup.html', ap_ssid=self.wifi.ap_ssid)
+        return self.assets.page_response('setup')
 
     # --- API Endpoints ---
 
@@ -114,13 +120,16 @@ class SetupPortal:
         """
         log.info(f"Setup portal starting on port {port}...")
 
-        server_thread = threading.Thread(
-            target=lambda: self.app.run(
+        from src.core.config import get_config
+        server = make_server(self.app, '0.0.0.0', port, get_config().section('web'))
+        if server is not None:
+            target = server.serve_forever
+        else:
+            target = lambda: self.app.run(  # noqa: E731
                 host='0.0.0.0', port=port,
                 debug=False, use_reloader=False, load_dotenv=False
-            ),
-            daemon=True
-        )
+            )
+        server_thread = threading.Thread(target=target, daemon=True)
         server_thread.start()
         log.info(f"Setup portal ready at http://192.168.4.1:{port}/")
 
@@ -0,0 +1,84 @@
+"""
+Faster-than-real-time runs of the whole render loop.
+
+run_simulation() installs a VirtualClock (src/core/clock.py) and runs
+AppManager.run_loop() against a headless display. Every frame-pacing
+sleep and every parked wait advances virtual time instead of waiting, so
+a day of playlist rotation, sleep windows, fetch intervals and clock
+rollover takes as long as drawing its frames does. With the display
+off, time jumps straight to the next schedule change.
+
+The report doubles as a throughput benchmark of the frame loop:
+frames and simulated hours per wall-clock second.
+
+    python3 run_pixie.py --simulate 24 [--sim-start 2026-01-05T06:00] [--sim-fps 5]
+"""
+
+import time
+from collections import Counter
+
+from src.core.clock import SimulationEnded, VirtualClock, set_clock
+from src.core.logger import get_logger
+
+log = get_logger()
+
+
+class ScreenTime:
+    """Virtual seconds per active app (or 'off'), and the switches between them."""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.seconds = Counter()
+        self.switches = []  # (virtual seconds since start, app name or 'off')
+        self.elapsed = 0.0
+        self._showing = None
+
+    def __call__(self, step):
+        showing = 'off' if self.manager.display_off else self.manager.active_app_name
+        if showing != self._showing:
+            self.switches.append((round(self.elapsed, 3), showing))
+            self._showing = showing
+        self.seconds[showing] += step
+        self.elapsed += step
+
+
+def run_simulation(manager, hours, fps=30, start=None):
+    """
+    Run `manager` for `hours` of virtual time starting at `start` (a
+    datetime, default now). The manager must have an active app and a
+    display that doesn't block in update(). Returns a report dict.
+    """
+    seconds = hours * 3600
+    screen = ScreenTime(manager)
+    clock = VirtualClock(start, until=seconds, on_advance=screen)
+    previous = set_clock(clock)
+    log.info(f"Simulating {hours:g}h from {clock.now():%Y-%m-%d %H:%M} at {fps} fps")
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        manager.run_loop(fps=fps, pacing='sleep')
+    except SimulationEnded:
+        pass
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        if manager.active_app is not None:
+            try:
+                manager.active_app.stop()
+            except Exception as e:
+                log.error(f"Error stopping {manager.active_app_name}: {e}")
+        set_clock(previous)
+
+    simulated = clock.monotonic()
+    return {
+        "start": clock.start,
+        "simulated_hours": round(simulated / 3600, 3),
+        "fps": fps,
+        "frames": manager.frames_presented,
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(cpu, 3),
+        "simulated_hours_per_wall_second": round(simulated / 3600 / wall, 3) if wall else None,
+        "frames_per_wall_second": round(manager.frames_presented / wall, 1) if wall else None,
+        "parked_hours": round(manager.parked_seconds / 3600, 3),
+        "screen_time_hours": {name: round(s / 3600, 3) for name, s in screen.seconds.most_common()},
+        "switches": screen.switches,
+    }
@@ -0,0 +1,137 @@
+"""
+Cached PNG snapshots of the presented frame, for /api/snapshot.png.
+
+The render thread hands every presented frame to capture(), which only
+copies it while someone has asked for a snapshot recently and only bumps
+the content version when the pixels actually changed. PNGs are encoded
+once per (version, scale), so dashboards polling an unchanged frame cost
+a dict lookup, and wait_for_change() lets them block until the next
+change instead of polling at all.
+"""
+
+import os
+import threading
+import time
+
+from src.core.png import encode_png
+
+# Keep capturing for this long after the last request
+KEEP_ALIVE = 30.0
+# How long a request after an idle period waits for a fresh frame
+FRESH_TIMEOUT = 0.25
+# Longest a request may block in wait_for_change
+MAX_WAIT = 20.0
+# Concurrent long-polls; each one holds a web server worker
+MAX_WAITERS = 4
+
+
+class TooManyWaiters(Exception):
+    pass
+
+
+class SnapshotCache:
+    """Latest presented frame plus its encoded PNGs, versioned by content."""
+
+    def __init__(self, display):
+        self.display = display
+        self.width = display.width
+        self.height = display.height
+        self.version = 0
+        self.boot_id = os.urandom(4).hex()  # keeps ETags unique across restarts
+        self._frame = None
+        self._captures = 0
+        self._wanted_until = 0.0
+        self._png = {}  # scale -> PNG bytes of self.version
+        self._cond = threading.Condition()
+        self._waiters = 0
+        self.encodes = 0
+        self.hits = 0
+
+    # --- Render thread ---
+
+    def capture(self):
+        """Called after each display.update(); cheap when nobody is watching."""
+        if time.monotonic() > self._wanted_until:
+            return
+        frame = self.display.snapshot()
+        with self._cond:
+            self._captures += 1
+            if frame != self._frame:
+                self._frame = frame
+                self.version += 1
+                self._png.clear()
+            self._cond.notify_all()
+
+    # --- Web threads ---
+
+    def _want(self):
+        """Start (or keep) capturing; after an idle period wait for a fresh frame."""
+        now = time.monotonic()
+        idle = now > self._wanted_until
+        self._wanted_until = now + KEEP_ALIVE
+        if idle or self._frame is None:
+            captures = self._captures
+            self._cond.wait_for(lambda: self._captures != captures, FRESH_TIMEOUT)
+        if self._frame is None:
+            # Render loop parked or not running: read the display directly
+            self._frame = self.display.snapshot()
+            self.version += 1
+
+    def etag(self, version, scale):
+        return f'"{self.boot_id}-{version}-{scale}"'
+
+    def wait_for_change(self, since, timeout):
+        """
+        Block until the content version differs from `since` or `timeout`
+        passes. Returns the current version. Raises TooManyWaiters when
+        MAX_WAITERS requests are already waiting.
+        """
+        timeout = min(timeout, MAX_WAIT)
+        with self._cond:
+            if self._waiters >= MAX_WAITERS:
+                raise TooManyWaiters(f"{MAX_WAITERS} snapshot requests are already waiting")
+            self._want()
+            self._waiters += 1
+            try:
+                deadline = time.monotonic() + timeout
+                while self.version == since:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wanted_until = time.monotonic() + KEEP_ALIVE
+                    self._cond.wait(min(remaining, KEEP_ALIVE / 2))
+            finally:
+                self._waiters -= 1
+            return self.version
+
+    def current_version(self):
+        with self._cond:
+            self._want()
+            return self.version
+
+    def png(self, scale=1):
+        """Returns (version, PNG bytes) of the latest frame, encoding at most once per version."""
+        with self._cond:
+            self._want()
+            version, frame = self.version, self._frame
+            cached = self._png.get(scale)
+            if cached is not None:
+                self.hits += 1
+                return version, cached
+        # Encode outside the lock so the render thread never waits on zlib
+        data = encode_png(frame, self.width, self.height, scale)
+        with self._cond:
+            self.encodes += 1
+            if self.version == version:
+                self._png[scale] = data
+        return version, data
+
+    def get_metrics(self):
+        return {
+            "version": self.version,
+            "captures": self._captures,
+            "encodes": self.encodes,
+            "cache_hits": self.hits,
+            "waiters": self._waiters,
+            "capturing": time.monotonic() <= self._wanted_until,
+        }
@@ -0,0 +1,287 @@
+"""
+Sprites over a cached background, redrawn by dirty rectangles.
+
+Sprite sheets are decoded once into SpriteImages: packed RGB pixels plus
+a pre-baked transparency mask stored as the opaque runs of each row. A
+masked blit is then one slice copy per run (a C-level memmove) instead
+of a set_pixel() call and an alpha test per pixel.
+
+A SpriteScene keeps its own framebuffer. Each render() compares every
+sprite's position, image and visibility with what was drawn last time.
+Only the rectangles that changed are repaired: the cached background is
+copied back into them, then every sprite overlapping them is redrawn,
+clipped to them, in z order. When the changed area is a large share of
+the screen (most sprites moving), the whole frame is repainted instead,
+which is cheaper than clipping against many overlapping rectangles. The
+finished frame goes to the display with
+a single blit():
+
+    scene = SpriteScene(w, h, background=sky)
+    pet = scene.add(Sprite(sheet, x=10, y=40, fps=4))
+    ...
+    pet.x += 1
+    scene.render(t)
+    display.blit(scene.frame)
+"""
+
+GRID = 8  # px per spatial-hash cell when matching sprites to dirty rects
+# Above this share of the screen a full repaint is cheaper than repairing rects
+FULL_REDRAW_SHARE = 0.4
+
+
+class SpriteImage:
+    """One sprite frame: packed RGB pixels and its opaque runs per row."""
+
+    __slots__ = ('width', 'height', 'pixels', 'runs')
+
+    def __init__(self, width, height, pixels, opaque):
+        """`opaque(x, y)` -> bool decides the mask once, at load time."""
+        self.width = width
+        self.height = height
+        self.pixels = memoryview(bytes(pixels))
+        self.runs = []  # per row: [(x0, x1)] half-open opaque spans
+        for y in range(height):
+            row, start = [], None
+            for x in range(width + 1):
+                solid = x < width and opaque(x, y)
+                if solid and start is None:
+                    start = x
+                elif not solid and start is not None:
+                    row.append((start, x))
+                    start = None
+            self.runs.append(row)
+
+    @classmethod
+    def from_rgba(cls, rgba, width, height, threshold=128):
+        """From packed RGBA bytes; pixels with alpha below `threshold` are transparent."""
+        rgba = bytes(rgba)
+        rgb = bytearray(width * height * 3)
+        rgb[0::3], rgb[1::3], rgb[2::3] = rgba[0::4], rgba[1::4], rgba[2::4]
+        alpha = rgba[3::4]
+        return cls(width, height, rgb, lambda x, y: alpha[y * width + x] >= threshold)
+
+    @classmethod
+    def from_rows(cls, rows, palette):
+        """
+        From pixel-art strings, one character per pixel: `palette` maps
+        characters to (r, g, b); characters not in it are transparent.
+        """
+        height, width = len(rows), max(len(r) for r in rows)
+        rows = [r.ljust(width) for r in rows]
+        rgb = bytearray()
+        for row in rows:
+            for ch in row:
+                rgb += bytes(palette.get(ch, (0, 0, 0)))
+        return cls(width, height, rgb, lambda x, y: rows[y][x] in palette)
+
+    def recolor(self, mapping):
+        """A copy with colors swapped ({(r, g, b): (r, g, b)}), sharing the mask."""
+        rgb = bytearray(self.pixels)
+        for i in range(0, len(rgb), 3):
+            new = mapping.get(tuple(rgb[i:i + 3]))
+            if new is not None:
+                rgb[i:i + 3] = bytes(new)
+        image = SpriteImage.__new__(SpriteImage)
+        image.width, image.height, image.runs = self.width, self.height, self.runs
+        image.pixels = memoryview(bytes(rgb))
+        return image
+
+
+class SpriteSheet:
+    """The frames of one animation (or one image), decoded once."""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    @classmethod
+    def from_image(cls, path, frame_width, frame_height=None):
+        """Slice an image file (RGBA via Pillow) into frames, left to right, top to bottom."""
+        from PIL import Image
+        with Image.open(path) as img:
+            img = img.convert('RGBA')
+            frame_height = frame_height or img.height
+            frames = []
+            for top in range(0, img.height - frame_height + 1, frame_height):
+                for left in range(0, img.width - frame_width + 1, frame_width):
+                    tile = img.crop((left, top, left + frame_width, top + frame_height))
+                    frames.append(SpriteImage.from_rgba(tile.tobytes(), frame_width, frame_height))
+        return cls(frames)
+
+    @classmethod
+    def from_rows(cls, frames, palette):
+        """Frames as lists of pixel-art strings (see SpriteImage.from_rows)."""
+        return cls(SpriteImage.from_rows(rows, palette) for rows in frames)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        return self.frames[index]
+
+
+class Sprite:
+    """A positioned, optionally animated instance of a SpriteSheet."""
+
+    def __init__(self, sheet, x=0, y=0, z=0, fps=0, visible=True):
+        self.sheet = sheet if isinstance(sheet, SpriteSheet) else SpriteSheet([sheet])
+        self.x = x
+        self.y = y
+        self.z = z
+        self.fps = fps          # with fps, render(t) picks the frame from t
+        self.frame = 0
+        self.visible = visible
+
+    @property
+    def image(self):
+        return self.sheet.frames[self.frame % len(self.sheet.frames)]
+
+    def animate(self, t):
+        if self.fps:
+            self.frame = int(t * self.fps) % len(self.sheet.frames)
+
+
+def _intersect(a, b):
+    x0, y0 = max(a[0], b[0]), max(a[1], b[1])
+    x1, y1 = min(a[2], b[2]), min(a[3], b[3])
+    return (x0, y0, x1, y1) if x0 < x1 and y0 < y1 else None
+
+
+class SpriteScene:
+    """Composites sprites over a cached background into `frame` (packed RGB)."""
+
+    def __init__(self, width, height, background=None):
+        self.width = width
+        self.height = height
+        self.sprites = []
+        self.frame = bytearray(width * height * 3)
+        self.background = bytes(self.frame)
+        self._drawn = {}            # sprite -> (x0, y0, x1, y1, image) as last drawn
+        self._full_redraw = True
+        self.frames = 0
+        self.dirty_pixels = 0       # repaired over the last render()
+        self.full_redraws = 0
+        if background is not None:
+            self.set_background(background)
+
+    def set_background(self, background):
+        """Replace the background (packed RGB, or an (r, g, b) fill); repaints everything."""
+        if len(background) == 3:
+            background = bytes(background) * (self.width * self.height)
+        if len(background) != len(self.frame):
+            raise ValueError(f"Background must be {len(self.frame)} bytes, got {len(background)}")
+        self.background = bytes(background)
+        self._full_redraw = True
+
+    def add(self, sprite):
+        self.sprites.append(sprite)
+        self.sprites.sort(key=lambda s: s.z)  # stable: equal z keeps insertion order
+        return sprite
+
+    def remove(self, sprite):
+        self.sprites.remove(sprite)
+
+    def _placement(self, sprite):
+        image = sprite.image
+        x, y = int(sprite.x), int(sprite.y)
+        return (x, y, x + image.width, y + image.height, image)
+
+    def _dirty_rects(self):
+        screen = (0, 0, self.width, self.height)
+        if self._full_redraw:
+            self._drawn = {s: self._placement(s) for s in self.sprites if s.visible}
+            self._full_redraw = False
+            return [screen]
+        rects = []
+        current = {}
+        for sprite in self.sprites:
+            if sprite.visible:
+                current[sprite] = placed = self._placement(sprite)
+            else:
+                placed = None
+            before = self._drawn.get(sprite)
+            if placed == before:
+                continue
+            if before is not None and placed is not None and _intersect(before, placed):
+                # Moved a little: one rectangle around both positions
+                rects.append((min(before[0], placed[0]), min(before[1], placed[1]),
+                              max(before[2], placed[2]), max(before[3], placed[3])))
+                continue
+            rects.extend(r for r in (before, placed) if r is not None)
+        present = set(self.sprites)
+        rects.extend(before for sprite, before in self._drawn.items()
+                     if sprite not in present)  # removed from the scene
+        self._drawn = current
+        return [r for r in (_intersect(screen, r[:4]) for r in rects) if r]
+
+    def render(self, t=None):
+        """
+        Bring `frame` up to date (animating sprites with fps to time `t`).
+        Returns the repaired rectangles as (x0, y0, x1, y1).
+        """
+        if t is not None:
+            for sprite in self.sprites:
+                sprite.animate(t)
+        rects = self._dirty_rects()
+        self.frames += 1
+        if not rects:
+            self.dirty_pixels = 0
+            return rects
+
+        frame, background, stride = self.frame, self.background, self.width * 3
+        area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in rects)
+        screen = (0, 0, self.width, self.height)
+        if area >= FULL_REDRAW_SHARE * self.width * self.height:
+            frame[:] = background
+            for sprite in self.sprites:
+                placed = self._drawn.get(sprite)
+                clip = placed and _intersect(placed, screen)
+                if clip:
+                    self._blit(placed, clip)
+            self.dirty_pixels = self.width * self.height
+            self.full_redraws += 1
+            return [screen]
+
+        grid = {}
+        for rect in rects:
+            x0, y0, x1, y1 = rect
+            for y in range(y0, y1):
+                o = y * stride
+                frame[o + x0 * 3:o + x1 * 3] = background[o + x0 * 3:o + x1 * 3]
+            for gy in range(y0 // GRID, (y1 - 1) // GRID + 1):
+                for gx in range(x0 // GRID, (x1 - 1) // GRID + 1):
+                    grid.setdefault((gx, gy), []).append(rect)
+        self.dirty_pixels = area
+
+        for sprite in self.sprites:
+            placed = self._drawn.get(sprite)
+            if placed is None:
+                continue
+            seen = set()
+            for gy in range(max(0, placed[1]) // GRID, (min(placed[3], self.height) - 1) // GRID + 1):
+                for gx in range(max(0, placed[0]) // GRID, (min(placed[2], self.width) - 1) // GRID + 1):
+                    for rect in grid.get((gx, gy), ()):
+                        if rect not in seen:
+                            seen.add(rect)
+                            clip = _intersect(placed, rect)
+                            if clip:
+                                self._blit(placed, clip)
+        return rects
+
+    def _blit(self, placed, clip):
+        """Copy the opaque runs of a placed image that fall inside `clip`."""
+        x, y, _, _, image = placed
+        cx0, cy0, cx1, cy1 = clip
+        frame, pixels = self.frame, image.pixels
+        stride, row_bytes = self.width * 3, image.width * 3
+        for sy in range(cy0 - y, cy1 - y):
+            dst_row = (y + sy) * stride + x * 3
+            src_row = sy * row_bytes
+            for x0, x1 in image.runs[sy]:
+                x0 = max(x0, cx0 - x)
+                x1 = min(x1, cx1 - x)
+                if x0 < x1:
+                    frame[dst_row + x0 * 3:dst_row + x1 * 3] = pixels[src_row + x0 * 3:src_row + x1 * 3]
+
+    def get_metrics(self):
+        return {"sprites": len(self.sprites), "frames": self.frames,
+                "dirty_pixels": self.dirty_pixels, "full_redraws": self.full_redraws}
@@ -0,0 +1,142 @@
+"""
+Boot-time measurement.
+
+Phases (display ready, first pixel, first app frame, web ready...) are
+always recorded, relative to process start, and exposed under "boot" in
+/api/metrics so boot time can be tracked across releases. With
+--profile-startup an import hook also times every module import and a
+breakdown is printed once startup finishes.
+"""
+
+import importlib.abc
+import os
+import sys
+import threading
+import time
+
+# Singleton profiler for the whole process
+_profiler = None
+
+
+def _process_start_monotonic():
+    """Best guess at when the process started, on the monotonic clock."""
+    try:
+        with open('/proc/self/stat') as f:
+            # Field 22 is the start time in clock ticks since boot; the
+            # command name (field 2) may contain spaces, so split after it
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        age = uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+        return time.monotonic() - max(0.0, age)
+    except (OSError, ValueError, IndexError):
+        return time.monotonic()
+
+
+class _TimedLoader:
+    """Wraps a module loader to time exec_module()."""
+
+    def __init__(self, loader, name, profiler):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._import_started(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._import_finished(self._name)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, name, self._profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.t0 = _process_start_monotonic()
+        self.phases = []         # (name, seconds since process start)
+        self.imports = {}        # module -> [cumulative, self] seconds
+        self._stack = []         # [name, start, child_time]
+        self._lock = threading.Lock()
+        self._finder = None
+
+    def enable_import_timing(self):
+        if self._finder is None:
+            self._finder = _ImportTimer(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def disable_import_timing(self):
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    def mark(self, phase):
+        """Record that `phase` has been reached."""
+        with self._lock:
+            self.phases.append((phase, time.monotonic() - self.t0))
+
+    def _import_started(self, name):
+        if threading.current_thread() is threading.main_thread():
+            self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _import_finished(self, name):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        if not self._stack or self._stack[-1][0] != name:
+            return
+        _, start, child = self._stack.pop()
+        cumulative = time.perf_counter() - start
+        self.imports[name] = [cumulative, cumulative - child]
+        if self._stack:
+            self._stack[-1][2] += cumulative
+
+    def get_phases(self):
+        with self._lock:
+            return {name: round(t, 3) for name, t in self.phases}
+
+    def report(self, top=20):
+        lines = ["", "Startup profile (seconds since process start):"]
+        previous = 0.0
+        with self._lock:
+            phases = list(self.phases)
+        for name, t in phases:
+            lines.append(f"  {t:8.3f}  (+{t - previous:6.3f})  {name}")
+            previous = t
+        if self.imports:
+            lines.append("")
+            lines.append(f"Slowest imports on the main thread (top {top}, by cumulative time):")
+            lines.append(f"  {'cumulative':>10}  {'self':>8}  module")
+            ranked = sorted(self.imports.items(), key=lambda kv: kv[1][0], reverse=True)
+            for name, (cumulative, self_time) in ranked[:top]:
+                lines.append(f"  {cumulative:10.3f}  {self_time:8.3f}  {name}")
+            total_self = sum(v[1] for v in self.imports.values())
+            lines.append(f"  {len(self.imports)} modules, {total_self:.3f}s total import time")
+        return "\n".join(lines)
+
+
+def get_profiler():
+    """Get the shared startup profiler. Creates it on first call."""
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler()
+    return _profiler
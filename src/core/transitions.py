@@ -0,0 +1,157 @@
+"""
+Transitions between apps.
+
+Switching apps used to stop the old app, start the new one and clear the
+panel, so the display flashed black and the new app's first frame
+arrived late if start() was slow. Instead:
+
+  1. Prewarm: a helper thread imports the incoming app, runs start()
+     and renders its first frame into an OffscreenDisplay. The render
+     loop keeps drawing the outgoing app meanwhile.
+  2. Once the incoming app is ready, a Transition blends (or slides)
+     from a snapshot of the outgoing frame to the incoming app's
+     off-screen frames. Progress follows wall time, so a slow frame
+     shortens the transition instead of stretching it.
+
+Kinds: 'fade' (cross-fade), 'slide' (incoming pushes in from the right),
+'cut' (switch immediately, no transition).
+"""
+
+import threading
+import time
+
+from src.core.clock import get_clock
+from src.core.display_interface import DisplayInterface
+from src.core.logger import get_logger
+from src.core.matrix_buffer import MatrixBuffer
+
+log = get_logger()
+
+KINDS = ('fade', 'slide', 'cut')
+
+
+class OffscreenDisplay(DisplayInterface):
+    """A display that only draws into a buffer; apps render here during transitions."""
+
+    def __init__(self, width, height):
+        super().__init__(width, height)
+        self.buffer = MatrixBuffer(width, height)
+
+    def set_brightness(self, value):
+        self._brightness = max(0, min(100, int(value)))
+
+    def set_pixel(self, x, y, r, g, b):
+        self.buffer.set_pixel(x, y, r, g, b)
+
+    def fill(self, r, g, b):
+        self.buffer.fill(r, g, b)
+
+    def clear(self):
+        self.buffer.clear()
+
+    def blit(self, frame):
+        self.buffer.blit(frame)
+
+    def update(self):
+        pass
+
+
+class Prewarm:
+    """
+    Loads and starts an app on a helper thread, then renders its first
+    frame off-screen. `ready` is set when done; `error` holds any failure.
+    On a virtual clock it runs inline instead: the render loop would
+    otherwise keep advancing time while it waits.
+    """
+
+    def __init__(self, manager, name):
+        self.name = name
+        self.app = None
+        self.error = None
+        self.offscreen = OffscreenDisplay(manager.display.width, manager.display.height)
+        self.ready = threading.Event()
+        self.finished_at = None
+        self.can_blend = True
+        self._manager = manager
+        if get_clock().virtual:
+            self._run()
+        else:
+            threading.Thread(target=self._run, daemon=True, name=f'prewarm-{name}').start()
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            # numpy is only needed for blending; import it off the render thread
+            import numpy  # noqa: F401
+        except ImportError:
+            self.can_blend = False
+        memory = self._manager.memory
+        try:
+            self.app = self._manager.get_app(self.name)
+            self.app.exit_requested = False
+            before = memory.begin_start() if memory else None
+            self.app.prefetch()
+            self.app.start()
+            real = self.app.display
+            self.app.display = self.offscreen
+            try:
+                self.app.update()
+                self.app.draw()
+            finally:
+                self.app.display = real
+            if memory:
+                memory.end_start(self.name, before)
+            log.debug(f"Prewarmed '{self.name}' in {(time.perf_counter() - start) * 1000:.0f}ms")
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished_at = get_clock().monotonic()
+            self.ready.set()
+
+
+class Transition:
+    """Composites an outgoing frame snapshot with the incoming app's off-screen frames."""
+
+    def __init__(self, kind, outgoing, offscreen, duration):
+        import numpy as np
+        self._np = np
+        w, h = offscreen.width, offscreen.height
+        self.kind = kind
+        self.duration = max(duration, 1e-3)
+        self.offscreen = offscreen
+        self.width = w
+        self._outgoing = np.frombuffer(outgoing, dtype=np.uint8).reshape(h, w, 3)
+        self._outgoing16 = self._outgoing.astype(np.uint16)
+        self._incoming = np.frombuffer(offscreen.buffer.pixels, dtype=np.uint8).reshape(h, w, 3)
+        self._mix = np.empty((h, w, 3), dtype=np.uint16)
+        self._term = np.empty((h, w, 3), dtype=np.uint16)
+        self._result = np.empty((h, w, 3), dtype=np.uint8)
+        self._result_bytes = memoryview(self._result).cast('B')
+        self.started = get_clock().monotonic()
+        self.frames = 0
+
+    def compose(self, now=None):
+        """
+        Blend the current incoming frame with the outgoing snapshot.
+        Returns packed RGB bytes, or None once the transition is over.
+        """
+        np = self._np
+        progress = ((now or get_clock().monotonic()) - self.started) / self.duration
+        if progress >= 1.0:
+            return None
+        eased = progress * progress * (3 - 2 * progress)
+        self.frames += 1
+
+        if self.kind == 'slide':
+            offset = int(eased * self.width)
+            keep = self.width - offset
+            self._result[:, :keep] = self._outgoing[:, offset:]
+            self._result[:, keep:] = self._incoming[:, :offset]
+        else:
+            alpha = int(eased * 256)
+            np.multiply(self._outgoing16, 256 - alpha, out=self._mix)
+            np.multiply(self._incoming, alpha, out=self._term, dtype=np.uint16)
+            np.add(self._mix, self._term, out=self._mix)
+            np.right_shift(self._mix, 8, out=self._mix)
+            np.copyto(self._result, self._mix, casting='unsafe')
+        return self._result_bytes
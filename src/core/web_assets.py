@@ -0,0 +1,124 @@
+"""
+Pre-rendered pages and pre-compressed static assets.
+
+Everything the web UIs serve is built once at startup: static files
+under src/web/static are read and gzipped, and each page template is
+rendered to bytes (and gzipped) when it is registered. Responses carry
+an ETag so repeat visits revalidate with a 304; static URLs built with
+asset_url() include a content hash and are served as immutable.
+
+This matters most in AP/captive-portal mode, where a phone's first page
+load travels over a weak link and there is no internet to fetch
+third-party scripts from (the socket.io client is vendored).
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from flask import Response, request
+
+from src.core.logger import get_logger
+
+log = get_logger()
+
+# Singleton asset cache shared by WebController and SetupPortal
+_assets = None
+
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(_SRC_DIR, 'web', 'static')
+
+COMPRESSIBLE = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+MIN_GZIP_SIZE = 512
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+
+class Asset:
+    """One response body, with its gzipped form when that is smaller."""
+
+    def __init__(self, body, content_type):
+        self.body = body
+        self.content_type = content_type
+        self.version = hashlib.sha1(body).hexdigest()[:12]
+        self.etag = self.version
+        self.gzipped = None
+        if len(body) >= MIN_GZIP_SIZE and content_type.startswith(COMPRESSIBLE):
+            packed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(packed) < len(body):
+                self.gzipped = packed
+
+
+class WebAssets:
+    def __init__(self, static_dir=STATIC_DIR):
+        self.static_dir = static_dir
+        self._static = {}   # relative path -> Asset
+        self._pages = {}    # page name -> Asset
+        self._load_static()
+
+    def _load_static(self):
+        raw = packed = 0
+        for root, _, files in os.walk(self.static_dir):
+            for filename in files:
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, self.static_dir).replace(os.sep, '/')
+                content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                if content_type.startswith('text/') or content_type == 'application/javascript':
+                    content_type += '; charset=utf-8'
+                with open(path, 'rb') as f:
+                    asset = Asset(f.read(), content_type)
+                self._static[name] = asset
+                raw += len(asset.body)
+                packed += len(asset.gzipped or asset.body)
+        log.debug(f"Loaded {len(self._static)} static assets ({raw} bytes, {packed} compressed)")
+
+    def asset_url(self, name):
+        """Content-addressed URL for a static file, safe to cache forever."""
+        asset = self._static.get(name)
+        if asset is None:
+            raise KeyError(f"Unknown static asset '{name}'")
+        return f"/static/{name}?v={asset.version}"
+
+    def add_page(self, name, app, template, **context):
+        """Render a template once; serve it later with page_response(name)."""
+        html = app.jinja_env.get_template(template).render(asset_url=self.asset_url, **context)
+        self._pages[name] = Asset(html.encode('utf-8'), 'text/html; charset=utf-8')
+
+    def page_response(self, name):
+        return self._respond(self._pages[name], REVALIDATE)
+
+    def static_response(self, filename):
+        asset = self._static.get(filename)
+        if asset is None:
+            return Response('Not Found', status=404, mimetype='text/plain')
+        versioned = request.args.get('v') == asset.version
+        return self._respond(asset, IMMUTABLE if versioned else REVALIDATE)
+
+    def _respond(self, asset, cache_control):
+        # The gzip and identity bodies are different representations: each
+        # gets its own ETag, and both vary on Accept-Encoding
+        headers = {'Cache-Control': cache_control, 'Vary': 'Accept-Encoding'}
+        gzipped = asset.gzipped is not None and request.accept_encodings.quality('gzip') > 0
+        etag = f"{asset.etag}-gz" if gzipped else asset.etag
+        if request.if_none_match.contains(etag):
+            response = Response(status=304, headers=headers)
+        elif gzipped:
+            headers['Content-Encoding'] = 'gzip'
+            response = Response(asset.gzipped, content_type=asset.content_type, headers=headers)
+        else:
+            response = Response(asset.body, content_type=asset.content_type, headers=headers)
+        response.set_etag(etag)
+        return response
+
+    def register_static_route(self, app):
+        """Serve /static/<path> from the preloaded assets (replaces Flask's route)."""
+        app.add_url_rule('/static/<path:filename>', 'static', self.static_response)
+
+
+def get_assets():
+    """Get the shared asset cache. Loads static files on first call."""
+    global _assets
+    if _assets is None:
+        _assets = WebAssets()
+    return _assets
@@ -1,12 +1,23 @@
 import threading
 import os
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, jsonify, request
 import logging
 
+from src.core.app_manager import parse_overlay
+from src.core.command_queue import QueueFull
 from src.core.logger import get_logger
+from src.core.png import MAX_SCALE
+from src.core.snapshot import SnapshotCache, TooManyWaiters
+from src.core.startup_profile import get_profiler
+from src.core.transitions import KINDS as TRANSITION_KINDS
+from src.core.web_assets import get_assets
+from src.core.web_server import make_server
 
 log = get_logger()
 
+# Longest a request may block waiting for its command to reach the display
+MAX_COMMAND_WAIT = 5.0
+
 # Suppress Flask/Werkzeug default logging
 werkzeug_log = logging.getLogger('werkzeug')
 werkzeug_log.setLevel(logging.ERROR)
@@ -15,7 +26,16 @@ werkzeug_log.setLevel(logging.ERROR)
 _CORE_DIR = os.path.dirname(os.path.abspath(__file__))       # src/core
 _SRC_DIR = os.path.dirname(_CORE_DIR)                        # src
 _TEMPLATE_DIR = os.path.join(_SRC_DIR, 'web', 'templates')
-_STATIC_DIR = os.path.join(_SRC_DIR, 'web', 'static')
+
+
+def _release_worker():
+    """
+    Give this request's web server worker back before a long wait
+    (see src/core/web_server.py); a no-op under the development server.
+    """
+    release = request.environ.get('pixie.release_worker')
+    if release is not None:
+        release()
 
 
 class WebController:
@@ -24,19 +44,39 @@ class WebController:
     - Always serves the Remote UI (app switcher)
     - In emulator mode, also serves the matrix emulator with WebSocket push
     """
-    def __init__(self, app_manager, port=5000, emulator_display=None):
+    def __init__(self, app_manager, port=5000, emulator_display=None, server_options=None):
         self.app_manager = app_manager
         self.port = port
         self.emulator_display = emulator_display
+        self.server_options = server_options  # None: use the 'web' config section
+        self.server = None
+        self.snapshots = SnapshotCache(app_manager.display)
+        app_manager.set_snapshots(self.snapshots)
 
-        self.app = Flask(__name__, template_folder=_TEMPLATE_DIR, static_folder=_STATIC_DIR)
+        self.app = Flask(__name__, template_folder=_TEMPLATE_DIR, static_folder=None)
         self.socketio = None
 
+        # Pages are rendered once; static files are served pre-gzipped
+        self.assets = get_assets()
+        self.assets.register_static_route(self.app)
+        self.assets.add_page('remote', self.app, 'remote.html')
+
         # Remote control routes (always available)
         self.app.add_url_rule('/', 'remote', self.remote)
         self.app.add_url_rule('/api/status', 'get_status', self.get_status, methods=['GET'])
         self.app.add_url_rule('/api/switch', 'switch_app', self.switch_app, methods=['POST'])
+        self.app.add_url_rule('/api/prewarm', 'prewarm', self.prewarm, methods=['POST'])
         self.app.add_url_rule('/api/brightness', 'brightness', self.brightness_api, methods=['GET', 'POST'])
+        self.app.add_url_rule('/api/metrics', 'metrics', self.get_metrics, methods=['GET'])
+        self.app.add_url_rule('/api/snapshot.png', 'snapshot', self.snapshot, methods=['GET'])
+        self.app.add_url_rule('/api/profile', 'profile', self.profile, methods=['GET'])
+        self.app.add_url_rule('/api/config', 'app_config', self.app_config, methods=['POST'])
+        self.app.add_url_rule('/api/overlay', 'overlay', self.overlay, methods=['POST'])
+        self.app.add_url_rule('/api/power', 'power', self.power, methods=['POST'])
+        self.app.add_url_rule('/api/schedule', 'schedule', self.schedule_api, methods=['GET', 'POST'])
+        self.app.add_url_rule('/api/playlist', 'playlist', self.playlist_api, methods=['GET', 'POST'])
+        self.app.add_url_rule('/api/commands/<int:command_id>', 'command_status',
+                              self.command_status, methods=['GET'])
 
         # Emulator routes (only in emulator mode)
         if self.emulator_display is not None:
@@ -57,12 +97,21 @@ class WebController:
         from flask_socketio import SocketIO
         self.socketio = SocketIO(self.app, cors_allowed_origins="*", async_mode='threading')
         self.emulator_display.set_socketio(self.socketio)
+        self.assets.add_page('emulator', self.app, 'index.html',
+                             width=self.emulator_display.width, height=self.emulator_display.height)
         self.app.add_url_rule('/emulator', 'emulator', self.emulator)
         self.app.add_url_rule('/matrix_data', 'matrix_data', self.matrix_data)
 
     def _run_server(self):
         try:
-            if self.socketio:
+            options = self.server_options
+            if options is None:
+                from src.core.config import get_config
+                options = get_config().section('web')
+            self.server = make_server(self.app, '0.0.0.0', self.port, options)
+            if self.server is not None:
+                self.server.serve_forever()
+            elif self.socketio:
                 self.socketio.run(self.app, host='0.0.0.0', port=self.port,
                                   debug=False, use_reloader=False, log_output=False,
                                   allow_unsafe_werkzeug=True)
@@ -75,13 +124,112 @@ class WebController:
     # --- Remote routes ---
 
     def remote(self):
-        return render_template('remote.html')
+        return self.assets.page_response('remote')
 
     def get_status(self):
         return jsonify({
             "current_app": self.app_manager.active_app_name,
-            "available_apps": list(self.app_manager.apps.keys()),
-            "brightness": self.app_manager.display.brightness
+            "available_apps": self.app_manager.app_names,
+            "brightness": self.app_manager.base_brightness,
+            "display_off": self.app_manager.display_off,
+        })
+
+    def get_metrics(self):
+        metrics = self.app_manager.get_metrics()
+        metrics["boot"] = get_profiler().get_phases()
+        if self.server is not None:
+            metrics["web"] = self.server.get_metrics()
+        return jsonify(metrics)
+
+    def snapshot(self):
+        """
+        The current frame as a PNG: ?scale=N upscales by an integer factor.
+        ?wait_for_change=<seconds> long-polls until the content differs from
+        ?since=<version> (or the If-None-Match ETag) and answers 304 if it
+        doesn't change in time. X-Frame-Version carries the version.
+        """
+        scale = request.args.get('scale', 1, type=int)
+        if not 1 <= scale <= MAX_SCALE:
+            return jsonify({"error": f"scale must be an integer from 1 to {MAX_SCALE}"}), 400
+        wait = request.args.get('wait_for_change', type=float)
+        cache = self.snapshots
+
+        if wait:
+            since = request.args.get('since', type=int)
+            if since is None:
+                since = self._etag_version(request.headers.get('If-None-Match'), scale)
+            if since is None:
+                since = cache.current_version()
+            try:
+                _release_worker()
+                version = cache.wait_for_change(since, wait)
+            except TooManyWaiters as e:
+                return jsonify({"error": str(e)}), 503, {'Retry-After': '1'}
+            if version == since:
+                return '', 304, {'ETag': cache.etag(version, scale), 'X-Frame-Version': str(version)}
+        elif request.headers.get('If-None-Match') == cache.etag(cache.current_version(), scale):
+            version = cache.version
+            return '', 304, {'ETag': cache.etag(version, scale), 'X-Frame-Version': str(version)}
+
+        version, data = cache.png(scale)
+        return data, 200, {
+            'Content-Type': 'image/png',
+            'Cache-Control': 'no-cache',
+            'ETag': cache.etag(version, scale),
+            'X-Frame-Version': str(version),
+        }
+
+    def _etag_version(self, etag, scale):
+        """Content version from one of our snapshot ETags, or None."""
+        if not etag:
+            return None
+        parts = etag.strip('"').split('-')
+        if len(parts) != 3 or parts[0] != self.snapshots.boot_id or parts[2] != str(scale):
+            return None
+        return int(parts[1]) if parts[1].isdigit() else None
+
+    def profile(self):
+        """
+        Profile the render loop: ?seconds=N&mode=sample|cprofile
+        [&threads=render|web|all][&top=20][&format=json|collapsed].
+        Blocks for the duration; one profile at a time.
+        """
+        from src.core import profiling
+        seconds = request.args.get('seconds', 5.0, type=float)
+        mode = request.args.get('mode', 'sample')
+        top = request.args.get('top', 20, type=int)
+        if not 0 < seconds <= profiling.MAX_SECONDS:
+            return jsonify({"error": f"seconds must be in (0, {profiling.MAX_SECONDS:g}]"}), 400
+        if mode not in ('sample', 'cprofile'):
+            return jsonify({"error": "mode must be 'sample' or 'cprofile'"}), 400
+        if self.app_manager.render_thread_id is None:
+            return jsonify({"error": "Render loop is not running"}), 503
+
+        try:
+            _release_worker()
+            with profiling.profile_slot():
+                if mode == 'cprofile':
+                    profiler = profiling.profile_render_thread(self.app_manager, seconds)
+                    return jsonify({"mode": mode, "seconds": seconds,
+                                    "top": profiling.cprofile_top(profiler, top)})
+                threads = profiling.select_threads(self.app_manager.render_thread_id,
+                                                   request.args.get('threads', 'render'))
+                result = profiling.sample_threads(threads, seconds)
+        except profiling.ProfilerBusy as e:
+            return jsonify({"error": str(e)}), 429
+        except RuntimeError as e:
+            return jsonify({"error": str(e)}), 503
+
+        if request.args.get('format') == 'collapsed':
+            return result.collapsed() + "\n", 200, {'Content-Type': 'text/plain; charset=utf-8'}
+        return jsonify({
+            "mode": mode,
+            "seconds": round(result.seconds, 2),
+            "samples": result.samples,
+            "interval_ms": result.interval * 1000,
+            "threads": sorted(threads.values()),
+            "top": result.top(top),
+            "collapsed": result.collapsed(),
         })
 
     def switch_app(self):
@@ -90,27 +238,124 @@ class WebController:
             return jsonify({"error": "Missing 'app' in payload"}), 400
 
         app_name = data['app']
-        if app_name not in self.app_manager.apps:
+        if not self.app_manager.has_app(app_name):
             return jsonify({"error": f"App '{app_name}' not found"}), 404
 
-        self.app_manager.switch_to(app_name)
-        return jsonify({"status": "ok", "current_app": app_name})
+        transition = data.get('transition')
+        if transition is not None and transition not in TRANSITION_KINDS:
+            return jsonify({"error": f"Unknown transition '{transition}'"}), 400
+        return self._submit('switch', app=app_name, transition=transition)
+
+    def prewarm(self):
+        """Start an app ahead of a likely switch (e.g. on touch-down in the remote)."""
+        data = request.json
+        if not data or not self.app_manager.has_app(data.get('app')):
+            return jsonify({"error": "Missing or unknown 'app' in payload"}), 400
+        return self._submit('prewarm', key=('prewarm', data['app']), app=data['app'])
 
     def brightness_api(self):
         if request.method == 'GET':
-            return jsonify({"brightness": self.app_manager.display.brightness})
+            return jsonify({"brightness": self.app_manager.base_brightness})
         data = request.json
         if not data or 'brightness' not in data:
             return jsonify({"error": "Missing 'brightness' in payload"}), 400
-        value = int(data['brightness'])
-        self.app_manager.display.set_brightness(value)
-        return jsonify({"status": "ok", "brightness": self.app_manager.display.brightness})
+        return self._submit('brightness', brightness=int(data['brightness']))
+
+    def app_config(self):
+        data = request.json
+        if not data or 'app' not in data or not isinstance(data.get('config'), dict):
+            return jsonify({"error": "Payload needs 'app' and a 'config' object"}), 400
+        if not self.app_manager.has_app(data['app']):
+            return jsonify({"error": f"App '{data['app']}' not found"}), 404
+        return self._submit('config', app=data['app'], config=data['config'])
+
+    def overlay(self):
+        data = request.json
+        if not data or 'text' not in data:
+            return jsonify({"error": "Missing 'text' in payload"}), 400
+        try:
+            text, duration, color = parse_overlay(data['text'], data.get('duration', 5.0),
+                                                  data.get('color', [255, 255, 255]))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return self._submit('overlay', text=text, duration=duration, color=color)
+
+    def power(self):
+        """Force the display on/off until the schedule next turns it on or off; null follows the schedule."""
+        data = request.json
+        if not data or 'on' not in data:
+            return jsonify({"error": "Missing 'on' in payload"}), 400
+        return self._submit('power', on=data['on'])
+
+    def schedule_api(self):
+        from src.core.config import get_config
+        from src.core.schedule import DisplaySchedule
+        if request.method == 'GET':
+            return jsonify(get_config().section('schedule'))
+        data = request.json
+        if not isinstance(data, dict):
+            return jsonify({"error": "Expected a schedule object"}), 400
+        try:
+            schedule = DisplaySchedule.from_config(data) if data.get('windows') else None
+        except (KeyError, ValueError, TypeError) as e:
+            return jsonify({"error": f"Invalid schedule: {e}"}), 400
+        get_config().replace_section('schedule', data)
+        return self._submit('schedule', schedule=schedule)
+
+    def playlist_api(self):
+        from src.core.config import get_config
+        from src.core.playlist import Playlist
+        if request.method == 'GET':
+            return jsonify({"config": get_config().section('playlist'),
+                            "state": self.app_manager.get_playlist_state()})
+        data = request.json
+        if not isinstance(data, dict):
+            return jsonify({"error": "Expected a playlist object"}), 400
+        try:
+            playlist = Playlist.from_config(data)
+        except (KeyError, ValueError, TypeError) as e:
+            return jsonify({"error": f"Invalid playlist: {e}"}), 400
+        unknown = [e.app for e in playlist.entries if not self.app_manager.has_app(e.app)]
+        if unknown:
+            return jsonify({"error": f"Unknown apps: {', '.join(unknown)}"}), 400
+        get_config().replace_section('playlist', playlist.to_config())
+        return self._submit('playlist', playlist=playlist if playlist.entries else None)
+
+    def command_status(self, command_id):
+        cmd = self.app_manager.commands.get(command_id)
+        if cmd is None:
+            return jsonify({"error": f"Unknown command {command_id}"}), 404
+        wait = request.args.get('wait', type=float)
+        if wait:
+            _release_worker()
+            cmd.wait(min(wait, MAX_COMMAND_WAIT))
+        return jsonify(cmd.to_dict())
+
+    def _submit(self, kind, **payload):
+        """
+        Queue a command for the render loop. Returns immediately with the
+        command ID (202), or waits for it to be presented when the request
+        has ?wait=<seconds>.
+        """
+        try:
+            cmd = self.app_manager.submit(kind, **payload)
+        except QueueFull as e:
+            return jsonify({"error": str(e)}), 503
+
+        wait = request.args.get('wait', type=float)
+        if wait:
+            _release_worker()
+            cmd.wait(min(wait, MAX_COMMAND_WAIT))
+        body = cmd.to_dict()
+        body["command_id"] = cmd.id
+        if cmd.status == 'failed':
+            return jsonify(body), 500
+        return jsonify(body), (200 if cmd.finished else 202)
 
     # --- Emulator routes ---
 
     def emulator(self):
-        return render_template('index.html', width=self.emulator_display.width,
-                               height=self.emulator_display.height)
+        return self.assets.page_response('emulator')
 
     def matrix_data(self):
         """HTTP fallback for emulator data."""
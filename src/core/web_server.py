@@ -0,0 +1,188 @@
+"""
+Bounded-thread-pool WSGI server shared by WebController and SetupPortal.
+
+Werkzeug's development server spawns an unbounded thread per
+connection and never times out a silent client, so one stuck captive
+portal probe or a handful of phones can pin a Pi Zero. This server
+reuses Werkzeug's request handler (HTTP/1.1, WebSocket upgrades for
+Socket.IO) but:
+
+  - caps open connections; extra ones get an immediate 503
+  - gives every accepted connection a pool thread at once, but lets only
+    max_workers requests run app code at the same time; a request that
+    can't get a worker within request_timeout gets a 503
+  - doesn't count long-lived requests against max_workers: Socket.IO
+    (WebSocket and polling) and handlers that call
+    environ['pixie.release_worker']() before a long wait (long-polls,
+    /api/profile), so open emulators can't starve the control API
+  - times out slow requests, and idle keep-alive connections sooner
+
+Options come from the 'web' config section:
+    {"server": "pooled", "max_workers": 8, "max_connections": 32,
+     "request_timeout": 10, "keepalive_timeout": 5}
+Set "server": "werkzeug" to fall back to the development server.
+"""
+
+import select
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+from src.core.logger import get_logger
+
+log = get_logger()
+
+DEFAULTS = {
+    "server": "pooled",
+    "max_workers": 8,
+    "max_connections": 32,
+    "request_timeout": 10.0,
+    "keepalive_timeout": 5.0,
+}
+
+_BUSY_RESPONSE = (b"HTTP/1.1 503 Service Unavailable\r\n"
+                  b"Content-Length: 0\r\nConnection: close\r\nRetry-After: 1\r\n\r\n")
+# Requests here are long-lived by design (Socket.IO keeps them open for
+# up to a ping interval); they don't take a worker
+LONG_LIVED_PREFIXES = ('/socket.io/',)
+
+
+class _WorkerSlot:
+    """One of the server's max_workers slots, released at most once."""
+
+    def __init__(self, semaphore):
+        self._semaphore = semaphore
+        self._held = True
+
+    def release(self):
+        if self._held:
+            self._held = False
+            self._semaphore.release()
+
+
+class _PooledRequestHandler(WSGIRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        self.timeout = self.server.request_timeout
+        self._requests_handled = 0
+        super().setup()
+
+    def handle_one_request(self):
+        # Between requests, wait only keepalive_timeout for the next one
+        if self._requests_handled:
+            ready, _, _ = select.select([self.connection], [], [], self.server.keepalive_timeout)
+            if not ready:
+                self.close_connection = True
+                return
+        self._requests_handled += 1
+        super().handle_one_request()
+
+    def run_wsgi(self):
+        if self.headers.get('Upgrade', '').lower() == 'websocket':
+            # Long-lived Socket.IO connection: its own pings detect dead peers
+            self.connection.settimeout(None)
+        if self.path.startswith(LONG_LIVED_PREFIXES):
+            self._slot = None
+            return super().run_wsgi()
+        self._slot = self.server.acquire_worker()
+        if self._slot is None:
+            self.close_connection = True
+            self.wfile.write(_BUSY_RESPONSE)
+            return
+        try:
+            super().run_wsgi()
+        finally:
+            self._slot.release()
+
+    def make_environ(self):
+        environ = super().make_environ()
+        slot = getattr(self, '_slot', None)
+        environ['pixie.release_worker'] = slot.release if slot is not None else (lambda: None)
+        return environ
+
+    def log_request(self, code='-', size='-'):
+        pass
+
+    def log_error(self, format, *args):
+        # Timeouts and dropped clients are routine on a flaky AP link
+        log.debug(f"{self.address_string()}: {format % args}")
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    multithread = True
+
+    def __init__(self, host, port, app, max_workers=8, max_connections=32,
+                 request_timeout=10.0, keepalive_timeout=5.0):
+        self.request_timeout = request_timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.max_connections = max_connections
+        # A thread per open connection (created on demand), so nothing
+        # waits in an executor queue behind long-lived connections
+        self._pool = ThreadPoolExecutor(max_connections, thread_name_prefix='http')
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._workers = threading.BoundedSemaphore(max_workers)
+        self.max_workers = max_workers
+        self.connections_accepted = 0
+        self.connections_rejected = 0
+        self.requests_rejected = 0      # no worker free within request_timeout
+        super().__init__(host, port, app, handler=_PooledRequestHandler)
+
+    def process_request(self, request, client_address):
+        """Hand the connection to the pool, or turn it away when at capacity."""
+        if not self._slots.acquire(blocking=False):
+            self.connections_rejected += 1
+            log.debug(f"Web server at capacity, rejecting {client_address[0]}")
+            try:
+                request.sendall(_BUSY_RESPONSE)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        self.connections_accepted += 1
+        self._pool.submit(self._process, request, client_address)
+
+    def acquire_worker(self):
+        """A _WorkerSlot for running a request, or None after request_timeout."""
+        if not self._workers.acquire(timeout=self.request_timeout):
+            self.requests_rejected += 1
+            log.debug("Web server workers busy, rejecting request")
+            return None
+        return _WorkerSlot(self._workers)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+
+    def get_metrics(self):
+        return {
+            "max_workers": self.max_workers,
+            "max_connections": self.max_connections,
+            "accepted": self.connections_accepted,
+            "rejected": self.connections_rejected,
+            "requests_rejected": self.requests_rejected,
+        }
+
+
+def make_server(app, host, port, options=None):
+    """
+    Create the configured server for a WSGI app. Returns None for the
+    "werkzeug" mode, in which case the caller runs the dev server itself.
+    """
+    opts = dict(DEFAULTS)
+    opts.update(options or {})
+    if opts["server"] == "werkzeug":
+        return None
+    if opts["server"] != "pooled":
+        raise ValueError(f"Unknown web server mode '{opts['server']}'")
+    return PooledWSGIServer(host, port, app, **{k: opts[k] for k in DEFAULTS if k != "server"})
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark drawing and present-time remapping at larger canvas sizes.
+
+Measures, per panel geometry:
+  - set_pixel fill of the whole virtual canvas (typical app draw cost)
+  - blit of a full packed RGB frame (bulk write path)
+  - virtual -> native remap done in RealMatrixAdapter.update()
+
+Runs anywhere (no Pi needed), since it only exercises the buffer and
+the PanelGeometry remap table.
+
+Usage:
+    python3 tools/bench_canvas.py [--frames 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.matrix_buffer import MatrixBuffer  # noqa: E402
+from src.core.panel_geometry import PanelGeometry  # noqa: E402
+
+GEOMETRIES = [
+    ("64x64 single", dict()),
+    ("128x64 chain=2", dict(chain_length=2)),
+    ("128x64 chain=2 rot180", dict(chain_length=2, rotation=180)),
+    ("64x128 column", dict(chain_length=2, arrangement='column')),
+    ("128x128 parallel=2", dict(chain_length=2, parallel=2)),
+    ("128x128 serpentine", dict(chain_length=4, arrangement='serpentine', panels_per_row=2)),
+    ("128x128 serpentine rot90", dict(chain_length=4, arrangement='serpentine',
+                                       panels_per_row=2, rotation=90)),
+]
+
+
+def timed(fn, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        fn()
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=200)
+    args = parser.parse_args()
+
+    numpy_remap = PanelGeometry(chain_length=2, rotation=180)._remap_array is not None
+    print(f"numpy remap: {'yes' if numpy_remap else 'no (pure Python fallback)'}")
+    print(f"{'geometry':<28}{'set_pixel':>12}{'blit':>12}{'remap':>12}{'max fps':>10}")
+
+    for label, kwargs in GEOMETRIES:
+        geometry = PanelGeometry(**kwargs)
+        buf = MatrixBuffer(geometry.width, geometry.height)
+        frame = bytes(range(256)) * (buf.frame_size // 256 + 1)
+        frame = frame[:buf.frame_size]
+
+        def draw_pixels():
+            for y in range(geometry.height):
+                for x in range(geometry.width):
+                    buf.set_pixel(x, y, x & 0xFF, y & 0xFF, 128)
+
+        t_pixels = timed(draw_pixels, max(1, args.frames // 10))
+        t_blit = timed(lambda: buf.blit(frame), args.frames)
+        t_remap = timed(lambda: geometry.to_native(buf.get_bytes()), args.frames)
+        fps = 1.0 / (t_blit + t_remap)
+
+        print(f"{label:<28}{t_pixels * 1000:>10.2f}ms{t_blit * 1000:>10.3f}ms"
+              f"{t_remap * 1000:>10.3f}ms{fps:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
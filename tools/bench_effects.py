@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorized effects: frame time and sustainable fps.
+
+Renders each effect for a number of frames at several canvas sizes and
+reports the mean and worst frame time, including the blit into a
+MatrixBuffer. NumPy's element-wise kernels are single-threaded, so the
+numbers reflect one core. Run it on the Pi Zero to check the 30 fps
+budget there.
+
+Usage:
+    python3 tools/bench_effects.py [--frames 300] [--size 64x64 --size 128x64]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.effects import EFFECTS  # noqa: E402
+from src.core.matrix_buffer import MatrixBuffer  # noqa: E402
+
+TARGET_FPS = 30
+
+
+def bench(effect_class, width, height, frames):
+    effect = effect_class(width, height, seed=1)
+    buf = MatrixBuffer(width, height)
+    effect.render(0.0)  # warm up
+    times = []
+    for i in range(frames):
+        start = time.perf_counter()
+        effect.render(i / TARGET_FPS)
+        buf.blit(effect.frame_bytes)
+        times.append(time.perf_counter() - start)
+    return sum(times) / len(times), max(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--size', action='append', help="WIDTHxHEIGHT (repeatable)")
+    args = parser.parse_args()
+    sizes = [tuple(int(v) for v in s.split('x')) for s in (args.size or ['64x64', '128x64', '128x128'])]
+
+    print(f"{'effect':<12}{'size':>9}{'mean':>10}{'worst':>10}{'max fps':>9}  {TARGET_FPS} fps")
+    failed = False
+    for name, effect_class in EFFECTS.items():
+        for width, height in sizes:
+            mean, worst = bench(effect_class, width, height, args.frames)
+            fps = 1.0 / mean
+            ok = fps >= TARGET_FPS
+            failed |= not ok
+            print(f"{name:<12}{f'{width}x{height}':>9}{mean * 1000:>8.2f}ms{worst * 1000:>8.2f}ms"
+                  f"{fps:>9.0f}  {'ok' if ok else 'TOO SLOW'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
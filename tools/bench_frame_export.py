@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared-memory frame export: throughput and latency.
+
+Creates a segment, writes frames from this process as fast as it can
+(or at --fps) and reads them with FrameSegment.wait_frame() from a
+separate reader process, started like any sidecar would be. Reports
+frames/s and MB/s on both sides, frames the reader skipped, torn reads
+(must be zero) and write-to-read latency. With --name it only reads,
+from a running Pixie's export segment.
+
+Usage:
+    python3 tools/bench_frame_export.py [--seconds 5] [--size 64x64] [--fps 0]
+    python3 tools/bench_frame_export.py --name pixie_frames
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.frame_export import FrameSegment  # noqa: E402
+
+BENCH_SEGMENT = 'pixie_bench_frames'
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0
+
+
+def read_frames(name, seconds, poll):
+    """Read every frame we can for `seconds`; checks each frame is untorn."""
+    segment = FrameSegment.attach(name)
+    frame = bytearray(segment.frame_size)
+    seq = segment.seq & ~1
+    received = skipped = torn = 0
+    latencies = []
+    first = last = None
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        got = segment.wait_frame(after=seq, out=frame, timeout=0.5, poll=poll)
+        if got is None:
+            continue
+        new_seq, timestamp, _ = got
+        last = time.monotonic()
+        first = first or last
+        latencies.append(time.monotonic_ns() - timestamp)
+        skipped += max(0, (new_seq - seq) // 2 - 1) if seq else 0
+        seq = new_seq
+        received += 1
+        # The writer fills each frame with one byte value, so a mix means a torn read
+        if frame.count(frame[0]) != len(frame):
+            torn += 1
+    segment.close()
+    return {
+        "received": received,
+        "skipped": skipped,
+        "torn": torn,
+        "frame_size": len(frame),
+        "elapsed": (last - first) if received > 1 else 0,
+        "latency_p50_us": _percentile(latencies, 0.50) / 1000,
+        "latency_p99_us": _percentile(latencies, 0.99) / 1000,
+    }
+
+
+def report(label, stats):
+    fps = (stats["received"] - 1) / stats["elapsed"] if stats["elapsed"] else 0
+    mb = fps * stats["frame_size"] / 1e6
+    print(f"{label:<8}{fps:>10.0f} frames/s{mb:>9.1f} MB/s"
+          f"   skipped {stats['skipped']}, torn {stats['torn']},"
+          f" latency p50 {stats['latency_p50_us']:.0f}us p99 {stats['latency_p99_us']:.0f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--size', default='64x64', help="WIDTHxHEIGHT")
+    parser.add_argument('--fps', type=float, default=0, help="Writer rate (0 = as fast as possible)")
+    parser.add_argument('--name', help="Only read from this existing segment (e.g. pixie_frames)")
+    parser.add_argument('--poll', type=float, default=0.001, help="Reader poll interval (0 = spin)")
+    parser.add_argument('--json', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.name:
+        stats = read_frames(args.name, args.seconds, args.poll)
+        if args.json:
+            print(json.dumps(stats))
+        else:
+            report('reader', stats)
+        return
+
+    width, height = (int(v) for v in args.size.split('x'))
+    segment = FrameSegment.create(BENCH_SEGMENT, width, height)
+    frames = [bytes((i,)) * segment.frame_size for i in range(256)]
+    reader = subprocess.Popen([sys.executable, __file__, '--name', BENCH_SEGMENT, '--json',
+                               '--seconds', str(args.seconds + 1), '--poll', str(args.poll)],
+                              stdout=subprocess.PIPE, text=True)
+    time.sleep(0.5)  # let the reader attach
+
+    written = 0
+    period = 1.0 / args.fps if args.fps else 0
+    start = time.monotonic()
+    next_frame = start
+    while time.monotonic() - start < args.seconds:
+        segment.write(frames[written & 255])
+        written += 1
+        if period:
+            next_frame += period
+            time.sleep(max(0.0, next_frame - time.monotonic()))
+    elapsed = time.monotonic() - start
+
+    stats = json.loads(reader.communicate()[0])
+    segment.close()
+    mb = written * segment.frame_size / elapsed / 1e6
+    print(f"{'writer':<8}{written / elapsed:>10.0f} frames/s{mb:>9.1f} MB/s")
+    report('reader', stats)
+    sys.exit(1 if stats["torn"] else 0)
+
+
+if __name__ == "__main__":
+    main()
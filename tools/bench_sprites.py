@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark the sprite engine: frame time with many moving sprites.
+
+Bounces --sprites animated 8x8 sprites over a gradient background and
+times a whole frame (move, composite, blit to an off-screen display)
+three ways: SpriteScene with dirty rectangles, SpriteScene forced to
+recomposite everything each frame, and per-pixel set_pixel() drawing
+over the background, as the existing apps draw. Each --moving share
+(fraction of sprites in motion; the rest idle but still animate) is a
+separate scenario. Exits non-zero if SpriteScene can't sustain --fps.
+
+Usage:
+    python3 tools/bench_sprites.py [--sprites 64] [--moving 1,0.25] [--frames 600] [--fps 30]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.sprites import Sprite, SpriteScene, SpriteSheet  # noqa: E402
+from src.core.transitions import OffscreenDisplay  # noqa: E402
+
+BUG = [
+    ["..#..#..",
+     "...##...",
+     ".######.",
+     "##o##o##",
+     "########",
+     ".######.",
+     ".#....#.",
+     "#......#"],
+    ["..#..#..",
+     "...##...",
+     ".######.",
+     "##o##o##",
+     "########",
+     ".######.",
+     "..#..#..",
+     ".#....#."],
+]
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _gradient(width, height):
+    return b''.join(bytes((x * 2, 20, 40 + y)) for y in range(height) for x in range(width))
+
+
+def _make_sprites(count, width, height, moving, seed=1):
+    rng = random.Random(seed)
+    sheets = [SpriteSheet.from_rows(BUG, {'#': color, 'o': (255, 255, 255)})
+              for color in ((255, 80, 80), (80, 255, 80), (80, 160, 255), (255, 200, 0))]
+    sprites = []
+    for i in range(count):
+        sprite = Sprite(sheets[i % len(sheets)], x=rng.uniform(0, width - 8), y=rng.uniform(0, height - 8),
+                        z=i % 3, fps=rng.choice((2, 4, 6)))
+        sprite.vx, sprite.vy = rng.uniform(-0.8, 0.8), rng.uniform(-0.8, 0.8)
+        if i >= count * moving:
+            sprite.vx = sprite.vy = 0.0
+        sprites.append(sprite)
+    return sprites
+
+
+def _move(sprites, width, height):
+    for s in sprites:
+        s.x += s.vx
+        s.y += s.vy
+        if not 0 <= s.x <= width - 8:
+            s.vx = -s.vx
+            s.x += 2 * s.vx
+        if not 0 <= s.y <= height - 8:
+            s.vy = -s.vy
+            s.y += 2 * s.vy
+
+
+def run(mode, count, width, height, frames, moving):
+    display = OffscreenDisplay(width, height)
+    background = _gradient(width, height)
+    sprites = _make_sprites(count, width, height, moving)
+    scene = SpriteScene(width, height, background)
+    for s in sprites:
+        scene.add(s)
+    times, dirty = [], 0
+    for n in range(frames):
+        t = n / 30
+        start = time.perf_counter()
+        _move(sprites, width, height)
+        if mode == 'set_pixel':
+            display.blit(background)
+            for s in sorted(sprites, key=lambda s: s.z):
+                s.animate(t)
+                image, x0, y0 = s.image, int(s.x), int(s.y)
+                for y, runs in enumerate(image.runs):
+                    for a, b in runs:
+                        for x in range(a, b):
+                            o = (y * image.width + x) * 3
+                            display.set_pixel(x0 + x, y0 + y, *image.pixels[o:o + 3])
+        else:
+            if mode == 'full':
+                scene.set_background(background)
+            scene.render(t)
+            dirty += scene.dirty_pixels
+            display.blit(scene.frame)
+        times.append(time.perf_counter() - start)
+    return {
+        "p50_ms": _percentile(times, 0.50) * 1000,
+        "p99_ms": _percentile(times, 0.99) * 1000,
+        "fps": len(times) / sum(times),
+        "dirty_share": dirty / frames / (width * height) if mode != 'set_pixel' else 1.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sprites', type=int, default=64)
+    parser.add_argument('--size', default='64x64', help="WIDTHxHEIGHT")
+    parser.add_argument('--moving', default='1,0.25', help="Comma-separated shares of sprites in motion")
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--fps', type=float, default=30, help="Frame rate SpriteScene must sustain")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split('x'))
+
+    budget_ms = 1000 / args.fps
+    print(f"{args.sprites} sprites on {width}x{height}, {budget_ms:.1f} ms budget")
+    print(f"{'moving':<8}{'mode':<12}{'p50 ms':>10}{'p99 ms':>10}{'max fps':>10}{'redrawn':>10}")
+    worst = 0.0
+    for moving in (float(v) for v in args.moving.split(',')):
+        for mode in ('dirty', 'full', 'set_pixel'):
+            r = run(mode, args.sprites, width, height, args.frames, moving)
+            print(f"{moving:<8.0%}{mode:<12}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['fps']:>10.0f}"
+                  f"{r['dirty_share']:>9.0%}")
+            if mode == 'dirty':
+                worst = max(worst, r['p99_ms'])
+
+    ok = worst <= budget_ms
+    print(f"SpriteScene worst p99 {worst:.2f} ms: {'OK' if ok else 'TOO SLOW'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
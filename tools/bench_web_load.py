@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Load-test a running WebController: emulator viewers plus REST clients.
+
+Starts an AppManager on a WebMatrixAdapter (rendering --app) and a
+WebController on localhost, then drives it from a separate client
+process so the clients don't share the server's GIL or CPU figures:
+--viewers socket.io clients receive the emulator's 'frame' events while
+--rest-clients clients hit /api/status, /api/switch and /api/brightness
+at the given per-client rates. Reports render-loop fps, frame-interval
+percentiles and missed frames, per-viewer receive rate, API latency
+percentiles and the server process's CPU use over the measured window.
+
+--viewers takes a comma-separated list to sweep (e.g. 0,1,2,4,8) against
+one server; --json-out writes every step for tracking across releases.
+With --url the clients load an already running Pixie instead, and render
+figures come from its /api/metrics (CPU use is not available remotely).
+
+Viewers use the Engine.IO long-polling transport, implemented here on
+http.client; --transport websocket uses python-socketio's client instead
+(pip install "python-socketio[client]").
+
+Usage:
+    python3 tools/bench_web_load.py [--app clock] [--viewers 0,1,4,8] [--rest-clients 4]
+    python3 tools/bench_web_load.py --url http://pixie.local:5000 --viewers 2
+"""
+
+import argparse
+import http.client
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RECORD_SEPARATOR = '\x1e'  # between Engine.IO packets in one polling response
+
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _latency_summary(latencies, errors, seconds):
+    latencies = sorted(latencies)
+    result = {"requests": len(latencies), "errors": len(errors), "rps": len(latencies) / seconds}
+    if latencies:
+        result.update({
+            "p50_ms": _percentile(latencies, 50) * 1000,
+            "p90_ms": _percentile(latencies, 90) * 1000,
+            "p99_ms": _percentile(latencies, 99) * 1000,
+            "max_ms": latencies[-1] * 1000,
+        })
+    return result
+
+
+class Window:
+    """The measured interval: clients run through warmup, only this part counts."""
+
+    def __init__(self, warmup, seconds):
+        self.start = time.monotonic() + warmup
+        self.end = self.start + seconds
+
+    def __contains__(self, t):
+        return self.start <= t < self.end
+
+    def over(self):
+        return time.monotonic() >= self.end
+
+
+# --- Frame viewers ---
+
+class PollingViewer:
+    """A socket.io client on Engine.IO 4 long-polling that counts 'frame' events."""
+
+    def __init__(self, host, port, window):
+        self.host, self.port = host, port
+        self.window = window
+        self.frames = 0
+        self.bytes = 0
+        self.max_gap = 0.0
+        self.error = None
+        self._last_frame = None
+        self._sid = None
+
+    def _request(self, conn, method, body=None):
+        query = f"/socket.io/?EIO=4&transport=polling&t={time.monotonic_ns()}"
+        if self._sid:
+            query += f"&sid={self._sid}"
+        conn.request(method, query, body=body,
+                     headers={'Content-Type': 'text/plain;charset=UTF-8'} if body else {})
+        response = conn.getresponse()
+        data = response.read()
+        if response.status != 200:
+            raise RuntimeError(f"{method} {response.status}: {data[:80]!r}")
+        return data
+
+    def run(self):
+        poll = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        send = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            handshake = self._request(poll, 'GET').decode()
+            self._sid = json.loads(handshake[1:])['sid']
+            self._request(send, 'POST', b'40')  # join the default namespace
+            while not self.window.over():
+                payload = self._request(poll, 'GET')
+                now = time.monotonic()
+                for packet in payload.decode().split(RECORD_SEPARATOR):
+                    if packet == '2':
+                        self._request(send, 'POST', b'3')  # pong
+                    elif packet.startswith('42["frame"'):
+                        self._frame(now, len(packet))
+                    elif packet == '1':
+                        raise RuntimeError("server closed the session")
+            self._request(send, 'POST', b'1')
+        except (OSError, http.client.HTTPException, RuntimeError, ValueError) as e:
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            poll.close()
+            send.close()
+
+    def _frame(self, now, size):
+        if now in self.window:
+            self.frames += 1
+            self.bytes += size
+            if self._last_frame is not None:
+                self.max_gap = max(self.max_gap, now - self._last_frame)
+            self._last_frame = now
+
+
+class WebSocketViewer(PollingViewer):
+    """The same measurements over a WebSocket, using python-socketio's client."""
+
+    def run(self):
+        import socketio
+        client = socketio.Client(reconnection=False)
+        client.on('frame', lambda data: self._frame(time.monotonic(), len(json.dumps(data))))
+        try:
+            client.connect(f"http://{self.host}:{self.port}", transports=['websocket'])
+            while not self.window.over():
+                time.sleep(0.1)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            client.disconnect()
+
+
+# --- REST clients ---
+
+class RestClient:
+    """
+    Sends each endpoint at its own fixed rate on one keep-alive connection.
+    Requests that come due while another is in flight go out late, like a
+    UI would, so latency under load stays visible in the percentiles.
+    """
+
+    def __init__(self, host, port, window, rates, apps, index):
+        self.host, self.port = host, port
+        self.window = window
+        self.rates = {name: rate for name, rate in rates.items() if rate > 0}
+        self.apps = apps
+        self.latencies = {name: [] for name in rates}
+        self.errors = {name: [] for name in rates}
+        self._switches = index
+        self._brightness = 40 + index
+
+    def _next_request(self, name):
+        if name == 'status':
+            return 'GET', '/api/status', None
+        if name == 'switch':
+            self._switches += 1
+            return 'POST', '/api/switch', {"app": self.apps[self._switches % len(self.apps)]}
+        self._brightness = 40 if self._brightness >= 100 else self._brightness + 5
+        return 'POST', '/api/brightness', {"brightness": self._brightness}
+
+    def run(self):
+        if not self.rates:
+            return
+        now = time.monotonic()
+        due = {name: now + (i / len(self.rates)) / rate
+               for i, (name, rate) in enumerate(self.rates.items())}
+        conn = None
+        while not self.window.over():
+            name = min(due, key=due.get)
+            delay = due[name] - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            due[name] += 1.0 / self.rates[name]
+            method, path, body = self._next_request(name)
+            try:
+                if conn is None:
+                    conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+                start = time.monotonic()
+                conn.request(method, path, body=json.dumps(body) if body else None,
+                             headers={'Content-Type': 'application/json'} if body else {})
+                response = conn.getresponse()
+                response.read()
+                end = time.monotonic()
+                if start in self.window:
+                    if response.status in (200, 202):
+                        self.latencies[name].append(end - start)
+                    else:
+                        self.errors[name].append(response.status)
+                if response.will_close:
+                    conn.close()
+                    conn = None
+            except (OSError, http.client.HTTPException) as e:
+                if start in self.window:
+                    self.errors[name].append(type(e).__name__)
+                if conn is not None:
+                    conn.close()
+                conn = None
+        if conn is not None:
+            conn.close()
+
+
+def run_clients(host, port, viewers, rest_clients, rates, apps, warmup, seconds,
+                transport='polling', on_start=None):
+    """Drive one load step; returns viewer and API statistics for the measured window."""
+    window = Window(warmup, seconds)
+    viewer_class = WebSocketViewer if transport == 'websocket' else PollingViewer
+    viewer_list = [viewer_class(host, port, window) for _ in range(viewers)]
+    clients = [RestClient(host, port, window, rates, apps, i) for i in range(rest_clients)]
+    threads = [threading.Thread(target=c.run, daemon=True) for c in viewer_list + clients]
+    for t in threads:
+        t.start()
+    time.sleep(max(0.0, window.start - time.monotonic()))
+    if on_start:
+        on_start()
+    for t in threads:
+        t.join(timeout=max(0.0, window.end - time.monotonic()) + 35)
+
+    per_viewer = [{"fps": round(v.frames / seconds, 2), "kb_per_s": round(v.bytes / seconds / 1024, 1),
+                   "max_gap_ms": round(v.max_gap * 1000, 1), "error": v.error}
+                  for v in viewer_list]
+    rates_seen = sorted(v["fps"] for v in per_viewer)
+    api = {}
+    for name in rates:
+        latencies = [x for c in clients for x in c.latencies[name]]
+        errors = [x for c in clients for x in c.errors[name]]
+        if latencies or errors:
+            api[name] = _latency_summary(latencies, errors, seconds)
+    return {
+        "viewers": {
+            "count": viewers,
+            "transport": transport,
+            "fps_min": rates_seen[0] if rates_seen else None,
+            "fps_p50": _percentile(rates_seen, 50) if rates_seen else None,
+            "fps_max": rates_seen[-1] if rates_seen else None,
+            "errors": sum(1 for v in per_viewer if v["error"]),
+            "clients": per_viewer,
+        },
+        "api": api,
+    }
+
+
+# --- Server side ---
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_listening(port, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def _cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def start_server(app, size, fps, emulator, server_mode):
+    from src.adapters.web_matrix import WebMatrixAdapter
+    from src.apps import BUILTIN_APPS
+    from src.core.app_manager import AppManager
+    from src.core.web_controller import WebController
+
+    width, height = (int(v) for v in size.split('x'))
+    display = WebMatrixAdapter(width, height)
+    manager = AppManager(display)
+    for name, target in BUILTIN_APPS.items():
+        manager.register_lazy(name, target)
+    if not manager.has_app(app):
+        raise SystemExit(f"Unknown app '{app}' (choose from {', '.join(manager.app_names)})")
+    manager.switch_to(app)
+    threading.Thread(target=manager.run_loop, kwargs={"fps": fps, "pacing": 'sleep'},
+                     daemon=True).start()
+    manager.first_frame.wait(10)
+
+    port = _free_port()
+    options = {"server": server_mode} if server_mode else None
+    WebController(manager, port=port, emulator_display=display if emulator else None,
+                  server_options=options)
+    _wait_listening(port)
+    return manager, port
+
+
+def run_local_step(manager, port, args, viewers):
+    """One step against the in-process server, with clients in a child process."""
+    cmd = [sys.executable, __file__, '--url', f"http://127.0.0.1:{port}", '--clients-only',
+           '--viewers', str(viewers), '--rest-clients', str(args.rest_clients),
+           '--status-rate', str(args.status_rate), '--switch-rate', str(args.switch_rate),
+           '--brightness-rate', str(args.brightness_rate), '--switch-apps', ','.join(args.switch_apps),
+           '--warmup', str(args.warmup), '--seconds', str(args.seconds), '--transport', args.transport]
+    driver = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    if driver.stdout.readline().strip() != 'start':
+        driver.wait()
+        raise RuntimeError("Client process failed to start")
+    manager.pacer.reset_stats()
+    cpu_start, wall_start = _cpu_seconds(), time.monotonic()
+    result = json.loads(driver.stdout.readline())
+    cpu = _cpu_seconds() - cpu_start
+    wall = time.monotonic() - wall_start
+    driver.wait()
+    result["render"] = manager.pacer.get_metrics()
+    result["cpu"] = {"percent": round(cpu / wall * 100, 1), "seconds": round(cpu, 2),
+                     "cores": os.cpu_count()}
+    return result
+
+
+def run_remote_step(host, port, args, viewers):
+    """One step against a running Pixie; render figures come from its /api/metrics."""
+    rates = _rates(args)
+    result = run_clients(host, port, viewers, args.rest_clients, rates, args.switch_apps,
+                         args.warmup, args.seconds, args.transport)
+    result["render"] = _fetch_metrics(host, port).get("pacing", {})
+    result["cpu"] = None
+    return result
+
+
+def _fetch_metrics(host, port):
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    try:
+        conn.request('GET', '/api/metrics')
+        return json.loads(conn.getresponse().read())
+    except (OSError, http.client.HTTPException, ValueError):
+        return {}
+    finally:
+        conn.close()
+
+
+def _rates(args):
+    return {"status": args.status_rate, "switch": args.switch_rate, "brightness": args.brightness_rate}
+
+
+def _print_header():
+    print(f"{'viewers':>8}{'fps':>8}{'p50 ms':>8}{'p99 ms':>8}{'missed':>8}{'cpu %':>8}"
+          f"{'view fps':>10}{'api p50':>9}{'api p99':>9}{'api err':>9}")
+
+
+def _print_step(step):
+    render, viewers = step["render"], step["viewers"]
+    latencies = [a for a in step["api"].values() if "p50_ms" in a]
+    api_p50 = max((a["p50_ms"] for a in latencies), default=0)
+    api_p99 = max((a["p99_ms"] for a in latencies), default=0)
+    errors = sum(a["errors"] for a in step["api"].values()) + viewers["errors"]
+    cpu = f"{step['cpu']['percent']:.0f}" if step["cpu"] else "-"
+    view = f"{viewers['fps_min']:.1f}" if viewers["fps_min"] is not None else "-"
+    print(f"{viewers['count']:>8}{render.get('fps') or 0:>8.1f}{render.get('interval_p50_ms', 0):>8.1f}"
+          f"{render.get('interval_p99_ms', 0):>8.1f}{render.get('missed_frames', 0):>8}{cpu:>8}"
+          f"{view:>10}{api_p50:>9.1f}{api_p99:>9.1f}{errors:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', help="Load an existing server instead of starting one")
+    parser.add_argument('--app', default='clock', help="App rendered during the test")
+    parser.add_argument('--size', default='64x64', help="WIDTHxHEIGHT")
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--server', choices=('pooled', 'werkzeug'), default=None,
+                        help="Web server (default: the 'web' config section)")
+    parser.add_argument('--viewers', default='0,1,4',
+                        help="Emulator viewers; a comma-separated list runs a sweep")
+    parser.add_argument('--transport', choices=('polling', 'websocket'), default='polling')
+    parser.add_argument('--rest-clients', type=int, default=4)
+    parser.add_argument('--status-rate', type=float, default=2.0, help="Requests/s per REST client")
+    parser.add_argument('--switch-rate', type=float, default=0.2, help="Requests/s per REST client")
+    parser.add_argument('--brightness-rate', type=float, default=1.0, help="Requests/s per REST client")
+    parser.add_argument('--switch-apps', default=None,
+                        help="Comma-separated apps /api/switch alternates between (default: --app)")
+    parser.add_argument('--warmup', type=float, default=2.0)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--json-out', help="Write the results to this file")
+    parser.add_argument('--clients-only', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.switch_apps = (args.switch_apps or args.app).split(',')
+    steps = [int(v) for v in args.viewers.split(',')]
+
+    if args.clients_only:
+        # Child of a local run: signal the measured window, then report
+        url = urlparse(args.url)
+        result = run_clients(url.hostname, url.port, steps[0], args.rest_clients, _rates(args),
+                             args.switch_apps, args.warmup, args.seconds, args.transport,
+                             on_start=lambda: print('start', flush=True))
+        print(json.dumps(result), flush=True)
+        return
+
+    _print_header()
+    results = []
+    if args.url:
+        url = urlparse(args.url)
+        for viewers in steps:
+            results.append(run_remote_step(url.hostname, url.port or 80, args, viewers))
+            _print_step(results[-1])
+    else:
+        manager, port = start_server(args.app, args.size, args.fps, emulator=max(steps) > 0,
+                                     server_mode=args.server)
+        for viewers in steps:
+            results.append(run_local_step(manager, port, args, viewers))
+            _print_step(results[-1])
+
+    if args.json_out:
+        config = {k: v for k, v in vars(args).items() if k not in ('json_out', 'clients_only')}
+        with open(args.json_out, 'w') as f:
+            json.dump({"config": config, "timestamp": time.time(), "steps": results}, f, indent=2)
+        print(f"Results written to {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Load-test the web server: requests/s and latency percentiles.
+
+By default starts a WebController twice on localhost, once on the
+Werkzeug development server and once on the pooled server, and runs the
+same load against both. A few "stuck" clients (connect, send half a
+request line, then go quiet) are opened first, like a stalled captive
+portal probe. Use --url to load an already running Pixie instead.
+
+Usage:
+    python3 tools/bench_web_server.py [--clients 16] [--seconds 5] [--stuck 2]
+    python3 tools/bench_web_server.py --url http://pixie.local:5000/api/status
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _client(host, port, path, deadline, latencies, errors):
+    conn = None
+    while time.perf_counter() < deadline:
+        try:
+            if conn is None:
+                conn = http.client.HTTPConnection(host, port, timeout=10)
+            start = time.perf_counter()
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+            else:
+                latencies.append(time.perf_counter() - start)
+            if response.will_close:
+                conn.close()
+                conn = None
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            if conn is not None:
+                conn.close()
+            conn = None
+    if conn is not None:
+        conn.close()
+
+
+def _open_stuck(host, port, count):
+    stuck = []
+    for _ in range(count):
+        s = socket.create_connection((host, port))
+        s.sendall(b"GET /api/status HTTP/1.1\r\nHost: pixie\r\n")  # never finished
+        stuck.append(s)
+    return stuck
+
+
+def run_load(host, port, path, clients, seconds, stuck=0):
+    stuck_sockets = _open_stuck(host, port, stuck)
+    latencies, errors = [], []
+    deadline = time.perf_counter() + seconds
+    threads = [threading.Thread(target=_client, args=(host, port, path, deadline, latencies, errors))
+               for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    for s in stuck_sockets:
+        s.close()
+
+    latencies.sort()
+    result = {"requests": len(latencies), "errors": len(errors),
+              "rps": len(latencies) / elapsed}
+    if latencies:
+        result["p50_ms"] = _percentile(latencies, 50) * 1000
+        result["p99_ms"] = _percentile(latencies, 99) * 1000
+    return result
+
+
+def _print(label, r):
+    print(f"{label:<12}{r['rps']:>10.0f}{r.get('p50_ms', 0):>10.2f}{r.get('p99_ms', 0):>10.2f}"
+          f"{r['requests']:>10}{r['errors']:>8}")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_listening(port, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', help="Load an existing server instead of starting local ones")
+    parser.add_argument('--path', default='/api/status')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--stuck', type=int, default=2, help="Stalled connections held open during the run")
+    args = parser.parse_args()
+
+    print(f"{'server':<12}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'requests':>10}{'errors':>8}")
+
+    if args.url:
+        url = urlparse(args.url)
+        result = run_load(url.hostname, url.port or 80, url.path or args.path,
+                          args.clients, args.seconds, args.stuck)
+        _print(url.netloc, result)
+        return
+
+    from src.adapters.web_matrix import WebMatrixAdapter
+    from src.core.app_manager import AppManager
+    from src.core.web_controller import WebController
+
+    manager = AppManager(WebMatrixAdapter())
+    for mode in ('werkzeug', 'pooled'):
+        port = _free_port()
+        WebController(manager, port=port, server_options={"server": mode})
+        _wait_listening(port)
+        _print(mode, run_load('127.0.0.1', port, args.path, args.clients, args.seconds, args.stuck))
+
+
+if __name__ == "__main__":
+    main()